@@ -0,0 +1,95 @@
+"""Benchmark the metadata audit using dtool_gui_tk.audit.
+
+Creates many small datasets with a stored metadata schema and audits them
+serially and with thread and process pools.
+
+Usage::
+
+    python benchmarks/benchmark_audit.py
+    python benchmarks/benchmark_audit.py --datasets 50000 --workers 1 8
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import dtoolcore
+
+from dtool_gui_tk.audit import count_statuses, iter_audit, list_dataset_uris
+from dtool_gui_tk.models import METADATA_SCHEMA_ANNOTATION_NAME
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project": {"type": "string", "minLength": 3},
+        "replicate": {"type": "integer", "minimum": 1},
+    },
+    "required": ["project", "replicate"]
+}
+
+
+def create_datasets(base_uri, num_datasets):
+    """Create datasets, every tenth with invalid metadata."""
+    for i in range(num_datasets):
+        replicate = 0 if i % 10 == 0 else i
+        readme = "---\nproject: benchmark\nreplicate: {}".format(replicate)
+        proto_dataset = dtoolcore.create_proto_dataset(
+            "ds-{}".format(i),
+            base_uri,
+            readme
+        )
+        proto_dataset.put_annotation("project", "benchmark")
+        proto_dataset.put_annotation("replicate", replicate)
+        proto_dataset.put_annotation(METADATA_SCHEMA_ANNOTATION_NAME, SCHEMA)
+        proto_dataset.freeze()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--datasets", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        create_datasets(work_dir, args.datasets)
+
+        start = time.perf_counter()
+        uris = list_dataset_uris(work_dir)
+        print("Listed {} datasets in {:.2f} seconds".format(
+            len(uris),
+            time.perf_counter() - start
+        ))
+
+        print("{:>8} {:>8} {:>10} {:>12}  {}".format(
+            "pool", "workers", "seconds", "datasets/s", "statuses"
+        ))
+        for use_processes in (False, True):
+            for num_workers in args.workers:
+                if use_processes and num_workers == 1:
+                    continue
+                pool = "process" if use_processes else "thread"
+                start = time.perf_counter()
+                results = list(iter_audit(
+                    uris,
+                    num_workers=num_workers,
+                    use_processes=use_processes
+                ))
+                seconds = time.perf_counter() - start
+                print("{:>8} {:>8} {:>10.2f} {:>12.0f}  {}".format(
+                    pool,
+                    num_workers,
+                    seconds,
+                    len(results) / seconds,
+                    ", ".join(
+                        "{}={}".format(k, v)
+                        for k, v in sorted(count_statuses(results).items())
+                    )
+                ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark editing the metadata of many datasets using dtool_gui_tk.bulk.
+
+Creates many small datasets and changes a metadata value in all of them
+with different numbers of workers. The datasets are loaded once beforehand,
+as they are when listed in the GUI or selected by tag.
+
+Usage::
+
+    python benchmarks/benchmark_bulk.py
+    python benchmarks/benchmark_bulk.py --datasets 1000 --workers 1 8
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import dtoolcore
+
+from dtool_gui_tk.audit import count_statuses
+from dtool_gui_tk.bulk import iter_bulk_update, prepare_changes
+
+
+def create_datasets(base_uri, num_datasets):
+    for i in range(num_datasets):
+        proto_dataset = dtoolcore.create_proto_dataset(
+            "ds-{}".format(i),
+            base_uri,
+            "---\nproject: P-0000\nreplicate: {}".format(i)
+        )
+        proto_dataset.put_annotation("project", "P-0000")
+        proto_dataset.put_annotation("replicate", i)
+        proto_dataset.freeze()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--datasets", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        create_datasets(work_dir, args.datasets)
+        datasets = list(dtoolcore.iter_datasets_in_base_uri(work_dir))
+
+        print("{:>8} {:>10} {:>12}  {}".format(
+            "workers", "seconds", "datasets/s", "statuses"
+        ))
+        for i, num_workers in enumerate(args.workers):
+            changes = prepare_changes({"project": "P-{:04d}".format(i + 1)})
+            start = time.perf_counter()
+            results = list(iter_bulk_update(
+                datasets,
+                changes,
+                max_workers=num_workers
+            ))
+            seconds = time.perf_counter() - start
+            print("{:>8} {:>10.2f} {:>12.0f}  {}".format(
+                num_workers,
+                seconds,
+                len(results) / seconds,
+                ", ".join(
+                    "{}={}".format(k, v)
+                    for k, v in sorted(count_statuses(results).items())
+                )
+            ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark dataset creation using dtool_gui_tk.models.ProtoDataSetModel.
+
+Compares serial ingestion with thread and process pools for a workload with
+many small files and a workload with a few large files. Then compares the
+ingest modes, reporting the strategy used to put the items in place.
+
+Usage::
+
+    python benchmarks/benchmark_create.py
+    python benchmarks/benchmark_create.py --small-files 20000 --large-files 4
+    python benchmarks/benchmark_create.py --workers 8 --ingest-modes copy clone
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from dtool_gui_tk.ingest import INGEST_MODE_COPY, INGEST_MODES
+from dtool_gui_tk.models import (
+    LocalBaseURIModel,
+    MetadataModel,
+    ProtoDataSetModel,
+)
+
+
+def create_input_directory(path, num_files, file_size, files_per_dir=1000):
+    """Create an input directory with random content."""
+    os.mkdir(path)
+    for i in range(num_files):
+        subdir = os.path.join(path, "dir_{}".format(i // files_per_dir))
+        if not os.path.isdir(subdir):
+            os.mkdir(subdir)
+        with open(os.path.join(subdir, "file_{}.dat".format(i)), "wb") as fh:
+            remaining = file_size
+            while remaining > 0:
+                chunk = min(remaining, 1024 * 1024)
+                fh.write(os.urandom(chunk))
+                remaining -= chunk
+
+
+def time_create(work_dir, input_directory, name, num_workers, use_processes,
+                ingest_mode=INGEST_MODE_COPY):
+    """Return the seconds it took to create a dataset and the strategies."""
+    base_uri_directory = os.path.join(work_dir, "datasets")
+    if not os.path.isdir(base_uri_directory):
+        os.mkdir(base_uri_directory)
+    base_uri_model = LocalBaseURIModel(os.path.join(work_dir, "config.json"))
+    base_uri_model.put_base_uri(base_uri_directory)
+
+    metadata_model = MetadataModel()
+    metadata_model.add_metadata_property("description", {"type": "string"}, True)  # NOQA
+    metadata_model.set_value("description", "benchmark")
+
+    proto_dataset_model = ProtoDataSetModel()
+    proto_dataset_model.set_name(name)
+    proto_dataset_model.set_input_directory(input_directory)
+    proto_dataset_model.set_base_uri_model(base_uri_model)
+    proto_dataset_model.set_metadata_model(metadata_model)
+    proto_dataset_model.set_num_workers(num_workers)
+    proto_dataset_model.set_use_processes(use_processes)
+    proto_dataset_model.set_ingest_mode(ingest_mode)
+    proto_dataset_model.set_journal_directory(None)
+
+    start = time.perf_counter()
+    proto_dataset_model.create()
+    seconds = time.perf_counter() - start
+    return seconds, proto_dataset_model.ingest_stats["strategy_counts"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--small-files", type=int, default=5000)
+    parser.add_argument("--small-size", type=int, default=4 * 1024)
+    parser.add_argument("--large-files", type=int, default=4)
+    parser.add_argument("--large-size", type=int, default=256 * 1024 * 1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument(
+        "--ingest-modes",
+        nargs="+",
+        choices=INGEST_MODES,
+        default=list(INGEST_MODES)
+    )
+    args = parser.parse_args()
+
+    workloads = [
+        ("many-small", args.small_files, args.small_size),
+        ("few-large", args.large_files, args.large_size),
+    ]
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        print("{:<12} {:>8} {:>8} {:>10} {:>10}".format(
+            "workload", "pool", "workers", "seconds", "MB/s"
+        ))
+        for workload, num_files, file_size in workloads:
+            input_directory = os.path.join(work_dir, workload)
+            create_input_directory(input_directory, num_files, file_size)
+            total_mb = num_files * file_size / 1e6
+            for use_processes in (False, True):
+                for num_workers in args.workers:
+                    if use_processes and num_workers == 1:
+                        continue
+                    pool = "process" if use_processes else "thread"
+                    name = "{}-{}-{}".format(workload, pool, num_workers)
+                    seconds, _ = time_create(
+                        work_dir,
+                        input_directory,
+                        name,
+                        num_workers,
+                        use_processes
+                    )
+                    print("{:<12} {:>8} {:>8} {:>10.2f} {:>10.1f}".format(
+                        workload,
+                        pool,
+                        num_workers,
+                        seconds,
+                        total_mb / seconds
+                    ))
+
+        num_workers = max(args.workers)
+        print()
+        print("{:<12} {:>8} {:>10} {:>10}  {}".format(
+            "workload", "mode", "seconds", "MB/s", "strategies"
+        ))
+        for workload, num_files, file_size in workloads:
+            input_directory = os.path.join(work_dir, workload)
+            total_mb = num_files * file_size / 1e6
+            for ingest_mode in args.ingest_modes:
+                name = "{}-{}".format(workload, ingest_mode)
+                seconds, strategy_counts = time_create(
+                    work_dir,
+                    input_directory,
+                    name,
+                    num_workers,
+                    False,
+                    ingest_mode
+                )
+                print("{:<12} {:>8} {:>10.2f} {:>10.1f}  {}".format(
+                    workload,
+                    ingest_mode,
+                    seconds,
+                    total_mb / seconds,
+                    ", ".join(
+                        "{}={}".format(k, v)
+                        for k, v in sorted(strategy_counts.items())
+                    )
+                ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Module for auditing the metadata of all datasets in a base URI.
+
+Each dataset is checked against the schema stored in its ``_metadata_schema``
+annotation, or against a chosen metadata schema, and for conflicts between
+the values in its README and its annotations. Datasets are audited in
+chunks in a process pool and the results are streamed, so that a report can
+be shown whilst the audit is running.
+
+Example usage:
+
+>>> from dtool_gui_tk.audit import (
+...     iter_audit,
+...     list_dataset_uris,
+...     write_audit_report
+... )
+>>> uris = list_dataset_uris("file:///data/datasets")  # doctest: +SKIP
+>>> results = list(iter_audit(uris, num_workers=4))  # doctest: +SKIP
+>>> write_audit_report(results, "audit.csv")  # doctest: +SKIP
+"""
+
+import csv
+import json
+import logging
+import os
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import dtoolcore
+import dtoolcore.utils
+
+from dtool_gui_tk.concurrency import iter_completed
+from dtool_gui_tk.models import (
+    MetadataConflictError,
+    MetadataModel,
+    load_metadata_from_dataset,
+)
+
+logger = logging.getLogger(__name__)
+
+AUDIT_OK = "ok"
+AUDIT_INVALID = "invalid"
+AUDIT_CONFLICT = "conflict"
+AUDIT_NO_SCHEMA = "no schema"
+AUDIT_ERROR = "error"
+
+#: Statuses of datasets that need attention.
+AUDIT_PROBLEM_STATUSES = (AUDIT_INVALID, AUDIT_CONFLICT, AUDIT_ERROR)
+
+#: Columns of an audit report.
+AUDIT_REPORT_FIELDS = ("name", "status", "num_issues", "issues", "uri")
+
+DEFAULT_NUM_AUDIT_WORKERS = os.cpu_count() or 1
+
+# Number of datasets audited per task, to amortise the cost of sending tasks
+# to the worker processes.
+DEFAULT_AUDIT_CHUNK_SIZE = 32
+
+
+def list_dataset_uris(base_uri, config_path=None):
+    """Return the URIs of the datasets in a base URI.
+
+    Unlike :func:`dtoolcore.iter_datasets_in_base_uri` the datasets are not
+    loaded, so that this is quick even for many datasets. The URIs of proto
+    datasets are included; they are skipped when audited.
+
+    :param base_uri: base URI
+    :param config_path: dtool config file
+    :returns: sorted list of URIs
+    """
+    base_uri = dtoolcore.utils.sanitise_uri(base_uri)
+    if config_path is None:
+        config_path = dtoolcore.utils.DEFAULT_CONFIG_PATH
+    storage_broker = dtoolcore._get_storage_broker(base_uri, config_path)
+    return sorted(storage_broker.list_dataset_uris(base_uri, config_path))
+
+
+def metadata_issues(metadata_model):
+    """Return (name, issue) tuples, including missing required metadata.
+
+    :param metadata_model: :class:`dtool_gui_tk.models.MetadataModel`
+    :returns: list of (name, issue) tuples
+    """
+    issues = []
+    for name in metadata_model.required_item_names:
+        if metadata_model.get_value(name) is None:
+            issues.append((name, "missing required value"))
+    issues.extend(metadata_model.all_issues)
+    return issues
+
+
+def _select_optional_items_with_values(metadata_model):
+    for name in metadata_model.optional_item_names:
+        if metadata_model.get_value(name) is not None:
+            metadata_model.select_optional_item(name)
+
+
+def _result(uri, name, status, issues=()):
+    return {
+        "uri": uri,
+        "name": name,
+        "status": status,
+        "issues": list(issues),
+    }
+
+
+def audit_dataset(uri, metadata_schema=None, config_path=None):
+    """Return the result of auditing the metadata of a dataset.
+
+    :param uri: URI of the dataset
+    :param metadata_schema: JSON schema to check the metadata against, if
+                            None the "_metadata_schema" annotation of the
+                            dataset is used
+    :param config_path: dtool config file
+    :returns: dictionary with the "uri", "name", "status" and "issues" of the
+              dataset, or None if the URI is not a frozen dataset
+    """
+    name = uri.rstrip("/").rsplit("/", 1)[-1]
+    try:
+        dataset = dtoolcore.DataSet.from_uri(uri, config_path=config_path)
+    except dtoolcore.DtoolCoreTypeError:
+        return None
+    except Exception as e:
+        return _result(uri, name, AUDIT_ERROR, [str(e)])
+    name = dataset.name
+
+    try:
+        dataset_metadata_model, _, _, stored_schema = load_metadata_from_dataset(dataset)  # NOQA
+    except MetadataConflictError as e:
+        return _result(uri, name, AUDIT_CONFLICT, [str(e)])
+    except Exception as e:
+        return _result(uri, name, AUDIT_ERROR, [str(e)])
+
+    if metadata_schema is None:
+        if stored_schema is None:
+            return _result(uri, name, AUDIT_NO_SCHEMA)
+        metadata_model = dataset_metadata_model
+    else:
+        metadata_model = MetadataModel()
+        try:
+            metadata_model.load_master_schema(metadata_schema)
+        except Exception as e:
+            return _result(uri, name, AUDIT_ERROR, [str(e)])
+        for item_name in metadata_model.item_names:
+            value = dataset_metadata_model.get_value(item_name)
+            if value is not None:
+                metadata_model.set_value(item_name, value)
+    _select_optional_items_with_values(metadata_model)
+
+    issues = [
+        "{}: {}".format(item_name, issue)
+        for item_name, issue in metadata_issues(metadata_model)
+    ]
+    if len(issues) > 0:
+        return _result(uri, name, AUDIT_INVALID, issues)
+    return _result(uri, name, AUDIT_OK)
+
+
+def _audit_chunk(uris, metadata_schema=None, config_path=None):
+    """Return the results of auditing a chunk of datasets."""
+    results = []
+    for uri in uris:
+        result = audit_dataset(uri, metadata_schema, config_path)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def _iter_chunks(uris, chunk_size):
+    for i in range(0, len(uris), chunk_size):
+        yield uris[i:i + chunk_size]
+
+
+def iter_audit(uris, metadata_schema=None,
+               num_workers=DEFAULT_NUM_AUDIT_WORKERS, use_processes=True,
+               chunk_size=DEFAULT_AUDIT_CHUNK_SIZE, cancel_event=None,
+               config_path=None, mp_context=None):
+    """Yield the results of auditing datasets as they become available.
+
+    The datasets are audited in chunks by a pool of worker processes, or
+    threads if ``use_processes`` is False. The results are not yielded in
+    the order of the URIs. Proto datasets are skipped.
+
+    :param uris: list of dataset URIs
+    :param metadata_schema: JSON schema to check the metadata against, if
+                            None the "_metadata_schema" annotation of each
+                            dataset is used
+    :param num_workers: number of worker processes, if 1 the datasets are
+                        audited in the calling thread
+    :param use_processes: use processes rather than threads
+    :param chunk_size: number of datasets audited per task
+    :param cancel_event: optional :class:`threading.Event`; when set no more
+                         datasets are audited
+    :param config_path: dtool config file
+    :param mp_context: optional :mod:`multiprocessing` context used to start
+                       the worker processes, e.g. a "spawn" context when
+                       auditing from a process with threads of its own,
+                       such as a GUI, which forked workers would inherit in
+                       an arbitrary state
+    :returns: iterator yielding dictionaries as returned by
+              :func:`dtool_gui_tk.audit.audit_dataset`
+    """
+    uris = list(uris)
+    audit_chunk = partial(
+        _audit_chunk,
+        metadata_schema=metadata_schema,
+        config_path=config_path
+    )
+    chunks = _iter_chunks(uris, chunk_size)
+
+    if num_workers <= 1:
+        for chunk in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            for result in audit_chunk(chunk):
+                yield result
+        return
+
+    logger.info("Auditing {} dataset(s) using {} {}".format(
+        len(uris),
+        num_workers,
+        "process(es)" if use_processes else "thread(s)"
+    ))
+    if use_processes:
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=mp_context
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+    with executor:
+        for _, results in iter_completed(
+            executor,
+            audit_chunk,
+            chunks,
+            window=2 * num_workers,
+            cancel_event=cancel_event
+        ):
+            for result in results:
+                yield result
+
+
+def count_statuses(results):
+    """Return the number of datasets with each status.
+
+    :param results: iterable of audit results
+    :returns: dictionary with the number of datasets per status
+    """
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return counts
+
+
+def write_audit_report(results, fpath):
+    """Write an audit report to a CSV or JSON file.
+
+    The format is determined by the file extension. In the CSV file the
+    issues of a dataset are separated by semicolons.
+
+    :param results: iterable of audit results
+    :param fpath: path to a ".csv" or ".json" file
+    :raises: ValueError if the file extension is not supported
+    """
+    ext = os.path.splitext(fpath)[1].lower()
+    if ext not in (".csv", ".json"):
+        raise(ValueError(
+            "Audit report must be a .csv or .json file: {}".format(fpath)
+        ))
+
+    rows = []
+    for result in results:
+        row = dict(result)
+        row["num_issues"] = len(result["issues"])
+        rows.append(row)
+
+    if ext == ".json":
+        with open(fpath, "w") as fh:
+            json.dump(
+                [{k: row[k] for k in AUDIT_REPORT_FIELDS} for row in rows],
+                fh,
+                indent=2
+            )
+        return
+
+    with open(fpath, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=AUDIT_REPORT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            row["issues"] = "; ".join(row["issues"])
+            writer.writerow({k: row[k] for k in AUDIT_REPORT_FIELDS})
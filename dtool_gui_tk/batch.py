@@ -0,0 +1,448 @@
+"""Module for creating many datasets from a job list.
+
+A job list is a CSV or JSON file describing one dataset per job. In a CSV
+file the ``name`` and ``input_directory`` columns are required, the optional
+``metadata_schema`` column names the metadata schema to use and all other
+columns are metadata values::
+
+    name,input_directory,metadata_schema,description,project
+    run-001,runs/001,basic,First run,imaging
+    run-002,runs/002,basic,Second run,imaging
+
+A JSON file contains a list of jobs::
+
+    [
+        {
+            "name": "run-001",
+            "input_directory": "runs/001",
+            "metadata_schema": "basic",
+            "metadata": {"description": "First run", "replicate": 1}
+        }
+    ]
+
+Relative input directories are relative to the job list file. The metadata
+schema is either the name of a schema in the metadata schema directory or
+the path to a JSON schema file.
+
+Example usage:
+
+>>> from dtool_gui_tk.batch import BatchScheduler, load_job_list
+>>> jobs = load_job_list("jobs.csv")  # doctest: +SKIP
+>>> scheduler = BatchScheduler(
+...     jobs,
+...     base_uri_model,
+...     metadata_schema_list_model,
+...     max_concurrent_jobs=2,
+...     io_budget=100e6
+... )  # doctest: +SKIP
+>>> summary = scheduler.run()  # doctest: +SKIP
+>>> print(scheduler.format_summary())  # doctest: +SKIP
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from dtool_gui_tk.ingest import TokenBucket
+from dtool_gui_tk.models import (
+    DEFAULT_NUM_THREADS,
+    DataSetCreationCancelledError,
+    MetadataModel,
+    ProtoDataSetModel,
+)
+from dtool_gui_tk.progress import format_duration
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_RESERVED_COLUMNS = ("name", "input_directory", "metadata_schema")
+
+
+class BatchJob(object):
+    """A dataset to be created as part of a batch.
+
+    The job is passed as the progress bar to
+    :func:`dtool_gui_tk.models.ProtoDataSetModel.create`, so its progress
+    can be read from other threads whilst the dataset is being created.
+
+    :param name: name of the dataset
+    :param input_directory: path to the input directory
+    :param metadata: dictionary of metadata values
+    :param metadata_schema: name of the metadata schema or path to a JSON
+                            schema file; None uses the scheduler's default
+    :param metadata_from_str: True if the metadata values are strings that
+                              need to be converted to the types in the schema
+    """
+
+    def __init__(self, name, input_directory, metadata=None,
+                 metadata_schema=None, metadata_from_str=False):
+        self.name = name
+        self.input_directory = input_directory
+        self.metadata = dict(metadata or {})
+        self.metadata_schema = metadata_schema
+        self.metadata_from_str = metadata_from_str
+
+        self.status = JOB_PENDING
+        self.error = None
+        self.uri = None
+        self.ingest_stats = None
+        self.total_bytes = 0
+        self.num_items = 0
+
+        self._lock = threading.Lock()
+        self._done_items = 0
+        self._done_bytes = 0
+        self._current = None
+
+    def __repr__(self):
+        return "<BatchJob {} {}>".format(self.name, self.status)
+
+    def update(self, steps, nbytes=0, current=None):
+        """Record progress of the dataset creation."""
+        with self._lock:
+            self._done_items += steps
+            self._done_bytes += nbytes
+            if current is not None:
+                self._current = current
+
+    def progress(self):
+        """Return the progress of the job.
+
+        :returns: dictionary with the "status", the number of "items" and
+                  "bytes" added, the "num_items" and "total_bytes" to add,
+                  and the "current" item
+        """
+        with self._lock:
+            return {
+                "status": self.status,
+                "items": self._done_items,
+                "bytes": self._done_bytes,
+                "num_items": self.num_items,
+                "total_bytes": self.total_bytes,
+                "current": self._current,
+            }
+
+
+def _resolve_path(path, relative_to):
+    path = os.path.expanduser(path)
+    if os.path.isabs(path):
+        return path
+    return os.path.normpath(os.path.join(relative_to, path))
+
+
+def _resolve_metadata_schema(metadata_schema, relative_to):
+    if metadata_schema and metadata_schema.endswith(".json"):
+        return _resolve_path(metadata_schema, relative_to)
+    return metadata_schema or None
+
+
+def load_job_list(fpath):
+    """Return the jobs in a CSV or JSON job list file.
+
+    :param fpath: path to a file with the extension ".csv" or ".json"
+    :returns: list of :class:`dtool_gui_tk.batch.BatchJob` instances
+    :raises: ValueError if the job list is not valid
+    """
+    relative_to = os.path.dirname(os.path.abspath(fpath))
+    extension = os.path.splitext(fpath)[1].lower()
+    jobs = []
+    if extension == ".csv":
+        with open(fpath, newline="") as fh:
+            reader = csv.DictReader(fh)
+            for column in ("name", "input_directory"):
+                if column not in (reader.fieldnames or []):
+                    raise(ValueError("Missing column in {}: {}".format(
+                        fpath,
+                        column
+                    )))
+            for row in reader:
+                metadata = dict(
+                    (key, value) for key, value in row.items()
+                    if key not in _RESERVED_COLUMNS and value not in ("", None)
+                )
+                jobs.append(BatchJob(
+                    row["name"],
+                    _resolve_path(row["input_directory"], relative_to),
+                    metadata,
+                    _resolve_metadata_schema(
+                        row.get("metadata_schema"),
+                        relative_to
+                    ),
+                    metadata_from_str=True
+                ))
+    elif extension == ".json":
+        with open(fpath) as fh:
+            records = json.load(fh)
+        if not isinstance(records, list):
+            raise(ValueError("Job list must be a list: {}".format(fpath)))
+        for record in records:
+            for key in ("name", "input_directory"):
+                if key not in record:
+                    raise(ValueError("Missing key in {}: {}".format(
+                        fpath,
+                        key
+                    )))
+            jobs.append(BatchJob(
+                record["name"],
+                _resolve_path(record["input_directory"], relative_to),
+                record.get("metadata", {}),
+                _resolve_metadata_schema(
+                    record.get("metadata_schema"),
+                    relative_to
+                )
+            ))
+    else:
+        raise(ValueError("Unsupported job list format: {}".format(fpath)))
+
+    names = [job.name for job in jobs]
+    duplicates = sorted(set(n for n in names if names.count(n) > 1))
+    if len(duplicates) > 0:
+        raise(ValueError("Duplicate dataset names in {}: {}".format(
+            fpath,
+            ", ".join(duplicates)
+        )))
+    return jobs
+
+
+def load_metadata_model(metadata_schema_list_model, metadata_schema,
+                        metadata, from_str=False):
+    """Return a metadata model with values set.
+
+    Optional metadata items that are given a value are selected.
+
+    :param metadata_schema_list_model:
+        :class:`dtool_gui_tk.models.MetadataSchemaListModel`
+    :param metadata_schema: name of the metadata schema or path to a JSON
+                            schema file
+    :param metadata: dictionary of metadata values
+    :param from_str: True if the values are strings that need to be converted
+                     to the types in the schema
+    :returns: :class:`dtool_gui_tk.models.MetadataModel`
+    :raises: ValueError if a value is not an item in the schema
+    """
+    if metadata_schema.endswith(".json"):
+        with open(metadata_schema) as fh:
+            metadata_model = MetadataModel()
+            metadata_model.load_master_schema(json.load(fh))
+    else:
+        metadata_model = metadata_schema_list_model.get_metadata_model(metadata_schema)  # NOQA
+
+    for key, value in metadata.items():
+        if key not in metadata_model.item_names:
+            raise(ValueError(
+                "Metadata {} not in schema {}".format(key, metadata_schema)
+            ))
+        if from_str:
+            metadata_model.set_value_from_str(key, value)
+        else:
+            metadata_model.set_value(key, value)
+        metadata_model.select_optional_item(key)
+    return metadata_model
+
+
+class BatchScheduler(object):
+    """Create the datasets of a list of jobs.
+
+    Up to ``max_concurrent_jobs`` datasets are created at the same time,
+    each using :class:`dtool_gui_tk.models.ProtoDataSetModel` with
+    ``num_workers`` workers. All jobs share one I/O budget, so adding
+    concurrent jobs does not increase the load on the storage beyond it.
+
+    :param jobs: list of :class:`dtool_gui_tk.batch.BatchJob` instances
+    :param base_uri_model: :class:`dtool_gui_tk.models.LocalBaseURIModel`
+    :param metadata_schema_list_model:
+        :class:`dtool_gui_tk.models.MetadataSchemaListModel` used to look up
+        metadata schemas by name
+    :param max_concurrent_jobs: maximum number of datasets created at once
+    :param io_budget: maximum number of bytes per second added by all jobs
+                      together, or None for no limit
+    :param num_workers: number of workers used by each job
+    :param default_metadata_schema: metadata schema of jobs that do not
+                                    specify one
+    :param model_options: optional callable called with each job's
+                          :class:`dtool_gui_tk.models.ProtoDataSetModel`
+                          before the dataset is created, e.g. to set the
+                          ingest mode or exclude patterns
+    """
+
+    def __init__(self, jobs, base_uri_model, metadata_schema_list_model,
+                 max_concurrent_jobs=1, io_budget=None,
+                 num_workers=DEFAULT_NUM_THREADS,
+                 default_metadata_schema="basic", model_options=None):
+        if max_concurrent_jobs < 1:
+            raise(ValueError("Number of concurrent jobs must be at least 1"))
+        self.jobs = list(jobs)
+        self._base_uri_model = base_uri_model
+        self._metadata_schema_list_model = metadata_schema_list_model
+        self._max_concurrent_jobs = max_concurrent_jobs
+        self._token_bucket = None
+        if io_budget is not None:
+            self._token_bucket = TokenBucket(io_budget)
+        self._num_workers = num_workers
+        self._default_metadata_schema = default_metadata_schema
+        self._model_options = model_options
+
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._running_models = {}
+        self._thread = None
+        self._start_time = None
+        self._end_time = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run_job(self, job):
+        if self.cancelled:
+            job.status = JOB_CANCELLED
+            return
+
+        proto_dataset_model = ProtoDataSetModel()
+        try:
+            proto_dataset_model.set_name(job.name)
+            proto_dataset_model.set_input_directory(job.input_directory)
+            proto_dataset_model.set_base_uri_model(self._base_uri_model)
+            proto_dataset_model.set_metadata_model(
+                load_metadata_model(
+                    self._metadata_schema_list_model,
+                    job.metadata_schema or self._default_metadata_schema,
+                    job.metadata,
+                    from_str=job.metadata_from_str
+                )
+            )
+            proto_dataset_model.set_num_workers(self._num_workers)
+            proto_dataset_model.set_io_budget(self._token_bucket)
+            if self._model_options is not None:
+                self._model_options(proto_dataset_model)
+
+            input_items = proto_dataset_model.scan_input_directory()
+            job.num_items = len(input_items)
+            job.total_bytes = sum(e[2] for e in input_items)
+
+            with self._lock:
+                if self.cancelled:
+                    job.status = JOB_CANCELLED
+                    return
+                self._running_models[job.name] = proto_dataset_model
+                job.status = JOB_RUNNING
+            logger.info("Starting batch job: {}".format(job.name))
+            proto_dataset_model.create(progressbar=job)
+        except DataSetCreationCancelledError:
+            job.status = JOB_CANCELLED
+            logger.info("Cancelled batch job: {}".format(job.name))
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = e
+            logger.warning("Batch job {} failed: {}".format(job.name, e))
+        else:
+            job.status = JOB_DONE
+            job.uri = proto_dataset_model.uri
+            job.ingest_stats = proto_dataset_model.ingest_stats
+            logger.info("Finished batch job: {}".format(job.name))
+        finally:
+            with self._lock:
+                self._running_models.pop(job.name, None)
+
+    def run(self):
+        """Create the datasets, blocking until all jobs have finished.
+
+        :returns: dictionary as returned by
+                  :func:`dtool_gui_tk.batch.BatchScheduler.summary`
+        """
+        self._start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self._max_concurrent_jobs) as executor:  # NOQA
+            for future in [executor.submit(self._run_job, j) for j in self.jobs]:  # NOQA
+                future.result()
+        self._end_time = time.monotonic()
+        return self.summary()
+
+    def start(self):
+        """Create the datasets in a background thread."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        """Return True whilst the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self, keep=True):
+        """Cancel the jobs that have not finished.
+
+        Pending jobs are not started; running jobs are cancelled as described
+        in :func:`dtool_gui_tk.models.ProtoDataSetModel.cancel`.
+
+        :param keep: keep the proto datasets of running jobs so that they can
+                     be resumed
+        """
+        with self._lock:
+            self._cancelled.set()
+            for proto_dataset_model in self._running_models.values():
+                proto_dataset_model.cancel(keep=keep)
+
+    def summary(self):
+        """Return a summary of the batch.
+
+        :returns: dictionary with the number of jobs in each status, the
+                  "total_bytes" added, the elapsed "seconds" and the "jobs"
+        """
+        counts = dict((status, 0) for status in (
+            JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_CANCELLED
+        ))
+        total_bytes = 0
+        for job in self.jobs:
+            counts[job.status] += 1
+            total_bytes += job.progress()["bytes"]
+        seconds = None
+        if self._start_time is not None:
+            end_time = self._end_time or time.monotonic()
+            seconds = end_time - self._start_time
+        summary = {
+            "num_jobs": len(self.jobs),
+            "total_bytes": total_bytes,
+            "seconds": seconds,
+            "jobs": self.jobs,
+        }
+        for status, count in counts.items():
+            summary["num_" + status] = count
+        return summary
+
+    def format_summary(self):
+        """Return a human readable summary of the batch."""
+        summary = self.summary()
+        lines = []
+        for job in self.jobs:
+            progress = job.progress()
+            line = "{:<30} {:<10} {:>8}/{:<8} {:>14} bytes".format(
+                job.name,
+                job.status,
+                progress["items"],
+                progress["num_items"],
+                progress["bytes"]
+            )
+            if job.status == JOB_DONE:
+                line += "  {}".format(job.uri)
+            elif job.error is not None:
+                line += "  {}".format(job.error)
+            lines.append(line)
+        lines.append(
+            "{} job(s): {} done, {} failed, {} cancelled, {} bytes in {}".format(  # NOQA
+                summary["num_jobs"],
+                summary["num_done"],
+                summary["num_failed"],
+                summary["num_cancelled"],
+                summary["total_bytes"],
+                format_duration(summary["seconds"])
+            )
+        )
+        return "\n".join(lines)
@@ -0,0 +1,211 @@
+"""Module for editing the metadata of many datasets at once.
+
+A set of changes, e.g. ``{"project": "P-0042"}``, is converted to the types
+in a metadata schema and validated once. It is then applied to each
+dataset concurrently. Only the annotations and READMEs whose content
+changes are written, and the result of each dataset is reported
+separately, so that one failure does not stop the others.
+
+Example usage:
+
+>>> from dtool_gui_tk.bulk import iter_bulk_update, prepare_changes
+>>> changes = prepare_changes({"project": "P-0042"})
+>>> for result in iter_bulk_update(uris, changes):  # doctest: +SKIP
+...     print(result["name"], result["status"], result["error"])
+"""
+
+import json
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import dtoolcore
+
+from dtool_gui_tk.concurrency import iter_completed
+from dtool_gui_tk.models import (
+    DEFAULT_NUM_THREADS,
+    DataSetModel,
+    MetadataValidationError,
+    get_json_schema_type,
+    values_equal,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_UPDATED = "updated"
+BULK_UNCHANGED = "unchanged"
+BULK_FAILED = "failed"
+
+
+def _parse_value(value_as_str):
+    """Return the value of a string, as JSON if it can be parsed as JSON."""
+    try:
+        return json.loads(value_as_str)
+    except ValueError:
+        return value_as_str
+
+
+def prepare_changes(changes, metadata_model=None, from_str=False):
+    """Return metadata changes converted to their types and validated.
+
+    Values of items in the metadata model are checked against their schema.
+    Other values only need to be of a supported type, see
+    :func:`dtool_gui_tk.models.get_json_schema_type`.
+
+    :param changes: dictionary of metadata values
+    :param metadata_model: optional :class:`dtool_gui_tk.models.MetadataModel`
+                           to convert and validate the values with
+    :param from_str: True if the values are strings that need to be converted;
+                     values of items that are not in the metadata model are
+                     parsed as JSON if possible, e.g. "1" becomes 1
+    :returns: dictionary of metadata values
+    :raises dtool_gui_tk.models.MetadataValidationError: if a value is not
+        valid according to its schema
+    :raises dtool_gui_tk.models.UnsupportedTypeError: if a value is not of a
+        supported type
+    """
+    prepared = {}
+    for key, value in changes.items():
+        in_model = metadata_model is not None and (
+            metadata_model.is_required_item(key)
+            or metadata_model.is_optional_item(key)
+        )
+        if not in_model:
+            if from_str:
+                value = _parse_value(value)
+            get_json_schema_type(value)
+            prepared[key] = value
+            continue
+
+        if from_str:
+            value_as_str = value
+            converted_model = metadata_model.copy()
+            converted_model.set_value_from_str(key, value_as_str)
+            value = converted_model.get_value(key)
+            if value is None:
+                raise(MetadataValidationError(
+                    "Metadata {} value not valid: {}".format(key, value_as_str)
+                ))
+        issues = metadata_model.get_schema(key).issues(value)
+        if len(issues) > 0:
+            raise(MetadataValidationError(
+                "Metadata {} value not valid: {}".format(
+                    key,
+                    "; ".join(str(i) for i in issues)
+                )
+            ))
+        prepared[key] = value
+    return prepared
+
+
+def _result(uri, name, status, error=None):
+    return {
+        "uri": uri,
+        "name": name,
+        "status": status,
+        "error": error,
+    }
+
+
+def update_dataset_metadata(dataset, changes, num_threads=1,
+                            config_path=None):
+    """Apply metadata changes to a dataset.
+
+    Items that are not in the metadata of the dataset are added as required
+    items and optional items with values are selected, so that they are kept
+    in the README. The changes are written using
+    :func:`dtool_gui_tk.models.DataSetModel.update_metadata`, so only the
+    annotations and README that change are written.
+
+    :param dataset: URI of the dataset or a :class:`dtoolcore.DataSet`
+                    that has already been loaded, e.g. by a
+                    :class:`dtool_gui_tk.models.DataSetListModel`
+    :param changes: dictionary of metadata values, see
+                    :func:`dtool_gui_tk.bulk.prepare_changes`
+    :param num_threads: maximum number of concurrent writes to the dataset
+    :param config_path: dtool config file used to load the dataset from its
+                        URI
+    :returns: dictionary with the "uri", "name", "status" and "error" of the
+              dataset
+    """
+    if isinstance(dataset, dtoolcore.DataSet):
+        uri = dataset.uri
+    else:
+        uri = dataset
+    name = uri.rstrip("/").rsplit("/", 1)[-1]
+    try:
+        dataset_model = DataSetModel()
+        if isinstance(dataset, dtoolcore.DataSet):
+            dataset_model.set_dataset(dataset)
+        else:
+            dataset_model.load_dataset(uri, config_path)
+        name = dataset_model.name
+        metadata_model = dataset_model.metadata_model
+
+        # The README is written from the selected items, so optional items
+        # with values are selected to keep them.
+        for item_name in metadata_model.optional_item_names:
+            if metadata_model.get_value(item_name) is not None:
+                metadata_model.select_optional_item(item_name)
+
+        changed = False
+        for key, value in changes.items():
+            if metadata_model.is_optional_item(key):
+                metadata_model.select_optional_item(key)
+            elif not metadata_model.is_required_item(key):
+                schema = {"type": get_json_schema_type(value)}
+                metadata_model.add_metadata_property(key, schema, True)
+                changed = True
+            if not values_equal(metadata_model.get_value(key), value):
+                metadata_model.set_value(key, value)
+                changed = True
+
+        if not changed:
+            return _result(uri, name, BULK_UNCHANGED)
+        dataset_model.update_metadata(num_threads=num_threads)
+    except Exception as e:
+        logger.warning("Failed to update metadata of {}: {}".format(uri, e))
+        return _result(uri, name, BULK_FAILED, str(e))
+    return _result(uri, name, BULK_UPDATED)
+
+
+def iter_bulk_update(datasets, changes, max_workers=DEFAULT_NUM_THREADS,
+                     cancel_event=None, config_path=None):
+    """Yield the results of applying metadata changes to datasets.
+
+    At most ``max_workers`` datasets are updated at the same time. The
+    results are yielded as the datasets are updated, not in the order of the
+    datasets.
+
+    :param datasets: list of dataset URIs or :class:`dtoolcore.DataSet`
+                     instances that have already been loaded; loading many
+                     datasets from their URIs takes longer than updating them
+    :param changes: dictionary of metadata values, see
+                    :func:`dtool_gui_tk.bulk.prepare_changes`
+    :param max_workers: maximum number of datasets updated concurrently
+    :param cancel_event: optional :class:`threading.Event`; when set no more
+                         datasets are updated
+    :param config_path: dtool config file used to load datasets from their
+                        URIs
+    :returns: iterator yielding dictionaries as returned by
+              :func:`dtool_gui_tk.bulk.update_dataset_metadata`
+    """
+    logger.info("Updating {} in {} dataset(s)".format(
+        ", ".join(sorted(changes)),
+        len(datasets)
+    ))
+    update = partial(
+        update_dataset_metadata,
+        changes=changes,
+        config_path=config_path
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _, result in iter_completed(
+            executor,
+            update,
+            datasets,
+            window=2 * max_workers,
+            cancel_event=cancel_event
+        ):
+            yield result
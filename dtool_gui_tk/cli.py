@@ -0,0 +1,687 @@
+"""Command line interface for creating and listing datasets without a display.
+
+The commands use the same models as the graphical user interface, and the
+same configuration: the local base URI and the metadata schema directory.
+No Tk code is imported, so the commands can be run from cron jobs on nodes
+without a display.
+
+Example usage::
+
+    dtool-tk-cli create run-001 /data/run-001 \\
+        --metadata-schema basic --metadata description="First run"
+    dtool-tk-cli list --tag imaging
+    dtool-tk-cli query --where project=imaging --where replicate=1
+    dtool-tk-cli validate file:///data/datasets/run-001
+    dtool-tk-cli batch jobs.csv --max-jobs 2 --io-budget 100
+    dtool-tk-cli audit --metadata-schema basic --output audit.csv
+    dtool-tk-cli edit --tag imaging --metadata project=P-0042
+
+The models import slow dependencies, such as ``dtool_info.inventory`` and
+NumPy, only when they are used, so that the commands start quickly.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import dtoolcore
+import dtoolcore.utils
+
+from dtool_gui_tk import __version__
+from dtool_gui_tk.audit import (
+    AUDIT_PROBLEM_STATUSES,
+    DEFAULT_NUM_AUDIT_WORKERS,
+    count_statuses,
+    iter_audit,
+    list_dataset_uris,
+    metadata_issues,
+    write_audit_report,
+)
+from dtool_gui_tk.batch import (
+    JOB_RUNNING,
+    BatchScheduler,
+    load_job_list,
+    load_metadata_model,
+)
+from dtool_gui_tk.bulk import BULK_FAILED, iter_bulk_update, prepare_changes
+from dtool_gui_tk.ingest import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    INGEST_MODES,
+    TokenBucket,
+)
+from dtool_gui_tk.models import (
+    DEFAULT_METADATA_SCHEMA_DIRECTORY,
+    DEFAULT_NUM_THREADS,
+    DataSetListModel,
+    DataSetModel,
+    LocalBaseURIModel,
+    MetadataSchemaListModel,
+    ProtoDataSetModel,
+    setup_metadata_schema_directory,
+)
+from dtool_gui_tk.progress import ThroughputEstimator, format_duration
+
+logger = logging.getLogger(__name__)
+
+
+class _FixedBaseURIModel(object):
+    """Base URI model with a base URI that is not read from the config."""
+
+    def __init__(self, base_uri):
+        self._base_uri = dtoolcore.utils.sanitise_uri(base_uri)
+
+    def get_base_uri(self):
+        return self._base_uri
+
+
+class _FixedMetadataSchemaListModel(MetadataSchemaListModel):
+    """Metadata schema list model with a directory not read from the config."""
+
+    def __init__(self, metadata_schema_directory):
+        super(_FixedMetadataSchemaListModel, self).__init__()
+        self._metadata_schema_directory = os.path.abspath(
+            metadata_schema_directory
+        )
+
+    def get_metadata_schema_directory(self):
+        return self._metadata_schema_directory
+
+
+class _TextProgressBar(object):
+    """Report the progress of dataset creation on stderr.
+
+    The totals are those of the current phase of the creation, e.g. finding
+    duplicates or adding items.
+    """
+
+    def __init__(self, interval=5.0):
+        self._label = None
+        self._done_items = 0
+        self._estimator = ThroughputEstimator(0)
+        self._interval = interval
+        self._last_report = time.monotonic()
+
+    def phase(self, label, total_bytes=None):
+        self._label = label
+        self._done_items = 0
+        self._estimator = ThroughputEstimator(total_bytes or 0)
+
+    def update(self, steps, nbytes=0, current=None):
+        self._done_items += steps
+        self._estimator.update(nbytes)
+        now = time.monotonic()
+        if now - self._last_report < self._interval:
+            return
+        self._last_report = now
+        bytes_per_second = self._estimator.bytes_per_second or 0
+        print("{}: {} items, {:.1f} of {:.1f} MB, {:.1f} MB/s, {} remaining".format(  # NOQA
+            self._label,
+            self._done_items,
+            self._estimator.done_bytes / 1e6,
+            self._estimator.total_bytes / 1e6,
+            bytes_per_second / 1e6,
+            format_duration(self._estimator.eta)
+        ), file=sys.stderr)
+
+
+def _parse_key_value(text):
+    if "=" not in text:
+        raise(argparse.ArgumentTypeError(
+            "Expected KEY=VALUE: {}".format(text)
+        ))
+    return tuple(text.split("=", 1))
+
+
+def _parse_query_value(text):
+    """Return the value of a query, as JSON if it can be parsed as JSON."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _get_base_uri_model(args):
+    if args.base_uri is not None:
+        return _FixedBaseURIModel(args.base_uri)
+    base_uri_model = LocalBaseURIModel(args.config)
+    if base_uri_model.get_base_uri() is None:
+        raise(ValueError("No local base URI configured, use --base-uri"))
+    return base_uri_model
+
+
+def _get_metadata_schema_list_model(args):
+    metadata_schema_directory = args.metadata_schema_directory
+    if metadata_schema_directory is None:
+        metadata_schema_directory = MetadataSchemaListModel(args.config).get_metadata_schema_directory()  # NOQA
+    if metadata_schema_directory is None:
+        metadata_schema_directory = setup_metadata_schema_directory(
+            DEFAULT_METADATA_SCHEMA_DIRECTORY
+        )
+    return _FixedMetadataSchemaListModel(metadata_schema_directory)
+
+
+def _get_metadata(args):
+    """Return the metadata given on the command line and if it is strings."""
+    metadata = {}
+    if args.metadata_file is not None:
+        with open(args.metadata_file) as fh:
+            metadata = json.load(fh)
+        if not isinstance(metadata, dict):
+            raise(ValueError(
+                "Metadata file must contain an object: {}".format(
+                    args.metadata_file
+                )
+            ))
+    if len(args.metadata) > 0 and len(metadata) > 0:
+        raise(ValueError("Use either --metadata or --metadata-file"))
+    if len(args.metadata) > 0:
+        return dict(args.metadata), True
+    return metadata, False
+
+
+def _iter_dataset_properties(args):
+    dataset_list_model = DataSetListModel()
+    # The tag filter is set first, so that the datasets are only indexed
+    # once, when the base URI model is set.
+    if args.tag is not None:
+        dataset_list_model.set_tag_filter(args.tag)
+    dataset_list_model.set_base_uri_model(_get_base_uri_model(args))
+    dataset_list_model.sort(key=args.sort_by, reverse=args.reverse)
+    return dataset_list_model.yield_properties()
+
+
+def _print_datasets(datasets, as_json):
+    if as_json:
+        print(json.dumps(datasets, indent=2, sort_keys=True))
+        return
+    for info in datasets:
+        print("{}\t{}\t{}\t{}\t{}".format(
+            info["name"],
+            info["size_str"].strip(),
+            info["num_items"],
+            info["date"],
+            info["uri"]
+        ))
+
+
+def create_command(args):
+    """Create a dataset from an input directory."""
+    metadata, from_str = _get_metadata(args)
+    metadata_model = load_metadata_model(
+        _get_metadata_schema_list_model(args),
+        args.metadata_schema,
+        metadata,
+        from_str=from_str
+    )
+
+    proto_dataset_model = ProtoDataSetModel()
+    proto_dataset_model.set_name(args.name)
+    proto_dataset_model.set_input_directory(args.input_directory)
+    proto_dataset_model.set_base_uri_model(_get_base_uri_model(args))
+    proto_dataset_model.set_metadata_model(metadata_model)
+    proto_dataset_model.set_num_workers(args.workers)
+    proto_dataset_model.set_ingest_mode(args.ingest_mode)
+    exclude_patterns = list(args.exclude)
+    if not args.no_default_excludes:
+        exclude_patterns = list(DEFAULT_EXCLUDE_PATTERNS) + exclude_patterns
+    proto_dataset_model.set_exclude_patterns(exclude_patterns)
+    if len(args.include) > 0:
+        proto_dataset_model.set_include_patterns(args.include)
+    if args.io_budget is not None:
+        proto_dataset_model.set_io_budget(TokenBucket(args.io_budget * 1e6))
+    proto_dataset_model.set_deduplicate(args.deduplicate)
+
+    progressbar = None
+    if args.progress:
+        progressbar = _TextProgressBar()
+    # If interrupted, the items added so far are kept in the journal so that
+    # running the command again resumes the creation.
+    proto_dataset_model.create(
+        progressbar=progressbar,
+        resume=not args.no_resume
+    )
+    if args.deduplicate:
+        ingest_stats = proto_dataset_model.ingest_stats
+        print("{} identical item(s) stored once, saving {} bytes".format(
+            ingest_stats["num_duplicates"],
+            ingest_stats["duplicate_bytes"]
+        ), file=sys.stderr)
+    print(proto_dataset_model.uri)
+    return 0
+
+
+def list_command(args):
+    """List the datasets in the base URI."""
+    _print_datasets(list(_iter_dataset_properties(args)), args.json)
+    return 0
+
+
+def query_command(args):
+    """List the datasets with metadata matching all the conditions."""
+    datasets = []
+    for info in _iter_dataset_properties(args):
+        if len(args.where) > 0:
+            dataset = dtoolcore.DataSet.from_uri(
+                info["uri"],
+                config_path=args.config
+            )
+            annotation_names = set(dataset.list_annotation_names())
+            if not all(
+                key in annotation_names
+                and dataset.get_annotation(key) == _parse_query_value(value)
+                for key, value in args.where
+            ):
+                continue
+        datasets.append(info)
+    _print_datasets(datasets, args.json)
+    return 0
+
+
+def validate_command(args):
+    """Check metadata against its schema.
+
+    Either the metadata of an existing dataset or the metadata that would be
+    used to create a dataset is checked.
+    """
+    if args.uri is not None:
+        dataset_model = DataSetModel()
+        dataset_model.load_dataset(args.uri, args.config)
+        metadata_model = dataset_model.metadata_model
+    else:
+        metadata, from_str = _get_metadata(args)
+        metadata_model = load_metadata_model(
+            _get_metadata_schema_list_model(args),
+            args.metadata_schema,
+            metadata,
+            from_str=from_str
+        )
+
+    issues = metadata_issues(metadata_model)
+    for name, issue in issues:
+        print("{}: {}".format(name, issue))
+    if len(issues) > 0:
+        return 1
+    print("Metadata okay")
+    return 0
+
+
+def batch_command(args):
+    """Create datasets from a CSV or JSON job list."""
+    jobs = load_job_list(args.job_list)
+    io_budget = None
+    if args.io_budget is not None:
+        io_budget = args.io_budget * 1e6
+    scheduler = BatchScheduler(
+        jobs,
+        _get_base_uri_model(args),
+        _get_metadata_schema_list_model(args),
+        max_concurrent_jobs=args.max_jobs,
+        io_budget=io_budget,
+        num_workers=args.workers,
+        model_options=lambda m: m.set_exclude_patterns(DEFAULT_EXCLUDE_PATTERNS)  # NOQA
+    )
+    scheduler.start()
+    try:
+        while scheduler.is_alive():
+            time.sleep(args.progress_interval)
+            for job in jobs:
+                progress = job.progress()
+                if progress["status"] == JOB_RUNNING:
+                    print("{}: {}/{} bytes".format(
+                        job.name,
+                        progress["bytes"],
+                        progress["total_bytes"]
+                    ), file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Cancelling, running jobs can be resumed", file=sys.stderr)
+        scheduler.cancel(keep=True)
+        while scheduler.is_alive():
+            time.sleep(0.1)
+
+    print(scheduler.format_summary())
+    summary = scheduler.summary()
+    if summary["num_failed"] > 0 or summary["num_cancelled"] > 0:
+        return 1
+    return 0
+
+
+def audit_command(args):
+    """Check the metadata of all datasets in the base URI."""
+    metadata_schema = None
+    if args.metadata_schema is not None:
+        metadata_schema = load_metadata_model(
+            _get_metadata_schema_list_model(args),
+            args.metadata_schema,
+            {}
+        ).get_master_schema()
+    base_uri = _get_base_uri_model(args).get_base_uri()
+    uris = list_dataset_uris(base_uri, args.config)
+
+    results = []
+    for result in iter_audit(
+        uris,
+        metadata_schema=metadata_schema,
+        num_workers=args.workers,
+        config_path=args.config
+    ):
+        results.append(result)
+        if result["status"] in AUDIT_PROBLEM_STATUSES:
+            print("{}\t{}\t{}".format(
+                result["name"],
+                result["status"],
+                "; ".join(result["issues"])
+            ))
+    results.sort(key=lambda r: r["name"])
+    if args.output is not None:
+        write_audit_report(results, args.output)
+
+    counts = count_statuses(results)
+    print("{} dataset(s) audited: {}".format(
+        len(results),
+        ", ".join(
+            "{} {}".format(counts[status], status)
+            for status in sorted(counts)
+        )
+    ), file=sys.stderr)
+    if any(status in counts for status in AUDIT_PROBLEM_STATUSES):
+        return 1
+    return 0
+
+
+def edit_command(args):
+    """Change the metadata of several datasets."""
+    datasets = list(args.uri)
+    if args.tag is not None:
+        # Indexed once, when the base URI model is set. The datasets loaded
+        # by the listing are not loaded again.
+        dataset_list_model = DataSetListModel()
+        dataset_list_model.set_tag_filter(args.tag)
+        dataset_list_model.set_base_uri_model(_get_base_uri_model(args))
+        datasets.extend(dataset_list_model.yield_datasets())
+    if len(datasets) == 0:
+        raise(ValueError("No datasets given, use URIs or --tag"))
+    if len(args.metadata) == 0:
+        raise(ValueError("No metadata given, use --metadata"))
+
+    metadata_model = None
+    if args.metadata_schema is not None:
+        metadata_model = load_metadata_model(
+            _get_metadata_schema_list_model(args),
+            args.metadata_schema,
+            {}
+        )
+    # Validated once, rather than for each dataset.
+    changes = prepare_changes(
+        dict(args.metadata),
+        metadata_model,
+        from_str=True
+    )
+
+    results = []
+    for result in iter_bulk_update(
+        datasets,
+        changes,
+        max_workers=args.workers,
+        config_path=args.config
+    ):
+        results.append(result)
+        if result["status"] == BULK_FAILED:
+            print("{}\t{}\t{}".format(
+                result["name"],
+                result["status"],
+                result["error"]
+            ))
+
+    counts = count_statuses(results)
+    print("{} dataset(s) edited: {}".format(
+        len(results),
+        ", ".join(
+            "{} {}".format(counts[status], status)
+            for status in sorted(counts)
+        )
+    ), file=sys.stderr)
+    if BULK_FAILED in counts:
+        return 1
+    return 0
+
+
+def _add_config_arguments(parser):
+    parser.add_argument(
+        "--config",
+        help="dtool config file, defaults to {}".format(
+            dtoolcore.utils.DEFAULT_CONFIG_PATH
+        )
+    )
+    parser.add_argument(
+        "--base-uri",
+        help="Base URI of the datasets, defaults to the configured local base URI"  # NOQA
+    )
+
+
+def _add_metadata_arguments(parser):
+    parser.add_argument(
+        "--metadata-schema-directory",
+        help="Directory with the metadata schemas, defaults to the configured directory"  # NOQA
+    )
+    parser.add_argument(
+        "--metadata-schema",
+        default="basic",
+        help="Name of a metadata schema or path to a JSON schema file"
+    )
+    parser.add_argument(
+        "--metadata",
+        metavar="KEY=VALUE",
+        type=_parse_key_value,
+        action="append",
+        default=[],
+        help="Metadata value, converted to the type in the schema"
+    )
+    parser.add_argument(
+        "--metadata-file",
+        help="JSON file with an object of metadata values"
+    )
+
+
+def _add_list_arguments(parser):
+    _add_config_arguments(parser)
+    parser.add_argument("--tag", help="Only include datasets with this tag")
+    parser.add_argument(
+        "--sort-by",
+        default="name",
+        choices=["name", "date", "size_int", "num_items", "creator"]
+    )
+    parser.add_argument("--reverse", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+
+
+def get_parser():
+    """Return the argument parser of the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog="dtool-tk-cli",
+        description="Create and list datasets without the graphical user interface."  # NOQA
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version="%(prog)s {}".format(__version__)
+    )
+    parser.add_argument("--verbose", action="store_true")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help=create_command.__doc__)  # NOQA
+    create_parser.add_argument("name", help="Name of the dataset")
+    create_parser.add_argument("input_directory")
+    _add_config_arguments(create_parser)
+    _add_metadata_arguments(create_parser)
+    create_parser.add_argument(
+        "--ingest-mode",
+        default=INGEST_MODES[0],
+        choices=INGEST_MODES
+    )
+    create_parser.add_argument("--workers", type=int, default=DEFAULT_NUM_THREADS)  # NOQA
+    create_parser.add_argument(
+        "--include",
+        metavar="PATTERN",
+        action="append",
+        default=[],
+        help="Only add files matching a glob pattern"
+    )
+    create_parser.add_argument(
+        "--exclude",
+        metavar="PATTERN",
+        action="append",
+        default=[],
+        help="Do not add files matching a glob pattern"
+    )
+    create_parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help="Add files such as .DS_Store that are excluded by default"
+    )
+    create_parser.add_argument(
+        "--io-budget",
+        type=float,
+        help="Maximum MB/s added"
+    )
+    create_parser.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Find identical input files and, on local disk, store them once"
+    )
+    create_parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Start again rather than resuming an interrupted creation"
+    )
+    create_parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report progress on stderr"
+    )
+    create_parser.set_defaults(func=create_command)
+
+    list_parser = subparsers.add_parser("list", help=list_command.__doc__)
+    _add_list_arguments(list_parser)
+    list_parser.set_defaults(func=list_command)
+
+    query_parser = subparsers.add_parser("query", help=query_command.__doc__)  # NOQA
+    _add_list_arguments(query_parser)
+    query_parser.add_argument(
+        "--where",
+        metavar="KEY=VALUE",
+        type=_parse_key_value,
+        action="append",
+        default=[],
+        help="Metadata value to match; JSON values such as 1 or true are compared by type"  # NOQA
+    )
+    query_parser.set_defaults(func=query_command)
+
+    validate_parser = subparsers.add_parser("validate", help="Check metadata against its schema")  # NOQA
+    validate_parser.add_argument(
+        "uri",
+        nargs="?",
+        help="URI of a dataset; if omitted the metadata options are checked"
+    )
+    _add_config_arguments(validate_parser)
+    _add_metadata_arguments(validate_parser)
+    validate_parser.set_defaults(func=validate_command)
+
+    batch_parser = subparsers.add_parser("batch", help=batch_command.__doc__)  # NOQA
+    batch_parser.add_argument("job_list", help="CSV or JSON job list")
+    _add_config_arguments(batch_parser)
+    batch_parser.add_argument(
+        "--metadata-schema-directory",
+        help="Directory with the metadata schemas, defaults to the configured directory"  # NOQA
+    )
+    batch_parser.add_argument("--max-jobs", type=int, default=1)
+    batch_parser.add_argument(
+        "--io-budget",
+        type=float,
+        help="Maximum MB/s added by all jobs together"
+    )
+    batch_parser.add_argument("--workers", type=int, default=DEFAULT_NUM_THREADS)  # NOQA
+    batch_parser.add_argument("--progress-interval", type=float, default=10.0)
+    batch_parser.set_defaults(func=batch_command)
+
+    audit_parser = subparsers.add_parser("audit", help=audit_command.__doc__)  # NOQA
+    _add_config_arguments(audit_parser)
+    audit_parser.add_argument(
+        "--metadata-schema-directory",
+        help="Directory with the metadata schemas, defaults to the configured directory"  # NOQA
+    )
+    audit_parser.add_argument(
+        "--metadata-schema",
+        help="Name of a metadata schema or path to a JSON schema file, defaults to the schema stored in each dataset"  # NOQA
+    )
+    audit_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_NUM_AUDIT_WORKERS,
+        help="Number of worker processes"
+    )
+    audit_parser.add_argument(
+        "--output",
+        help="Write a report of all datasets to a .csv or .json file"
+    )
+    audit_parser.set_defaults(func=audit_command)
+
+    edit_parser = subparsers.add_parser("edit", help=edit_command.__doc__)
+    edit_parser.add_argument("uri", nargs="*", help="URIs of the datasets")
+    _add_config_arguments(edit_parser)
+    edit_parser.add_argument(
+        "--tag",
+        help="Edit the datasets in the base URI with this tag"
+    )
+    edit_parser.add_argument(
+        "--metadata-schema-directory",
+        help="Directory with the metadata schemas, defaults to the configured directory"  # NOQA
+    )
+    edit_parser.add_argument(
+        "--metadata-schema",
+        help="Name of a metadata schema or path to a JSON schema file to convert and validate the values with"  # NOQA
+    )
+    edit_parser.add_argument(
+        "--metadata",
+        metavar="KEY=VALUE",
+        type=_parse_key_value,
+        action="append",
+        default=[],
+        help="Metadata value; without a schema JSON values such as 1 or true are stored by type"  # NOQA
+    )
+    edit_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_NUM_THREADS,
+        help="Maximum number of datasets edited at the same time"
+    )
+    edit_parser.set_defaults(func=edit_command)
+
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface.
+
+    :param argv: list of arguments, defaults to :data:`sys.argv`
+    :returns: exit status
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level)
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError, TypeError, dtoolcore.DtoolCoreTypeError) as e:
+        print("Error: {}".format(e), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
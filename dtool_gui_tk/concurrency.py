@@ -0,0 +1,55 @@
+"""Module for running tasks concurrently.
+
+Example usage:
+
+>>> from concurrent.futures import ThreadPoolExecutor
+>>> from dtool_gui_tk.concurrency import iter_completed
+>>> with ThreadPoolExecutor(max_workers=2) as executor:
+...     results = dict(iter_completed(executor, abs, [-1, -2, 3], window=4))
+>>> sorted(results.items())
+[(-2, 2), (-1, 1), (3, 3)]
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+def iter_completed(executor, func, tasks, window, cancel_event=None):
+    """Yield (task, result) tuples as tasks complete.
+
+    At most ``window`` tasks are in flight at any one time so that results
+    can be streamed and so that cancellation takes effect quickly. When the
+    ``cancel_event`` is set no more tasks are submitted, queued tasks are
+    cancelled straight away and only the results of the tasks that are
+    already running are yielded.
+
+    :param executor: :class:`concurrent.futures.Executor`
+    :param func: callable applied to each task
+    :param tasks: iterable of tasks
+    :param window: maximum number of tasks in flight
+    :param cancel_event: optional :class:`threading.Event`
+    """
+    tasks = iter(tasks)
+    pending = {}
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                # Futures that have not started can be cancelled.
+                for future in list(pending):
+                    if future.cancel():
+                        del pending[future]
+            else:
+                while len(pending) < window:
+                    try:
+                        task = next(tasks)
+                    except StopIteration:
+                        break
+                    pending[executor.submit(func, task)] = task
+            if len(pending) == 0:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                yield task, future.result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,875 @@
+"""Module with helpers for ingesting input directories into datasets.
+
+Example usage:
+
+>>> from dtool_gui_tk.ingest import scan_input_directory
+>>> for path, handle, size, mtime_ns in scan_input_directory("/data/run1"):
+...     print(handle, size)
+...
+images/img_001.tif 1048576
+notes.txt 42
+"""
+
+import errno
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait
+)
+from functools import partial
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+#: Items are added using the storage broker, i.e. copied by dtoolcore.
+INGEST_MODE_COPY = "copy"
+
+#: Items are cloned (reflinked) if the file system supports it, otherwise
+#: they are copied in the kernel.
+INGEST_MODE_CLONE = "clone"
+
+#: As :data:`INGEST_MODE_CLONE`, but items that cannot be cloned are hard
+#: linked. The dataset then shares the files with the input directory, so
+#: changes to the input files also change the dataset.
+INGEST_MODE_HARDLINK = "hardlink"
+
+INGEST_MODES = (INGEST_MODE_COPY, INGEST_MODE_CLONE, INGEST_MODE_HARDLINK)
+
+#: Strategies reported by :func:`ingest_file`.
+STRATEGY_REFLINK = "reflink"
+STRATEGY_HARDLINK = "hardlink"
+STRATEGY_COPY_FILE_RANGE = "copy_file_range"
+STRATEGY_COPYFILE = "copyfile"
+STRATEGY_COPY_HASH = "copy_hash"
+STRATEGY_DUPLICATE = "duplicate"
+
+#: Number of bytes copied between checks for cancellation.
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+#: Size of the buffer each thread reuses when copying and hashing files.
+HASH_BUFFER_SIZE = 4 * 1024 * 1024
+
+#: Number of bytes hashed to rule out candidate duplicates before their
+#: whole content is hashed.
+DUPLICATE_HEAD_SIZE = 64 * 1024
+
+# Hash functions of the dtoolcore storage brokers, by name.
+_HASH_FUNCTIONS = {
+    "md5sum_hexdigest": hashlib.md5,
+    "sha1sum_hexdigest": hashlib.sha1,
+    "sha256sum_hexdigest": hashlib.sha256,
+}
+
+# ioctl request number of FICLONE on Linux, _IOW(0x94, 9, int).
+_FICLONE = 0x40049409
+
+# Errors meaning that a strategy is not supported for a pair of files.
+_UNSUPPORTED_ERRNOS = set([
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EMLINK,
+    errno.EBADF,
+])
+
+
+#: Patterns of files that are usually not wanted in a dataset.
+DEFAULT_EXCLUDE_PATTERNS = (".DS_Store", "Thumbs.db", "*~", ".*.swp", "~$*")
+
+
+def _glob_to_regex(pattern):
+    """Return a regular expression matching handles against a glob pattern.
+
+    ``*`` and ``?`` do not match ``/``, ``**`` matches across directories.
+    A pattern without a ``/`` matches the name of a file or directory at any
+    depth, other patterns match the handle from the top of the input
+    directory.
+    """
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            chars = pattern[i + 1:end]
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            parts.append("[" + chars.replace("\\", "\\\\") + "]")
+            i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    regex = "".join(parts)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return regex
+
+
+def compile_patterns(patterns):
+    """Compile glob patterns into a single regular expression.
+
+    :param patterns: iterable of glob patterns
+    :returns: compiled regular expression matching handles that match any of
+              the patterns, or None if there are no patterns
+    """
+    regexes = [_glob_to_regex(p) for p in patterns if len(p.strip("/")) > 0]
+    if len(regexes) == 0:
+        return None
+    return re.compile("(?:{})\\Z".format("|".join(regexes)), re.DOTALL)
+
+
+def _scan_directory(dirpath, handle_prefix, include=None, exclude=None):
+    """Return the files and the subdirectories in a directory.
+
+    Directories that cannot be read are logged and skipped, as by
+    :func:`os.walk`.
+    """
+    files = []
+    subdirectories = []
+    try:
+        it = os.scandir(dirpath)
+    except OSError as e:
+        logger.warning("Skipping directory that cannot be read: {}".format(e))
+        return files, subdirectories
+    with it:
+        for entry in it:
+            handle = handle_prefix + entry.name
+            if exclude is not None and exclude.match(handle):
+                # Excluded directories are not descended into.
+                continue
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirectories.append((entry.path, handle + "/"))
+                continue
+            if include is not None and not include.match(handle):
+                continue
+            if entry.is_file():
+                stat = entry.stat()
+                files.append(
+                    (entry.path, handle, stat.st_size, stat.st_mtime_ns)
+                )
+    return files, subdirectories
+
+
+def scan_input_directory(input_directory, num_workers=1,
+                         include_patterns=None, exclude_patterns=None):
+    """Return the files in an input directory and their sizes.
+
+    The directory tree is walked once using :func:`os.scandir`, so the stat
+    results obtained whilst walking are reused for the sizes. Symbolic links
+    to files are included; symbolic links to directories are not followed.
+    Directories that cannot be read are skipped with a warning.
+
+    With more than one worker, directories are scanned concurrently. This
+    hides the latency of network file systems.
+
+    The include and exclude glob patterns are compiled into one regular
+    expression each, see :func:`dtool_gui_tk.ingest.compile_patterns`. If
+    there are include patterns only matching files are returned. Files and
+    directories matching an exclude pattern are skipped; excluded
+    directories are not scanned.
+
+    :param input_directory: path to the input directory
+    :param num_workers: number of threads scanning directories
+    :param include_patterns: optional list of glob patterns of files to
+                             include
+    :param exclude_patterns: optional list of glob patterns of files and
+                             directories to exclude
+    :returns: list of (path, handle, size in bytes, modification time in
+              nanoseconds) tuples sorted by handle, where the handle is the
+              Unix-like relpath of the file in the input directory
+    """
+    scan = partial(
+        _scan_directory,
+        include=compile_patterns(include_patterns or []),
+        exclude=compile_patterns(exclude_patterns or [])
+    )
+    entries = []
+    if num_workers == 1:
+        stack = [(input_directory, "")]
+        while len(stack) > 0:
+            files, subdirectories = scan(*stack.pop())
+            entries.extend(files)
+            stack.extend(subdirectories)
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            pending = set([executor.submit(scan, input_directory, "")])
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories = future.result()
+                    entries.extend(files)
+                    for subdirectory in subdirectories:
+                        pending.add(executor.submit(scan, *subdirectory))
+    entries.sort(key=lambda entry: entry[1])
+    return entries
+
+
+def preflight_report(input_items, num_largest=10):
+    """Return a summary of the files to be added to a dataset.
+
+    Files with the same size are candidate duplicates; the report lists
+    them, but whether their content is the same is not checked.
+
+    :param input_items: list of tuples as returned by
+                        :func:`dtool_gui_tk.ingest.scan_input_directory`
+    :param num_largest: number of largest files to list
+    :returns: dictionary with the "num_items" and "total_size", the
+              "largest" files as (handle, size) tuples, the handles of the
+              "empty" files, "duplicate_candidates" as lists of handles of
+              files with the same size, largest first, and the
+              "duplicate_candidate_size" that would be saved if all the
+              candidates were duplicates
+    """
+    handles_by_size = {}
+    total_size = 0
+    for _, handle, size, _ in input_items:
+        total_size += size
+        handles_by_size.setdefault(size, []).append(handle)
+
+    duplicate_candidates = []
+    duplicate_candidate_size = 0
+    for size in sorted(handles_by_size, reverse=True):
+        handles = handles_by_size[size]
+        if size == 0 or len(handles) < 2:
+            continue
+        duplicate_candidates.append(handles)
+        duplicate_candidate_size += size * (len(handles) - 1)
+
+    largest = heapq.nlargest(
+        num_largest,
+        ((handle, size) for _, handle, size, _ in input_items),
+        key=lambda item: item[1]
+    )
+    return {
+        "num_items": len(input_items),
+        "total_size": total_size,
+        "largest": largest,
+        "empty": handles_by_size.get(0, []),
+        "duplicate_candidates": duplicate_candidates,
+        "duplicate_candidate_size": duplicate_candidate_size,
+    }
+
+
+def _hash_file(path, hash_func, nbytes=None, cancel_event=None):
+    """Return the hexdigest of a file, or of its first ``nbytes``."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise InterruptedError("Hashing of {} cancelled".format(path))
+    hasher = hash_func()
+    with open(path, "rb") as fh:
+        if nbytes is not None:
+            hasher.update(fh.read(nbytes))
+        else:
+            for chunk in iter(partial(fh.read, HASH_BUFFER_SIZE), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _split_groups_by_hash(groups, hash_file, num_workers, on_hashed=None):
+    """Split groups of paths by hash, keeping those with several members.
+
+    If given, ``on_hashed`` is called with each path once it has been hashed.
+    """
+    paths = [path for group in groups for path in group]
+    hashes = {}
+    if num_workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = dict(
+                (executor.submit(hash_file, path), path) for path in paths
+            )
+            for future in as_completed(futures):
+                hashes[futures[future]] = future.result()
+                if on_hashed is not None:
+                    on_hashed(futures[future])
+    else:
+        for path in paths:
+            hashes[path] = hash_file(path)
+            if on_hashed is not None:
+                on_hashed(path)
+
+    split_groups = []
+    for group in groups:
+        by_hash = {}
+        for path in group:
+            by_hash.setdefault(hashes[path], []).append(path)
+        split_groups.extend(
+            (file_hash, paths) for file_hash, paths in by_hash.items()
+            if len(paths) > 1
+        )
+    return split_groups
+
+
+def find_duplicates(input_items, hash_function_name="md5sum_hexdigest",
+                    num_workers=1, cancel_event=None, progressbar=None):
+    """Return groups of files with the same content.
+
+    Files are grouped by size. Groups of files larger than
+    :data:`DUPLICATE_HEAD_SIZE` are then split by the hash of their first
+    bytes, so that only files that are still candidates are read in full.
+    Finally groups are split by the hash of the whole content. Files are
+    hashed concurrently using ``num_workers`` threads. Empty files are not
+    reported.
+
+    Every remaining candidate is read in full, on top of the read needed to
+    add it to a dataset. When most files are candidates, e.g. many images
+    of the same size, finding duplicates can take as long as adding them.
+
+    :param input_items: list of tuples as returned by
+                        :func:`dtool_gui_tk.ingest.scan_input_directory`
+    :param hash_function_name: name of the storage broker hash function,
+                               e.g. ``"md5sum_hexdigest"``
+    :param num_workers: number of threads hashing files
+    :param cancel_event: optional :class:`threading.Event`; hashing raises
+                         :class:`InterruptedError` if it is set
+    :param progressbar: optional object with an
+                        ``update(steps, nbytes=0, current=None)`` method,
+                        called as each candidate is read in full, e.g. a
+                        :class:`dtool_gui_tk.progress.ProgressChannel`; if it
+                        also has a ``phase(label, total_bytes=None)`` method,
+                        that is called first with the number of bytes to read
+    :returns: list of dictionaries with the "hash", the "size" and the
+              sorted "handles" of each group of identical files, in the
+              order of the space that storing them once would save
+    :raises: ValueError if the hash function is not supported
+    """
+    if hash_function_name not in _HASH_FUNCTIONS:
+        raise(ValueError("Unsupported hash function: {}".format(
+            hash_function_name
+        )))
+    hash_func = _HASH_FUNCTIONS[hash_function_name]
+
+    paths_by_size = {}
+    handles = {}
+    for path, handle, size, _ in input_items:
+        if size == 0:
+            continue
+        paths_by_size.setdefault(size, []).append(path)
+        handles[path] = handle
+    size_groups = [
+        (size, paths) for size, paths in paths_by_size.items()
+        if len(paths) > 1
+    ]
+
+    # Rule out files that differ near the start before reading them in full.
+    candidate_groups = []
+    head_groups = []
+    for size, paths in size_groups:
+        if size > DUPLICATE_HEAD_SIZE:
+            head_groups.append(paths)
+        else:
+            candidate_groups.append(paths)
+    head_hash_file = partial(
+        _hash_file,
+        hash_func=hash_func,
+        nbytes=DUPLICATE_HEAD_SIZE,
+        cancel_event=cancel_event
+    )
+    for _, paths in _split_groups_by_hash(head_groups, head_hash_file, num_workers):  # NOQA
+        candidate_groups.append(paths)
+
+    full_hash_file = partial(
+        _hash_file,
+        hash_func=hash_func,
+        cancel_event=cancel_event
+    )
+    sizes = dict((path, size) for size, paths in size_groups for path in paths)
+
+    def on_hashed(path):
+        if progressbar is not None:
+            progressbar.update(1, nbytes=sizes[path], current=handles[path])
+
+    if hasattr(progressbar, "phase"):
+        progressbar.phase("Finding duplicates", sum(
+            sizes[path] for paths in candidate_groups for path in paths
+        ))
+    duplicates = []
+    for file_hash, paths in _split_groups_by_hash(candidate_groups, full_hash_file, num_workers, on_hashed):  # NOQA
+        duplicates.append({
+            "hash": file_hash,
+            "size": sizes[paths[0]],
+            "handles": sorted(handles[path] for path in paths),
+        })
+    duplicates.sort(
+        key=lambda d: (-d["size"] * (len(d["handles"]) - 1), d["handles"][0])
+    )
+    return duplicates
+
+
+def measure_throughput(directory, nbytes=16 * 1024 * 1024, num_files=32):
+    """Measure how quickly items can be written to a directory.
+
+    A scratch file of ``nbytes`` is written, synced to disk and hashed, as
+    items are when they are added to a dataset, and ``num_files`` empty
+    files are created to measure the overhead per item. The scratch
+    directory is removed afterwards.
+
+    :param directory: directory on the target file system
+    :param nbytes: number of bytes to write
+    :param num_files: number of empty files to create
+    :returns: dictionary with the "bytes_per_second" and the
+              "seconds_per_file"
+    """
+    scratch_directory = tempfile.mkdtemp(
+        prefix=".dtool-preflight-",
+        dir=directory
+    )
+    try:
+        chunk = os.urandom(min(nbytes, 1024 * 1024))
+        fpath = os.path.join(scratch_directory, "throughput")
+        start = time.perf_counter()
+        with open(fpath, "wb") as fh:
+            remaining = nbytes
+            while remaining > 0:
+                remaining -= fh.write(chunk[:remaining])
+            fh.flush()
+            os.fsync(fh.fileno())
+        hasher = hashlib.md5()
+        with open(fpath, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                hasher.update(block)
+        bytes_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(num_files):
+            open(os.path.join(scratch_directory, str(i)), "wb").close()
+        files_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(scratch_directory)
+
+    return {
+        "bytes_per_second": nbytes / max(bytes_seconds, 1e-9),
+        "seconds_per_file": files_seconds / max(num_files, 1),
+    }
+
+
+def estimate_ingest_seconds(num_items, total_size, throughput):
+    """Return the estimated number of seconds it takes to add items.
+
+    :param num_items: number of items
+    :param total_size: total size of the items in bytes
+    :param throughput: dictionary as returned by
+                       :func:`dtool_gui_tk.ingest.measure_throughput`
+    """
+    return (
+        total_size / throughput["bytes_per_second"]
+        + num_items * throughput["seconds_per_file"]
+    )
+
+
+def _reflink(src, dest, cancel_event=None):
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "FICLONE is not available")
+    with open(src, "rb") as src_fh, open(dest, "wb") as dest_fh:
+        fcntl.ioctl(dest_fh.fileno(), _FICLONE, src_fh.fileno())
+
+
+def _hardlink(src, dest, cancel_event=None):
+    os.link(src, dest)
+
+
+def _copy_file_range(src, dest, cancel_event=None):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    with open(src, "rb") as src_fh, open(dest, "wb") as dest_fh:
+        src_fd = src_fh.fileno()
+        dest_fd = dest_fh.fileno()
+        remaining = os.fstat(src_fd).st_size
+        while remaining > 0:
+            # Copy in chunks so that a large file can be cancelled.
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Copy of {} cancelled".format(src))
+            copied = os.copy_file_range(
+                src_fd,
+                dest_fd,
+                min(remaining, COPY_CHUNK_SIZE)
+            )
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _copyfile(src, dest, cancel_event=None):
+    # Uses sendfile on Linux.
+    shutil.copyfile(src, dest)
+
+
+_STRATEGY_FUNCS = {
+    STRATEGY_REFLINK: _reflink,
+    STRATEGY_HARDLINK: _hardlink,
+    STRATEGY_COPY_FILE_RANGE: _copy_file_range,
+    STRATEGY_COPYFILE: _copyfile,
+}
+
+_MODE_STRATEGIES = {
+    INGEST_MODE_CLONE: (
+        STRATEGY_REFLINK,
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE,
+    ),
+    INGEST_MODE_HARDLINK: (
+        STRATEGY_REFLINK,
+        STRATEGY_HARDLINK,
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE,
+    ),
+}
+
+
+class FileIngester(object):
+    """Put files in place using the cheapest strategy that works.
+
+    The strategies of the ingest mode are tried in order. A strategy that
+    fails because it is not supported, e.g. reflinks on a file system
+    without copy on write or hard links across file systems, is not tried
+    again by the same ingester.
+
+    Kernel copies are made in chunks of :data:`COPY_CHUNK_SIZE` bytes and
+    raise :class:`InterruptedError` if the ``cancel_event`` is set between
+    chunks.
+
+    :param mode: :data:`INGEST_MODE_CLONE` or :data:`INGEST_MODE_HARDLINK`
+    :param cancel_event: optional :class:`threading.Event`
+    :raises: ValueError if the mode is not supported
+    """
+
+    def __init__(self, mode, cancel_event=None):
+        if mode not in _MODE_STRATEGIES:
+            raise(ValueError("Unsupported ingest mode: {}".format(mode)))
+        self._mode = mode
+        self._cancel_event = cancel_event
+        self._strategies = list(_MODE_STRATEGIES[mode])
+
+    @property
+    def mode(self):
+        """Return the ingest mode."""
+        return self._mode
+
+    def ingest_file(self, src, dest):
+        """Put the content of a file at a destination path.
+
+        Any existing file at the destination is replaced. It is unlinked
+        rather than overwritten in case it is a hard link to an input file.
+
+        :param src: path to the source file
+        :param dest: path to the destination
+        :returns: strategy used
+        """
+        for strategy in list(self._strategies):
+            if os.path.lexists(dest):
+                os.unlink(dest)
+            if strategy == STRATEGY_COPYFILE:
+                _copyfile(src, dest)
+                return strategy
+            try:
+                _STRATEGY_FUNCS[strategy](src, dest, self._cancel_event)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                # Rebinding, rather than removing in place, keeps this safe
+                # when the ingester is shared between threads.
+                self._strategies = [
+                    s for s in self._strategies if s != strategy
+                ]
+                continue
+            return strategy
+
+
+class HashingCopier(object):
+    """Copy files and compute their hashes in a single read.
+
+    Each file is read once into a buffer that is both written to the
+    destination and passed to the hash function, rather than being copied
+    and then read again to compute the hash for the manifest. Every thread
+    reuses its own buffer of ``buffer_size`` bytes.
+
+    :param hash_function_name: name of the storage broker hash function,
+                               e.g. ``"md5sum_hexdigest"``
+    :param buffer_size: number of bytes read at a time
+    :param cancel_event: optional :class:`threading.Event`; the copy raises
+                         :class:`InterruptedError` if it is set
+    :raises: ValueError if the hash function is not supported
+    """
+
+    def __init__(self, hash_function_name, buffer_size=HASH_BUFFER_SIZE,
+                 cancel_event=None):
+        if not self.supports(hash_function_name):
+            raise(ValueError("Unsupported hash function: {}".format(
+                hash_function_name
+            )))
+        self._hash_func = _HASH_FUNCTIONS[hash_function_name]
+        self._buffer_size = buffer_size
+        self._cancel_event = cancel_event
+        self._local = threading.local()
+
+    @staticmethod
+    def supports(hash_function_name):
+        """Return True if the hash function can be computed whilst copying.
+
+        :param hash_function_name: name of the storage broker hash function
+        """
+        return hash_function_name in _HASH_FUNCTIONS
+
+    def _get_buffer(self):
+        view = getattr(self._local, "view", None)
+        if view is None:
+            view = memoryview(bytearray(self._buffer_size))
+            self._local.view = view
+        return view
+
+    def copy_file(self, src, dest):
+        """Copy a file and return the hash of its content.
+
+        Any existing file at the destination is replaced.
+
+        :param src: path to the source file
+        :param dest: path to the destination
+        :returns: hexdigest of the content
+        """
+        view = self._get_buffer()
+        hasher = self._hash_func()
+        if os.path.lexists(dest):
+            os.unlink(dest)
+        with open(src, "rb", buffering=0) as src_fh, \
+                open(dest, "wb", buffering=0) as dest_fh:
+            while True:
+                if self._cancel_event is not None and self._cancel_event.is_set():  # NOQA
+                    raise InterruptedError("Copy of {} cancelled".format(src))
+                nbytes = src_fh.readinto(view)
+                if not nbytes:
+                    break
+                chunk = view[:nbytes]
+                hasher.update(chunk)
+                while len(chunk) > 0:
+                    chunk = chunk[dest_fh.write(chunk):]
+        return hasher.hexdigest()
+
+    def copy_file_unhashed(self, src, dest):
+        """Copy a file whose hash is already known.
+
+        The copy is made by the kernel, so the content is not passed through
+        the buffer. Any existing file at the destination is replaced.
+
+        :param src: path to the source file
+        :param dest: path to the destination
+        :returns: strategy used
+        """
+        if os.path.lexists(dest):
+            os.unlink(dest)
+        try:
+            _copy_file_range(src, dest, self._cancel_event)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _copyfile(src, dest)
+            return STRATEGY_COPYFILE
+        return STRATEGY_COPY_FILE_RANGE
+
+
+class TokenBucket(object):
+    """Limit the rate at which bytes are processed.
+
+    The bucket holds up to ``capacity`` tokens and is refilled at ``rate``
+    tokens per second. Consuming more tokens than are available blocks until
+    the deficit has been refilled, so requests larger than the capacity are
+    allowed but paid for afterwards. A bucket can be shared between threads
+    to give them a common budget.
+
+    :param rate: number of bytes per second
+    :param capacity: maximum burst in bytes, defaults to one second's worth
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise(ValueError("Rate must be positive"))
+        self._rate = float(rate)
+        self._capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self._capacity
+        self._last_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """Return the number of bytes per second."""
+        return self._rate
+
+    def consume(self, nbytes, cancel_event=None):
+        """Take tokens from the bucket, waiting until they are available.
+
+        :param nbytes: number of bytes about to be processed
+        :param cancel_event: optional :class:`threading.Event` that stops the
+                             wait when set
+        :returns: number of seconds to wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_time) * self._rate
+            )
+            self._last_time = now
+            self._tokens -= nbytes
+            wait_seconds = max(0.0, -self._tokens / self._rate)
+        if wait_seconds > 0:
+            if cancel_event is None:
+                time.sleep(wait_seconds)
+            else:
+                cancel_event.wait(wait_seconds)
+        return wait_seconds
+
+
+class IngestJournal(object):
+    """Append only record of the items added to a proto dataset.
+
+    The first line of the journal is a header describing the proto dataset.
+    Every following line records an item that has been stored, along with
+    the size and modification time of the input file it was copied from and
+    its manifest properties. Each line is flushed as it is written, so the
+    journal survives the application being closed part way through.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._fh = None
+
+    @property
+    def path(self):
+        """Return the path to the journal file."""
+        return self._path
+
+    def read(self):
+        """Return the header and the recorded items.
+
+        Lines that cannot be parsed, e.g. a last line that was only partly
+        written, are ignored.
+
+        :returns: tuple with the header dictionary, or None if there is no
+                  journal, and a dictionary of recorded items keyed by handle
+        """
+        header = None
+        entries = {}
+        if not os.path.isfile(self._path):
+            return header, entries
+        with open(self._path) as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if header is None:
+                    header = record
+                else:
+                    entries[record["handle"]] = record
+        return header, entries
+
+    def start(self, header):
+        """Start a new journal, replacing any existing one.
+
+        :param header: dictionary describing the proto dataset
+        """
+        dirname = os.path.dirname(self._path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        self._fh = open(self._path, "w")
+        self._write(header)
+
+    def resume(self):
+        """Continue appending to an existing journal."""
+        with open(self._path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            needs_newline = False
+            if fh.tell() > 0:
+                fh.seek(-1, os.SEEK_END)
+                needs_newline = fh.read(1) != b"\n"
+        self._fh = open(self._path, "a")
+        if needs_newline:
+            # Terminate a partly written line so that it does not corrupt
+            # the next record.
+            self._fh.write("\n")
+
+    def record(self, handle, size, mtime_ns, identifier, props):
+        """Record that an item has been stored.
+
+        :param handle: handle of the item
+        :param size: size of the input file in bytes
+        :param mtime_ns: modification time of the input file in nanoseconds
+        :param identifier: identifier of the item
+        :param props: manifest properties of the item
+        """
+        self._write({
+            "handle": handle,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "identifier": identifier,
+            "props": props,
+        })
+
+    def _write(self, record):
+        self._fh.write(json.dumps(record) + "\n")
+        self._fh.flush()
+
+    def remove_entries(self, handles):
+        """Remove recorded items from the journal.
+
+        The journal is rewritten to a temporary file, which then replaces
+        it, so that it is never left partly written.
+
+        :param handles: handles of the items to remove
+        """
+        handles = set(handles)
+        self.close()
+        tmp_path = self._path + ".tmp"
+        with open(self._path) as fh_in, open(tmp_path, "w") as fh_out:
+            for i, line in enumerate(fh_in):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if i > 0 and record["handle"] in handles:
+                    continue
+                fh_out.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self._path)
+
+    def close(self):
+        """Close the journal file."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def remove(self):
+        """Close and delete the journal file."""
+        self.close()
+        if os.path.isfile(self._path):
+            os.remove(self._path)
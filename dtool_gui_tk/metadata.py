@@ -18,26 +18,296 @@ False
 'Not DNA' is not one of ['DNA', 'RNA']
 """
 
-import jsonschema
-import jsonschema.exceptions
-import jsonschema.validators
+import json
+import threading
 
+# jsonschema is slow to import, so it is imported when the first validator
+# is compiled or when SchemaError is first used, see _import_jsonschema.
+_jsonschema_imported = False
+_jsonschema_lock = threading.Lock()
 
-class SchemaError(jsonschema.exceptions.SchemaError):
-    pass
+# Validators shared by all MetadataSchemaItem instances, keyed by the
+# canonical JSON representation of their schema. Each entry is a tuple of
+# the jsonschema validator and the simple validator, if any.
+_validators = {}
+_validators_lock = threading.Lock()
+
+# Values checked by the simple validators; other values, including
+# subclasses of these types, are checked by jsonschema.
+_SIMPLE_VALUE_TYPES = frozenset([str, int, float, bool, type(None)])
+
+_NUMBER_TYPES = frozenset([int, float])
+
+# Keywords that do not affect validation.
+_ANNOTATION_KEYWORDS = frozenset([
+    "title",
+    "description",
+    "default",
+    "examples",
+    "$comment",
+])
+
+
+def _is_integer(value):
+    # As Draft 7, bools are not integers and floats such as 1.0 are.
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (
+        isinstance(value, float) and value.is_integer()
+    )
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Exact Python types of the values of each JSON type. The checks below are
+# only given values of these types, see _SIMPLE_VALUE_TYPES.
+_JSON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _json_equal(a, b):
+    # As JSON, booleans are not equal to the numbers 0 and 1.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    return a == b
+
+
+def _type_check(types):
+    if isinstance(types, str):
+        types = [types]
+    if not isinstance(types, list) or len(types) == 0:
+        return None
+    if not all(isinstance(t, str) and t in _JSON_TYPES for t in types):
+        return None
+    python_types = frozenset(pt for t in types for pt in _JSON_TYPES[t])
+    integral_floats = "integer" in types and float not in python_types
+    reprs = ", ".join(repr(t) for t in types)
+
+    def check(value):
+        value_type = type(value)
+        if value_type in python_types:
+            return None
+        if integral_floats and value_type is float and value.is_integer():
+            return None
+        return "{!r} is not of type {}".format(value, reprs)
+    return check
+
+
+def _enum_check(enum):
+    if not isinstance(enum, list):
+        return None
+    if not all(type(e) in _SIMPLE_VALUE_TYPES for e in enum):
+        return None
+
+    def check(value):
+        for e in enum:
+            if _json_equal(e, value):
+                return None
+        return "{!r} is not one of {!r}".format(value, enum)
+    return check
+
+
+def _bound_check(bound, failed, template):
+    if not _is_number(bound):
+        return None
+
+    def check(value):
+        if type(value) in _NUMBER_TYPES and failed(value, bound):
+            return template.format(value, bound)
+        return None
+    return check
+
+
+def _length_check(length, failed, message):
+    if not _is_integer(length):
+        return None
+
+    def check(value):
+        if type(value) is str and failed(len(value), length):
+            return "{!r} {}".format(value, message)
+        return None
+    return check
+
+
+def _keyword_check(keyword, value):
+    """Return a function checking a value against a keyword, or None."""
+    if keyword == "type":
+        return _type_check(value)
+    if keyword == "enum":
+        return _enum_check(value)
+    if keyword == "minimum":
+        return _bound_check(value, lambda v, b: v < b, "{!r} is less than the minimum of {!r}")  # NOQA
+    if keyword == "maximum":
+        return _bound_check(value, lambda v, b: v > b, "{!r} is greater than the maximum of {!r}")  # NOQA
+    if keyword == "exclusiveMinimum":
+        return _bound_check(value, lambda v, b: v <= b, "{!r} is less than or equal to the minimum of {!r}")  # NOQA
+    if keyword == "exclusiveMaximum":
+        return _bound_check(value, lambda v, b: v >= b, "{!r} is greater than or equal to the maximum of {!r}")  # NOQA
+    if keyword == "minLength":
+        message = "should be non-empty" if value == 1 else "is too short"
+        return _length_check(value, lambda n, m: n < m, message)
+    if keyword == "maxLength":
+        message = "is expected to be empty" if value == 0 else "is too long"
+        return _length_check(value, lambda n, m: n > m, message)
+    return None
+
+
+class SimpleValidator(object):
+    """Validator for schemas made up of simple keywords.
+
+    Most metadata schemas are a type, e.g. ``{"type": "string"}``, a
+    numeric range or a small enum. This validator checks such schemas
+    directly, with the same results and messages as jsonschema (4.21.0 or
+    later), rather than going through jsonschema's generic machinery. Values
+    other than strings, numbers, booleans and None are passed on to the
+    jsonschema validator.
+
+    Use :func:`dtool_gui_tk.metadata.SimpleValidator.from_schema` to create
+    a validator.
+    """
+
+    def __init__(self, checks, fallback):
+        self._checks = checks
+        self._fallback = fallback
+
+    @classmethod
+    def from_schema(cls, schema, fallback):
+        """Return a simple validator for a schema or None if not supported.
+
+        Supported keywords are "type" (with the types "string", "integer",
+        "number", "boolean" and "null"), "enum" (with simple values),
+        "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+        "minLength", "maxLength" and keywords that do not affect validation,
+        such as "description".
+
+        :param schema: JSON schema as a dictionary
+        :param fallback: jsonschema validator for the schema
+        :returns: :class:`dtool_gui_tk.metadata.SimpleValidator` or None
+        """
+        if not isinstance(schema, dict):
+            return None
+        checks = []
+        # Checked in the order of the schema, as jsonschema reports them.
+        for keyword, value in schema.items():
+            if keyword in _ANNOTATION_KEYWORDS:
+                continue
+            check = _keyword_check(keyword, value)
+            if check is None:
+                return None
+            checks.append(check)
+        return cls(checks, fallback)
+
+    def is_valid(self, value):
+        """Return True if the value is valid."""
+        if type(value) not in _SIMPLE_VALUE_TYPES:
+            return self._fallback.is_valid(value)
+        for check in self._checks:
+            if check(value) is not None:
+                return False
+        return True
+
+    def issues(self, value):
+        """Return a list of messages describing why the value is not valid."""
+        if type(value) not in _SIMPLE_VALUE_TYPES:
+            return [e.message for e in self._fallback.iter_errors(value)]
+        issues = []
+        for check in self._checks:
+            message = check(value)
+            if message is not None:
+                issues.append(message)
+        return issues
+
+
+def _import_jsonschema():
+    """Import jsonschema and define :class:`SchemaError`."""
+    global _jsonschema_imported, jsonschema, SchemaError
+    if _jsonschema_imported:
+        return
+    with _jsonschema_lock:
+        if _jsonschema_imported:
+            return
+        import jsonschema.exceptions
+        import jsonschema.validators
+
+        class SchemaError(jsonschema.exceptions.SchemaError):
+            pass
+
+        _jsonschema_imported = True
+
+
+def __getattr__(name):
+    # SchemaError subclasses a jsonschema exception, so it is only defined
+    # once jsonschema has been imported.
+    if name == "SchemaError":
+        _import_jsonschema()
+        return SchemaError
+    raise(AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    ))
+
+
+def _canonical_json(schema):
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"))
+
+
+def _get_validators(schema):
+    key = _canonical_json(schema)
+    validators = _validators.get(key)
+    if validators is not None:
+        return validators
+
+    _import_jsonschema()
+
+    # Ensure that the schema is valid.
+    try:
+        jsonschema.validators.Draft7Validator.check_schema(schema)
+    except jsonschema.exceptions.SchemaError as e:
+        raise(SchemaError(e.message))
+
+    # The validators get their own copy so that changes to the schema passed
+    # in cannot affect the cached validators. The copy keeps the order of
+    # the keys of the first schema seen, which is the order that issues are
+    # reported in.
+    schema_copy = json.loads(json.dumps(schema))
+    validator = jsonschema.validators.Draft7Validator(schema_copy)
+    simple_validator = SimpleValidator.from_schema(schema_copy, validator)
+    with _validators_lock:
+        return _validators.setdefault(key, (validator, simple_validator))
+
+
+def get_validator(schema):
+    """Return the validator of a schema.
+
+    Validators are cached for the lifetime of the process, so each distinct
+    schema is checked and compiled only once. Schemas that are equal as JSON
+    share a validator, regardless of the order of their keys.
+
+    :param schema: JSON schema as a dictionary
+    :returns: :class:`jsonschema.validators.Draft7Validator`
+    :raises: :class:`dtool_gui_tk.metadata.SchemaError` if the schema is not
+             valid
+    """
+    return _get_validators(schema)[0]
+
+
+def clear_validator_cache():
+    """Remove all validators from the cache."""
+    with _validators_lock:
+        _validators.clear()
 
 
 class MetadataSchemaItem(object):
 
     def __init__(self, schema):
         self._schema = schema
-        self._ivalidator = jsonschema.validators.Draft7Validator(schema)
-
-        # Ensure that the schema is valid.
-        try:
-            self._ivalidator.check_schema(self._schema)
-        except jsonschema.exceptions.SchemaError as e:
-            raise(SchemaError(e.message))
+        self._ivalidator, self._simple_validator = _get_validators(schema)
 
     def __eq__(self, other):
         return self._schema == other._schema
@@ -61,7 +331,11 @@ class MetadataSchemaItem(object):
         return self._schema
 
     def is_okay(self, value):
+        if self._simple_validator is not None:
+            return self._simple_validator.is_valid(value)
         return self._ivalidator.is_valid(value)
 
     def issues(self, value):
+        if self._simple_validator is not None:
+            return self._simple_validator.issues(value)
         return [i.message for i in self._ivalidator.iter_errors(value)]
@@ -1,18 +1,42 @@
 import os
+import hashlib
 import logging
 import json
-
+import itertools
+import multiprocessing
+import shutil
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from operator import itemgetter
 
 import dtoolcore
+import dtoolcore.storagebroker
 import dtoolcore.utils
 
 from ruamel.yaml import YAML
 
 # This is a hack.
-from dtool_info.inventory import _dataset_info
 from dtool_info.utils import sizeof_fmt
 
+from dtool_gui_tk.concurrency import iter_completed
+from dtool_gui_tk.ingest import (
+    INGEST_MODE_COPY,
+    INGEST_MODES,
+    STRATEGY_COPY_HASH,
+    STRATEGY_COPYFILE,
+    STRATEGY_DUPLICATE,
+    FileIngester,
+    HashingCopier,
+    IngestJournal,
+    estimate_ingest_seconds,
+    find_duplicates,
+    measure_throughput,
+    preflight_report,
+    scan_input_directory,
+)
 from dtool_gui_tk.metadata import MetadataSchemaItem
 
 logger = logging.getLogger(__name__)
@@ -20,6 +44,267 @@ logger = logging.getLogger(__name__)
 LOCAL_BASE_URI_KEY = "DTOOL_LOCAL_BASE_URI"
 METADATA_SCHEMA_ANNOTATION_NAME = "_metadata_schema"
 
+#: Default number of threads used for concurrent round trips to the storage.
+DEFAULT_NUM_THREADS = 8
+
+#: Default directory for the journals used to resume dataset creation,
+#: relative to the base URI.
+DEFAULT_JOURNAL_DIRECTORY = ".dtool_ingest_journals"
+
+#: Default directory with the metadata schemas.
+DEFAULT_METADATA_SCHEMA_DIRECTORY = os.path.join(
+    os.path.dirname(dtoolcore.utils.DEFAULT_CONFIG_PATH),
+    "metadata_schemas"
+)
+
+# Metadata schema registries by directory.
+_metadata_schema_registries = {}
+_metadata_schema_registries_lock = threading.Lock()
+
+# Modification times more recent than this are not trusted to detect changes.
+_RACY_MTIME_NS = 2 * 10**9
+
+#: Metadata schema that is always available, saved as "basic".
+BASIC_METADATA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {
+            "type": "string"
+        }
+    },
+    "required": ["description"]
+}
+
+#: Statuses reported when verifying dataset items.
+VERIFY_OK = "ok"
+VERIFY_MISSING = "missing"
+VERIFY_SIZE_MISMATCH = "size mismatch"
+VERIFY_HASH_MISMATCH = "hash mismatch"
+
+#: Strategy reported for items added using the storage broker's put_item.
+STRATEGY_PUT_ITEM = "put_item"
+
+# Proto dataset and file ingester used by the processes adding items.
+_ingest_proto_dataset = None
+_ingest_file_ingester = None
+
+
+def _data_path(storage_broker, handle):
+    """Return the path of an item in a proto dataset on local disk."""
+    return os.path.join(
+        storage_broker._data_abspath,
+        dtoolcore.utils.handle_to_osrelpath(
+            handle,
+            dtoolcore.utils.IS_WINDOWS
+        )
+    )
+
+
+def _item_properties(storage_broker, handle, file_hash):
+    """Return the properties of a stored item whose hash is already known.
+
+    Unlike the storage broker's item_properties the item is not read.
+    """
+    return {
+        "size_in_bytes": storage_broker.get_size_in_bytes(handle),
+        "utc_timestamp": storage_broker.get_utc_timestamp(handle),
+        "hash": file_hash,
+        "relpath": storage_broker.get_relpath(handle),
+    }
+
+
+def _put_item(proto_dataset, task, ingester=None):
+    """Put an item into a proto dataset and return its manifest entry.
+
+    The item properties, including the hash, are computed straight after the
+    item has been stored so that the work is spread over the ingestion
+    workers rather than done serially when the dataset is frozen.
+
+    :param proto_dataset: :class:`dtoolcore.ProtoDataSet`
+    :param task: tuple with the path to the file and the handle to give it,
+                 optionally followed by the hash of the file if it is already
+                 known, e.g. from :func:`dtool_gui_tk.ingest.find_duplicates`
+    :param ingester: optional :class:`dtool_gui_tk.ingest.FileIngester` or
+                     :class:`dtool_gui_tk.ingest.HashingCopier` used to put
+                     the file straight into the data directory of a proto
+                     dataset on local disk; a known hash is only used with an
+                     ingester
+    :returns: tuple with the item identifier, the item properties and the
+              strategy used to put the item in place
+    """
+    fpath, handle = task[:2]
+    file_hash = task[2] if len(task) > 2 else None
+    storage_broker = proto_dataset._storage_broker
+    identifier = dtoolcore.utils.generate_identifier(handle)
+    if ingester is None:
+        proto_dataset.put_item(fpath, handle)
+        return identifier, storage_broker.item_properties(handle), STRATEGY_PUT_ITEM  # NOQA
+
+    dest_path = _data_path(storage_broker, handle)
+    dtoolcore.utils.mkdir_parents(os.path.dirname(dest_path))
+    if isinstance(ingester, HashingCopier):
+        if file_hash is None:
+            # The hash is computed whilst copying, so only stat the copy.
+            file_hash = ingester.copy_file(fpath, dest_path)
+            strategy = STRATEGY_COPY_HASH
+        else:
+            strategy = ingester.copy_file_unhashed(fpath, dest_path)
+        return identifier, _item_properties(storage_broker, handle, file_hash), strategy  # NOQA
+    strategy = ingester.ingest_file(fpath, dest_path)
+    if file_hash is None:
+        return identifier, storage_broker.item_properties(handle), strategy
+    return identifier, _item_properties(storage_broker, handle, file_hash), strategy  # NOQA
+
+
+def _put_duplicate(proto_dataset, handle, stored_handle, file_hash):
+    """Put an item with the same content as a stored item into a proto dataset.
+
+    The item is hard linked to the stored item, or copied from it if the
+    file system does not support hard links, so that the input file is not
+    read again. Only applies to proto datasets on local disk.
+
+    :param proto_dataset: :class:`dtoolcore.ProtoDataSet`
+    :param handle: handle to give the item
+    :param stored_handle: handle of the stored item with the same content
+    :param file_hash: hash of the content, as computed by the storage
+                      broker's hash function
+    :returns: tuple with the item identifier, the item properties and the
+              strategy used to put the item in place
+    """
+    storage_broker = proto_dataset._storage_broker
+    stored_path = _data_path(storage_broker, stored_handle)
+    dest_path = _data_path(storage_broker, handle)
+    dtoolcore.utils.mkdir_parents(os.path.dirname(dest_path))
+    if os.path.lexists(dest_path):
+        os.unlink(dest_path)
+    try:
+        os.link(stored_path, dest_path)
+        strategy = STRATEGY_DUPLICATE
+    except OSError:
+        shutil.copyfile(stored_path, dest_path)
+        strategy = STRATEGY_COPYFILE
+    props = _item_properties(storage_broker, handle, file_hash)
+    return dtoolcore.utils.generate_identifier(handle), props, strategy
+
+
+def _make_ingester(storage_broker, ingest_mode, cancel_event=None):
+    """Return the ingester used to put items into a proto dataset.
+
+    Items of proto datasets on local disk are put in place directly: copies
+    are hashed as they are made, so that each input file is read only once.
+    Other proto datasets use the storage broker's put_item.
+
+    :returns: :class:`dtool_gui_tk.ingest.FileIngester`,
+              :class:`dtool_gui_tk.ingest.HashingCopier` or None
+    """
+    if not isinstance(storage_broker, dtoolcore.storagebroker.DiskStorageBroker):  # NOQA
+        return None
+    if ingest_mode != INGEST_MODE_COPY:
+        return FileIngester(ingest_mode, cancel_event)
+    if HashingCopier.supports(storage_broker.hasher.name):
+        return HashingCopier(
+            storage_broker.hasher.name,
+            cancel_event=cancel_event
+        )
+    return None
+
+
+def _iter_throttled(tasks, input_stats, io_budget, cancel_event):
+    """Yield tasks no faster than the I/O budget allows.
+
+    Tasks are taken from the iterator as workers become free, so throttling
+    them here limits the rate for serial, thread and process ingestion.
+    """
+    for task in tasks:
+        size, _ = input_stats.get(task[1], (0, None))
+        io_budget.consume(size or 0, cancel_event)
+        if cancel_event.is_set():
+            return
+        yield task
+
+
+def _init_ingest_worker(uri, ingest_mode, cancel_event=None):
+    global _ingest_proto_dataset, _ingest_file_ingester
+    _ingest_proto_dataset = dtoolcore.ProtoDataSet.from_uri(uri)
+    _ingest_file_ingester = _make_ingester(
+        _ingest_proto_dataset._storage_broker,
+        ingest_mode,
+        cancel_event
+    )
+
+
+def _put_item_in_worker_process(task):
+    return _put_item(_ingest_proto_dataset, task, _ingest_file_ingester)
+
+
+class _ProtoDataSet(dtoolcore.ProtoDataSet):
+    """Proto dataset whose manifest is built from known item properties.
+
+    :meth:`dtoolcore.ProtoDataSet.generate_manifest` reads every item to
+    compute its properties. If ``manifest_items`` is set, and has an entry
+    for every item in the storage, the manifest is built from it instead.
+    """
+
+    manifest_items = None
+
+    def generate_manifest(self, progressbar=None):
+        """Return manifest generated from the known item properties."""
+        if self.manifest_items is None:
+            return super().generate_manifest(progressbar=progressbar)
+
+        identifiers = set(
+            dtoolcore.utils.generate_identifier(handle)
+            for handle in self._storage_broker.iter_item_handles()
+        )
+        if identifiers != set(self.manifest_items):
+            logger.warning(
+                "Item properties do not match the items in {}, reading all items".format(self.uri)  # NOQA
+            )
+            return super().generate_manifest(progressbar=progressbar)
+
+        return {
+            "items": self.manifest_items,
+            "dtoolcore_version": dtoolcore.__version__,
+            "hash_function": self._storage_broker.hasher.name
+        }
+
+
+def _freeze_with_manifest_items(proto_dataset, manifest_items):
+    """Freeze a proto dataset using item properties computed on ingestion.
+
+    Stops :meth:`dtoolcore.ProtoDataSet.freeze` from reading every item
+    again to generate the manifest.
+
+    :param proto_dataset: :class:`dtoolcore.ProtoDataSet`
+    :param manifest_items: dictionary of item properties keyed by identifier
+    """
+    proto_dataset = _ProtoDataSet.from_uri(proto_dataset.uri)
+    proto_dataset.manifest_items = manifest_items
+    proto_dataset.freeze()
+
+
+def _verify_item_size(item):
+    """Return verification status of an item based on its size."""
+    identifier, relpath, abspath, size_in_bytes, _ = item
+    try:
+        actual_size = os.path.getsize(abspath)
+    except (IOError, OSError):
+        return VERIFY_MISSING
+    if actual_size != size_in_bytes:
+        return VERIFY_SIZE_MISMATCH
+    return VERIFY_OK
+
+
+def _verify_item_hash(item):
+    """Return verification status of an item based on its size and hash."""
+    status = _verify_item_size(item)
+    if status != VERIFY_OK:
+        return status
+    identifier, relpath, abspath, _, expected_hash = item
+    if dtoolcore.storagebroker.DiskStorageBroker.hasher(abspath) != expected_hash:  # NOQA
+        return VERIFY_HASH_MISMATCH
+    return VERIFY_OK
+
 
 def get_json_schema_type(obj):
     """Return JSON schema type representation of object.
@@ -43,36 +328,52 @@ def get_json_schema_type(obj):
         raise(UnsupportedTypeError("{} not supported yet".format(type(obj))))
 
 
-def metadata_model_from_dataset(dataset):
-    """Return MetadataModel from a dataset.
+def values_equal(a, b):
+    """Return True if the two metadata values are the same.
 
-    Schema extracted from the readme and annotations. Specifically,
-    if an annotation named "_metadata_schema" it is loaded. Key value pairs
-    from the readme are then added. Key value pairs are then extracted from
-    the dataset annotations (the "_metdata_schema" key is ignored).
+    Stricter than ``==`` so that e.g. ``True`` and ``1`` are considered to be
+    different values.
+    """
+    return type(a) is type(b) and a == b
 
-    The precedent for determining the type for a schema item is to use the
-    type defined in the "_metadata_schema" if present, if not the type of
-    the value extracted from the dataset is used.
+
+def _generate_readme_content(metadata_model):
+    """Return README content describing the in scope metadata."""
+    readme_lines = ["---"]
+    for key in metadata_model.in_scope_item_names:
+        value = metadata_model.get_value(key)
+        readme_lines.append("{}: {}".format(key, value))
+    return "\n".join(readme_lines)
+
+
+def load_metadata_from_dataset(dataset):
+    """Return metadata model and the metadata as stored in the dataset.
+
+    Each piece of metadata is only read from the dataset once.
 
     :param dataset: :class:`dtoolcore.DataSet`
-    :returns: :class:`dtool_gui_tk.models.MetadataModel` instance
-    :raises dtool_gui_tk.models.MetadataConflictError: if the values extracted
-        from the readme and annotations do not match for a particular key
-    :raises dtool_gui_tk.models.UnsupportedTypeError: if the value is not
-        supported, see :func:`dtool_gui_tk.models.get_json_schema_type`.
+    :returns: tuple with a :class:`dtool_gui_tk.models.MetadataModel`
+              instance, a dictionary with the annotations (excluding the
+              "_metadata_schema" annotation), the README content and the
+              "_metadata_schema" annotation (None if it is not present)
     """
     metadata_model = MetadataModel()
 
+    annotation_names = dataset.list_annotation_names()
+
+    metadata_schema = None
     ignore_metadata_schemas = set()
-    if METADATA_SCHEMA_ANNOTATION_NAME in dataset.list_annotation_names():
-        schema = dataset.get_annotation(METADATA_SCHEMA_ANNOTATION_NAME)
-        metadata_model.load_master_schema(schema)
+    if METADATA_SCHEMA_ANNOTATION_NAME in annotation_names:
+        metadata_schema = dataset.get_annotation(
+            METADATA_SCHEMA_ANNOTATION_NAME
+        )
+        metadata_model.load_master_schema(metadata_schema)
         for name in metadata_model.item_names:
             ignore_metadata_schemas.add(name)
 
+    readme_content = dataset.get_readme_content()
     yaml = YAML()
-    readme_dict = yaml.load(dataset.get_readme_content())
+    readme_dict = yaml.load(readme_content)
     if readme_dict is None:
         readme_dict = {}
 
@@ -89,13 +390,15 @@ def metadata_model_from_dataset(dataset):
             # Update the value regardless.
             metadata_model.set_value(key, value)
 
-    for key in dataset.list_annotation_names():
+    annotations = {}
+    for key in annotation_names:
 
         # Ignore the special key that stores a schema.
         if key == METADATA_SCHEMA_ANNOTATION_NAME:
             continue
 
         value = dataset.get_annotation(key)
+        annotations[key] = value
         _type = get_json_schema_type(value)
         schema = {"type": _type}
 
@@ -113,11 +416,38 @@ def metadata_model_from_dataset(dataset):
             metadata_model.add_metadata_property(key, schema, True)
 
         # Update the value regardless.
-        metadata_model.set_value(key, dataset.get_annotation(key))
+        metadata_model.set_value(key, value)
+
+    return metadata_model, annotations, readme_content, metadata_schema
+
 
+def metadata_model_from_dataset(dataset):
+    """Return MetadataModel from a dataset.
+
+    Schema extracted from the readme and annotations. Specifically,
+    if an annotation named "_metadata_schema" it is loaded. Key value pairs
+    from the readme are then added. Key value pairs are then extracted from
+    the dataset annotations (the "_metdata_schema" key is ignored).
+
+    The precedent for determining the type for a schema item is to use the
+    type defined in the "_metadata_schema" if present, if not the type of
+    the value extracted from the dataset is used.
+
+    :param dataset: :class:`dtoolcore.DataSet`
+    :returns: :class:`dtool_gui_tk.models.MetadataModel` instance
+    :raises dtool_gui_tk.models.MetadataConflictError: if the values extracted
+        from the readme and annotations do not match for a particular key
+    :raises dtool_gui_tk.models.UnsupportedTypeError: if the value is not
+        supported, see :func:`dtool_gui_tk.models.get_json_schema_type`.
+    """
+    metadata_model, _, _, _ = load_metadata_from_dataset(dataset)
     return metadata_model
 
 
+class DataSetCreationCancelledError(RuntimeError):
+    pass
+
+
 class DirectoryDoesNotExistError(IOError):
     pass
 
@@ -150,6 +480,10 @@ class MissingRequiredMetadataError(ValueError):
     pass
 
 
+class UnsupportedStorageError(ValueError):
+    pass
+
+
 class UnsupportedTypeError(TypeError):
     pass
 
@@ -173,6 +507,56 @@ class _ConfigFileVariableBaseModel(object):
         )
 
 
+def setup_metadata_schema_directory(metadata_schema_directory=DEFAULT_METADATA_SCHEMA_DIRECTORY):  # NOQA
+    """Create the metadata schema directory and the basic schema if missing.
+
+    :param metadata_schema_directory: path to the metadata schema directory
+    :returns: absolute path to the metadata schema directory
+    """
+    metadata_schema_directory = os.path.abspath(metadata_schema_directory)
+    dtoolcore.utils.mkdir_parents(metadata_schema_directory)
+    basic_schema_fpath = os.path.join(metadata_schema_directory, "basic.json")
+    if not os.path.isfile(basic_schema_fpath):
+        with open(basic_schema_fpath, "w") as fh:
+            json.dump(BASIC_METADATA_SCHEMA, fh)
+    return metadata_schema_directory
+
+
+def warm_up_metadata_schemas(metadata_schema_list_model, cancel_event=None):
+    """Load the metadata schemas and compile their validators.
+
+    Intended to be run in a background thread when an application starts,
+    so that the schemas are ready when they are first needed. The thread
+    yields to other threads between schemas.
+
+    :param metadata_schema_list_model:
+        :class:`dtool_gui_tk.models.MetadataSchemaListModel`
+    :param cancel_event: optional :class:`threading.Event`; when set no more
+                         schemas are loaded
+    :returns: names of the metadata schemas that were loaded
+    """
+    start = time.perf_counter()
+    loaded = []
+    for name in metadata_schema_list_model.metadata_model_names:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        try:
+            metadata_schema_list_model.get_metadata_model(name)
+        except Exception as e:
+            logger.warning("Failed to warm up metadata schema {}: {}".format(
+                name,
+                e
+            ))
+            continue
+        loaded.append(name)
+        time.sleep(0)
+    logger.info("Warmed up {} metadata schema(s) in {:.3f}s".format(
+        len(loaded),
+        time.perf_counter() - start
+    ))
+    return loaded
+
+
 class LocalBaseURIModel(_ConfigFileVariableBaseModel):
     "Model for managing local base URI."
 
@@ -196,18 +580,144 @@ class LocalBaseURIModel(_ConfigFileVariableBaseModel):
         self._put(value)
 
 
+def _stat_key(path):
+    """Return key that changes when a file or directory is modified.
+
+    None is returned if the modification time is too recent to be trusted,
+    as a change within the resolution of the file system clock would not
+    change the key.
+    """
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns < _RACY_MTIME_NS:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _MetadataSchemaRegistry(object):
+    """Metadata models loaded from the JSON schemas in a directory.
+
+    Each schema is loaded and validated once. The directory is rescanned
+    when its modification time changes and a schema is reloaded when the
+    modification time or size of its file changes. Copies of the loaded
+    models are handed out.
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._directory_key = None
+        # Name to (stat key, metadata model or exception raised loading it).
+        self._entries = {}
+
+    def _fpath(self, name):
+        return os.path.join(self._directory, name + ".json")
+
+    def _load(self, name):
+        fpath = self._fpath(name)
+        key = None
+        try:
+            key = _stat_key(fpath)
+            with open(fpath) as fh:
+                master_schema = json.load(fh)
+            metadata_model = MetadataModel()
+            metadata_model.load_master_schema(master_schema)
+            logger.info("Loaded metadata schema {}".format(fpath))
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            raise
+        except Exception as e:
+            logger.warning("Failed to load metadata schema {}: {}".format(
+                fpath,
+                e
+            ))
+            metadata_model = e
+        self._entries[name] = (key, metadata_model)
+
+    def _refresh(self):
+        """Rescan the directory if it has changed."""
+        if self._directory_key is not None:
+            if _stat_key(self._directory) == self._directory_key:
+                return
+        directory_key = _stat_key(self._directory)
+        names = set()
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                name, ext = os.path.splitext(entry.name)
+                if ext == ".json" and entry.is_file():
+                    names.add(name)
+        for name in set(self._entries) - names:
+            del self._entries[name]
+        for name in names:
+            self._refresh_item(name)
+        self._directory_key = directory_key
+
+    def _refresh_item(self, name):
+        """Reload a schema if its file has changed."""
+        if name in self._entries:
+            key = self._entries[name][0]
+            if key is not None and _stat_key(self._fpath(name)) == key:
+                return
+        self._load(name)
+
+    @property
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return sorted(self._entries.keys())
+
+    def get(self, name):
+        with self._lock:
+            self._refresh()
+            self._refresh_item(name)
+            metadata_model = self._entries[name][1]
+        if isinstance(metadata_model, Exception):
+            raise(metadata_model)
+        return metadata_model.copy()
+
+    def put(self, name, metadata_schema):
+        with self._lock:
+            with open(self._fpath(name), "w") as fh:
+                json.dump(metadata_schema, fh)
+            self._load(name)
+
+
+def _get_metadata_schema_registry(metadata_schema_directory):
+    """Return the registry of the metadata schemas in a directory.
+
+    The registries are shared by all the
+    :class:`dtool_gui_tk.models.MetadataSchemaListModel` instances in the
+    process.
+    """
+    metadata_schema_directory = os.path.abspath(metadata_schema_directory)
+    with _metadata_schema_registries_lock:
+        if metadata_schema_directory not in _metadata_schema_registries:
+            _metadata_schema_registries[metadata_schema_directory] = _MetadataSchemaRegistry(metadata_schema_directory)  # NOQA
+        return _metadata_schema_registries[metadata_schema_directory]
+
+
 class MetadataSchemaListModel(_ConfigFileVariableBaseModel):
-    "Model for managing list of metadata schama."
+    """Model for managing list of metadata schama.
+
+    The metadata schemas are loaded once into a registry shared by all
+    instances in the process; files that change are reloaded. The metadata
+    schema directory is read from the config file once per instance.
+    """
 
     KEY = "DTOOL_METADATA_SCHEMA_DIRECTORY"
 
+    def __init__(self, config_path=None):
+        super(MetadataSchemaListModel, self).__init__(config_path)
+        self._metadata_schema_directory = None
+
     def get_metadata_schema_directory(self):
         """Return the metadata schema directory.
 
         :returns: absolute path to directory where metadata schemas are stored
                   as JSON files
         """
-        return self._get()
+        if self._metadata_schema_directory is None:
+            self._metadata_schema_directory = self._get()
+        return self._metadata_schema_directory
 
     def put_metadata_schema_directory(self, metadata_schema_directory):
         """Put/update the path to the metadata schema directory.
@@ -218,6 +728,12 @@ class MetadataSchemaListModel(_ConfigFileVariableBaseModel):
         """
         value = os.path.abspath(metadata_schema_directory)
         self._put(value)
+        self._metadata_schema_directory = value
+
+    def _get_registry(self):
+        return _get_metadata_schema_registry(
+            self.get_metadata_schema_directory()
+        )
 
     def put_metadata_schema_item(self, name, metadata_schema):
         """Put/update a metadata schema item in the metadata schema directory.
@@ -225,49 +741,52 @@ class MetadataSchemaListModel(_ConfigFileVariableBaseModel):
         :param name: name of the metadata schema
         :param metadata_schema: dictionary with the metadata schema
         """
-        fname = name + ".json"
-        fpath = os.path.join(
-            self.get_metadata_schema_directory(),
-            fname
-        )
-        with open(fpath, "w") as fh:
-            json.dump(metadata_schema, fh)
+        self._get_registry().put(name, metadata_schema)
 
     @property
     def metadata_model_names(self):
         """Return list of metadata model names.
 
-        :returns: list of metadata model names
+        :returns: names of the JSON files in the metadata schema directory
+                  without the extension
         """
-        metadata_schema_directory = self.get_metadata_schema_directory()
-        if metadata_schema_directory is None:
+        if self.get_metadata_schema_directory() is None:
             return []
-        filenames = os.listdir(metadata_schema_directory)
-        return sorted([os.path.splitext(f)[0] for f in filenames])
+        return self._get_registry().names
 
     def get_metadata_model(self, name):
         """Returns class:`dtool_gui_tk.models.MetadataModel` instance.
 
+        The model is a copy of the model loaded when the schema was first
+        requested or last changed, so it can be modified freely.
+
         :param name: metadata model name
         :returns: `dtool_gui_tk.models.MetadataModel instance
+        :raises: FileNotFoundError if there is no schema with the name
         """
-        metadata_schema_directory = self.get_metadata_schema_directory()
-        schema_fpath = os.path.join(metadata_schema_directory, name + ".json")
-        metadata_model = MetadataModel()
-        with open(schema_fpath) as fh:
-            master_schema = json.load(fh)
-        metadata_model.load_master_schema(master_schema)
-        return metadata_model
+        return self._get_registry().get(name)
 
 
 class MetadataModel(object):
-    "Model for managing metadata."
+    """Model for managing metadata.
+
+    Validation results are cached per item. Setting a value or a schema marks
+    the item as dirty and only dirty items are revalidated, so that repeated
+    calls to :func:`dtool_gui_tk.models.MetadataModel.all_issues` only do
+    work for the items that changed. Values are assumed not to be mutated in
+    place; use :func:`dtool_gui_tk.models.MetadataModel.set_value` instead.
+
+    The sorted lists of item names are also cached, and only rebuilt when the
+    schema or the selection of optional items changes.
+    """
 
     def __init__(self):
         self._metadata_schema_items = {}
         self._metadata_values = {}
         self._required_item_names = set()
         self._selected_optional_item_names = set()
+        self._name_views = None
+        self._reset_issues_cache()
 
     def __eq__(self, other):
         if not self._metadata_schema_items == other._metadata_schema_items:
@@ -291,13 +810,37 @@ class MetadataModel(object):
             return True
         return False
 
+    def _get_name_views(self):
+        """Return cached sorted lists of item names, building them if stale."""
+        if self._name_views is None:
+            optional = set(self._metadata_schema_items.keys())
+            optional -= self._required_item_names
+            selected = self._selected_optional_item_names
+            views = {
+                "item_names": sorted(self._metadata_schema_items.keys()),
+                "required_item_names": sorted(self._required_item_names),
+                "optional_item_names": sorted(optional),
+                "selected_optional_item_names": sorted(selected),
+                "deselected_optional_item_names": sorted(optional - selected),
+                "optional_set": optional,
+            }
+            views["in_scope_item_names"] = (
+                views["required_item_names"]
+                + views["selected_optional_item_names"]
+            )
+            views["in_scope_index"] = {
+                name: i for i, name in enumerate(views["in_scope_item_names"])
+            }
+            self._name_views = views
+        return self._name_views
+
     @property
     def item_names(self):
         """Return metadata names (keys).
 
         :returns: names of items in the metadata schema
         """
-        return sorted(self._metadata_schema_items.keys())
+        return list(self._get_name_views()["item_names"])
 
     @property
     def required_item_names(self):
@@ -305,7 +848,7 @@ class MetadataModel(object):
 
         :returns: names of required items in the metadata schema
         """
-        return sorted(list(self._required_item_names))
+        return list(self._get_name_views()["required_item_names"])
 
     @property
     def optional_item_names(self):
@@ -313,9 +856,23 @@ class MetadataModel(object):
 
         :returns: names of optional items in the metadata schema
         """
-        all_set = set(self.item_names)
-        required_set = set(self.required_item_names)
-        return sorted(list(all_set - required_set))
+        return list(self._get_name_views()["optional_item_names"])
+
+    def is_required_item(self, name):
+        """Return True if the metadata item is required.
+
+        :param name: name of the metadata
+        :returns: boolean
+        """
+        return name in self._required_item_names
+
+    def is_optional_item(self, name):
+        """Return True if the metadata item is optional.
+
+        :param name: name of the metadata
+        :returns: boolean
+        """
+        return name in self._get_name_views()["optional_set"]
 
     @property
     def selected_optional_item_names(self):
@@ -329,7 +886,7 @@ class MetadataModel(object):
 
         :returns: names of selected optional items in the metadata schema
         """
-        return sorted(list(self._selected_optional_item_names))
+        return list(self._get_name_views()["selected_optional_item_names"])
 
     @property
     def deselected_optional_item_names(self):
@@ -340,9 +897,7 @@ class MetadataModel(object):
 
         :returns: names of deselected optional items in the metadata schema
         """
-        optional_set = set(self.optional_item_names)
-        selected_set = set(self.selected_optional_item_names)
-        return sorted(list(optional_set - selected_set))
+        return list(self._get_name_views()["deselected_optional_item_names"])
 
     @property
     def in_scope_item_names(self):
@@ -351,7 +906,25 @@ class MetadataModel(object):
         :returns: names of required and selected optional items in the metadata
                   schema
         """
-        return self.required_item_names + self.selected_optional_item_names
+        return list(self._get_name_views()["in_scope_item_names"])
+
+    def next_in_scope_item_name(self, name):
+        """Return the name of the in scope item that follows another one.
+
+        Wraps around to the first in scope item after the last one.
+
+        :param name: name of an in scope metadata item
+        :returns: name of the next in scope metadata item
+        :raises: ValueError if the item is not in scope
+        """
+        views = self._get_name_views()
+        if name not in views["in_scope_index"]:
+            raise(ValueError("{} is not in scope".format(name)))
+        in_scope_item_names = views["in_scope_item_names"]
+        next_index = views["in_scope_index"][name] + 1
+        if next_index >= len(in_scope_item_names):
+            next_index = 0
+        return in_scope_item_names[next_index]
 
     @property
     def all_issues(self):
@@ -361,16 +934,37 @@ class MetadataModel(object):
         been selected. Each value that has been set is evaluated against its
         schema.
 
+        Only items that have changed since the last validation are
+        revalidated.
+
         :returns: list of issues
         """
-        _issues = []
-        for item_name in self.in_scope_item_names:
-            schema = self.get_schema(item_name)
-            value = self.get_value(item_name)
-            if value is not None:
-                for i in schema.issues(value):
-                    _issues.append((item_name, str(i)))
-        return _issues
+        if self._all_issues is None:
+            _issues = []
+            for item_name in self._get_name_views()["in_scope_item_names"]:
+                for i in self._get_item_issues(item_name):
+                    _issues.append((item_name, i))
+            self._all_issues = _issues
+        return list(self._all_issues)
+
+    def copy(self):
+        """Return a copy of the model.
+
+        The :class:`metadata.MetadataSchemaItem` instances and the cached
+        validation results are shared, as they are not modified in place.
+
+        :returns: :class:`dtool_gui_tk.models.MetadataModel`
+        """
+        other = MetadataModel()
+        other._metadata_schema_items = dict(self._metadata_schema_items)
+        other._metadata_values = dict(self._metadata_values)
+        other._required_item_names = set(self._required_item_names)
+        other._selected_optional_item_names = set(self._selected_optional_item_names)  # NOQA
+        other._name_views = self._name_views
+        other._item_issues = dict(self._item_issues)
+        other._dirty_item_names = set(self._dirty_item_names)
+        other._all_issues = self._all_issues
+        return other
 
     def clear(self):
         """Clear the model of existing data."""
@@ -378,6 +972,42 @@ class MetadataModel(object):
         self._metadata_values = {}
         self._required_item_names = set()
         self._selected_optional_item_names = set()
+        self._name_views = None
+        self._reset_issues_cache()
+
+    def _reset_issues_cache(self):
+        self._item_issues = {}
+        self._dirty_item_names = set()
+        self._all_issues = None
+
+    def _mark_dirty(self, name):
+        self._dirty_item_names.add(name)
+        self._all_issues = None
+
+    def _scope_changed(self):
+        self._name_views = None
+        self._all_issues = None
+
+    def _get_item_issues(self, name):
+        """Return cached issues of an item, revalidating it if it is dirty."""
+        if name in self._dirty_item_names or name not in self._item_issues:
+            _issues = []
+            schema = self.get_schema(name)
+            value = self.get_value(name)
+            if value is not None:
+                for i in schema.issues(value):
+                    _issues.append(str(i))
+            self._item_issues[name] = _issues
+            self._dirty_item_names.discard(name)
+        return self._item_issues[name]
+
+    @property
+    def dirty_item_names(self):
+        """Return names of items whose issues need to be revalidated.
+
+        :returns: sorted list of names of dirty items
+        """
+        return sorted(self._dirty_item_names)
 
     def load_master_schema(self, master_schema):
         """Load JSON schema of an object describing the metadata model.
@@ -402,10 +1032,12 @@ class MetadataModel(object):
         """
         for name, schema in master_schema["properties"].items():
             self._metadata_schema_items[name] = MetadataSchemaItem(schema)
+            self._mark_dirty(name)
 
         if "required" in master_schema:
             for r in master_schema["required"]:
                 self._required_item_names.add(r)
+        self._scope_changed()
 
     def add_metadata_property(self, name, schema={}, required=False):
         """Add a metadata property to the master schema.
@@ -420,8 +1052,10 @@ class MetadataModel(object):
                          or optional
         """
         self._metadata_schema_items[name] = MetadataSchemaItem(schema)
+        self._mark_dirty(name)
         if required:
             self._required_item_names.add(name)
+        self._scope_changed()
 
     def get_master_schema(self):
         """Return JSON schema of object describing the metadata model.
@@ -467,6 +1101,7 @@ class MetadataModel(object):
         :param value: value to set the metadata to
         """
         self._metadata_values[name] = value
+        self._mark_dirty(name)
 
     def set_value_from_str(self, name, value_as_str):
         """Set the metadata value from a string forcing the type.
@@ -512,32 +1147,31 @@ class MetadataModel(object):
         :param name: name of the metadata
         :returns: True if the value is valid
         """
-        schema = self.get_schema(name)
         value = self.get_value(name)
-        return schema.is_okay(value)
+        if value is None:
+            return self.get_schema(name).is_okay(value)
+        return len(self._get_item_issues(name)) == 0
 
     def issues(self, name):
         """Return list of issues with specific metadata item.
 
+        The issues are cached until the value or schema of the item changes.
+
         :returns: list of issues
         """
-        _issues = []
-        schema = self.get_schema(name)
-        value = self.get_value(name)
-        if value is not None:
-            for i in schema.issues(value):
-                _issues.append(str(i))
-        return _issues
+        return list(self._get_item_issues(name))
 
     def select_optional_item(self, name):
         "Mark an optinal metadata item as selected."
-        if name in self.optional_item_names:
+        if self.is_optional_item(name):
             self._selected_optional_item_names.add(name)
+            self._scope_changed()
 
     def deselect_optional_item(self, name):
         "Mark an optinal metadata item as not selected."
-        if name in self.selected_optional_item_names:
+        if name in self._selected_optional_item_names:
             self._selected_optional_item_names.remove(name)
+            self._scope_changed()
 
 
 class DataSetModel(object):
@@ -546,6 +1180,11 @@ class DataSetModel(object):
     def __init__(self):
         self._dataset = None
         self._metadata_model = None
+        self._item_props_list = None
+        self._size_statistics = None
+        self._stored_annotations = {}
+        self._stored_readme_content = None
+        self._stored_metadata_schema = None
 
     @property
     def name(self):
@@ -603,19 +1242,49 @@ class DataSetModel(object):
         """Clear the model of existing data."""
         self._dataset = None
         self._metadata_model = None
+        self._item_props_list = None
+        self._size_statistics = None
+        self._stored_annotations = {}
+        self._stored_readme_content = None
+        self._stored_metadata_schema = None
 
-    def load_dataset(self, uri):
+    def load_dataset(self, uri, config_path=None):
         """Load the dataset from a URI.
 
         :param uri: URI to a dtoolcore.DataSet
+        :param config_path: dtool config file
         """
         logger.info("{} loading dataset from URI: {}".format(self, uri))
+        dataset = dtoolcore.DataSet.from_uri(uri, config_path=config_path)
+        self.set_dataset(dataset)
+
+    def set_dataset(self, dataset):
+        """Load a dataset that has already been loaded from its URI.
+
+        Avoids reading the dataset from its URI again, e.g. for datasets
+        listed by a :class:`dtool_gui_tk.models.DataSetListModel`.
+
+        :param dataset: :class:`dtoolcore.DataSet`
+        """
         self.clear()
-        self._dataset = dtoolcore.DataSet.from_uri(uri)
-        self._metadata_model = metadata_model_from_dataset(self._dataset)
+        self._dataset = dataset
+        (
+            self._metadata_model,
+            self._stored_annotations,
+            self._stored_readme_content,
+            self._stored_metadata_schema
+        ) = load_metadata_from_dataset(self._dataset)
 
     def get_item_props_list(self):
-        """Return list of dict of properties for each item in the dataset."""
+        """Return list of dict of properties for each item in the dataset.
+
+        The list is built from the manifest the first time it is requested and
+        cached until the model is cleared or another dataset is loaded. This
+        makes it possible to build the item listing in a worker thread and
+        display it later without touching the storage again.
+        """
+        if self._item_props_list is not None:
+            return self._item_props_list
         item_props_list = []
         for identifier in self._dataset.identifiers:
             props = self._dataset.item_properties(identifier)
@@ -625,7 +1294,121 @@ class DataSetModel(object):
                 "size_int": props["size_in_bytes"],
                 "size_str": sizeof_fmt(props["size_in_bytes"])
             })
-        return sorted(item_props_list, key=itemgetter("relpath"))
+        self._item_props_list = sorted(
+            item_props_list,
+            key=itemgetter("relpath")
+        )
+        return self._item_props_list
+
+    def get_size_statistics(self):
+        """Return statistics describing the sizes of the items in the dataset.
+
+        Computed from the item listing, see
+        :func:`dtool_gui_tk.models.DataSetModel.get_item_props_list`, and
+        cached along with it.
+
+        :returns: dictionary, see :func:`dtool_gui_tk.stats.size_statistics`
+        """
+        if self._size_statistics is None:
+            # Imported here so that NumPy is only loaded when it is needed.
+            from dtool_gui_tk.stats import size_statistics
+            item_props_list = self.get_item_props_list()
+            self._size_statistics = size_statistics(
+                [props["size_int"] for props in item_props_list],
+                [props["relpath"] for props in item_props_list]
+            )
+        return self._size_statistics
+
+    def iter_verify_items(self, full=False, num_workers=None,
+                          cancel_event=None, mp_context=None):
+        """Yield the result of verifying each item against the manifest.
+
+        In fast mode only the existence and size of each item are checked.
+        In full mode the hash of each item is also recomputed, using a pool
+        of processes.
+
+        Results are yielded as they become available, i.e. not in manifest
+        order. Setting the ``cancel_event`` stops the verification after the
+        items currently being processed.
+
+        Only datasets on local disk can be verified: the items are read
+        straight from the data directory of the dataset.
+
+        :param full: recompute item hashes if True
+        :param num_workers: number of worker threads (fast mode) or processes
+                            (full mode), defaults to the number of CPUs in
+                            full mode
+        :param cancel_event: optional :class:`threading.Event`
+        :param mp_context: optional :mod:`multiprocessing` context used to
+                           start the processes in full mode, e.g. a "spawn"
+                           context when verifying from a GUI
+        :returns: iterator yielding dictionaries with the keys "identifier",
+                  "relpath" and "status"
+        :raises dtool_gui_tk.models.UnsupportedStorageError: if the dataset
+            is not on local disk
+        """
+        parsed_uri = dtoolcore.utils.generous_parse_uri(self._dataset.uri)
+        if parsed_uri.scheme != "file":
+            raise(UnsupportedStorageError(
+                "Only datasets on local disk can be verified: {}".format(
+                    self._dataset.uri
+                )
+            ))
+        dataset_path = parsed_uri.path
+        if dtoolcore.utils.IS_WINDOWS:
+            dataset_path = dtoolcore.utils.unix_to_windows_path(dataset_path)
+        data_directory = os.path.join(os.path.abspath(dataset_path), "data")
+
+        items = []
+        for identifier in self._dataset.identifiers:
+            props = self._dataset.item_properties(identifier)
+            abspath = os.path.join(
+                data_directory,
+                dtoolcore.utils.handle_to_osrelpath(
+                    props["relpath"],
+                    dtoolcore.utils.IS_WINDOWS
+                )
+            )
+            items.append((
+                identifier,
+                props["relpath"],
+                abspath,
+                props["size_in_bytes"],
+                props["hash"]
+            ))
+
+        if full:
+            if num_workers is None:
+                num_workers = os.cpu_count() or 1
+            executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=mp_context
+            )
+            func = _verify_item_hash
+        else:
+            if num_workers is None:
+                num_workers = DEFAULT_NUM_THREADS
+            executor = ThreadPoolExecutor(max_workers=num_workers)
+            func = _verify_item_size
+
+        logger.info("Verifying {} items in {} mode using {} workers".format(
+            len(items),
+            "full" if full else "fast",
+            num_workers
+        ))
+        with executor:
+            for item, status in iter_completed(
+                executor,
+                func,
+                items,
+                window=4 * num_workers,
+                cancel_event=cancel_event
+            ):
+                yield {
+                    "identifier": item[0],
+                    "relpath": item[1],
+                    "status": status
+                }
 
     def update_name(self, name):
         """Update the name of the dataset.
@@ -634,14 +1417,19 @@ class DataSetModel(object):
         """
         self._dataset.update_name(name)
 
-    def update_metadata(self):
+    def update_metadata(self, num_threads=DEFAULT_NUM_THREADS):
         """Update dataset with any changes made to the metadata model.
 
-        Sets all the metadata for all
+        Sets the metadata for the
         :attr:`dtool_gui_tk.models.MetadataModel.in_scope_item_names`
 
-        Both the dataset readme and annotations are updated.
+        Both the dataset readme and annotations are updated. Only the
+        annotations whose values differ from the ones loaded from the dataset
+        are written. The readme and the "_metadata_schema" annotation are
+        only written if their content has changed. The writes are made
+        concurrently.
 
+        :param num_threads: maximum number of concurrent writes
         :raises dtool_gui_tk.models.MetadataValidationError: if the metadata
             value is not valid according to its schema
         :raises dtool_gui_tk.models.MissingRequiredMetadataError: if a required
@@ -665,20 +1453,52 @@ class DataSetModel(object):
                     "Metadata {} value not valid: {}".format(name, value)
                 ))
 
-        readme_lines = ["---"]
+        changed_annotations = {}
         for key in self.metadata_model.in_scope_item_names:
             value = self.metadata_model.get_value(key)
-            self._dataset.put_annotation(key, value)
-            readme_lines.append("{}: {}".format(key, value))
-        readme_content = "\n".join(readme_lines)
-        self._dataset.put_readme(readme_content)
+            if key in self._stored_annotations:
+                if values_equal(self._stored_annotations[key], value):
+                    continue
+            changed_annotations[key] = value
+
+        readme_content = _generate_readme_content(self.metadata_model)
+        readme_changed = readme_content != self._stored_readme_content
 
-        # Update _metadata_schema annotation.
         metadata_schema = self.metadata_model.get_master_schema()
-        self._dataset.put_annotation(
-            METADATA_SCHEMA_ANNOTATION_NAME,
-            metadata_schema
-        )
+        schema_changed = metadata_schema != self._stored_metadata_schema
+
+        logger.info("Writing {} changed annotation(s), readme changed: {}, schema changed: {}".format(  # NOQA
+            len(changed_annotations),
+            readme_changed,
+            schema_changed
+        ))
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for key, value in changed_annotations.items():
+                futures.append(
+                    executor.submit(self._dataset.put_annotation, key, value)
+                )
+            if readme_changed:
+                futures.append(
+                    executor.submit(self._dataset.put_readme, readme_content)
+                )
+            if schema_changed:
+                futures.append(executor.submit(
+                    self._dataset.put_annotation,
+                    METADATA_SCHEMA_ANNOTATION_NAME,
+                    metadata_schema
+                ))
+
+        # Raise the first error, if any, after all writes have completed.
+        for future in futures:
+            future.result()
+
+        self._stored_annotations.update(changed_annotations)
+        if readme_changed:
+            self._stored_readme_content = readme_content
+        if schema_changed:
+            self._stored_metadata_schema = metadata_schema
 
 
 class ProtoDataSetModel(object):
@@ -690,6 +1510,25 @@ class ProtoDataSetModel(object):
         self._base_uri_model = None
         self._metadata_model = None
         self._uri = None
+        self._input_items = None
+        self._scan_lock = threading.RLock()
+        self._scan_generation = 0
+        self._num_workers = DEFAULT_NUM_THREADS
+        self._use_processes = False
+        self._mp_context = None
+        self._process_cancel_event = None
+        self._ingest_stats = None
+        self._journal_directory = DEFAULT_JOURNAL_DIRECTORY
+        self._ingest_mode = INGEST_MODE_COPY
+        self._cancel_event = threading.Event()
+        self._keep_on_cancel = False
+        self._throughput = None
+        self._measure_throughput = False
+        self._include_patterns = []
+        self._exclude_patterns = []
+        self._io_budget = None
+        self._deduplicate = False
+        self._duplicates = None
 
     @property
     def name(self):
@@ -732,16 +1571,466 @@ class ProtoDataSetModel(object):
         """
         return self._uri
 
+    @property
+    def num_workers(self):
+        """Return the number of workers used to add items to the dataset.
+
+        :returns: number of worker threads or processes
+        """
+        return self._num_workers
+
+    @property
+    def use_processes(self):
+        """Return True if items are added using processes rather than threads.
+
+        :returns: boolean
+        """
+        return self._use_processes
+
+    @property
+    def mp_context(self):
+        """Return the multiprocessing context used to start the processes.
+
+        :returns: :mod:`multiprocessing` context or None for the default
+        """
+        return self._mp_context
+
+    @property
+    def include_patterns(self):
+        """Return the glob patterns of input files to include.
+
+        :returns: list of glob patterns; if empty all files are included
+        """
+        return self._include_patterns
+
+    @property
+    def exclude_patterns(self):
+        """Return the glob patterns of input files and directories to exclude.
+
+        :returns: list of glob patterns
+        """
+        return self._exclude_patterns
+
+    @property
+    def io_budget(self):
+        """Return the token bucket limiting the rate items are added at.
+
+        :returns: :class:`dtool_gui_tk.ingest.TokenBucket` or None
+        """
+        return self._io_budget
+
+    @property
+    def deduplicate(self):
+        """Return True if duplicate input files are found before creation.
+
+        :returns: boolean
+        """
+        return self._deduplicate
+
+    @property
+    def measure_throughput(self):
+        """Return True if the preflight report measures the throughput.
+
+        :returns: boolean
+        """
+        return self._measure_throughput
+
+    @property
+    def duplicates(self):
+        """Return the duplicate input files found by the last search.
+
+        :returns: list of groups of identical files, see
+                  :func:`dtool_gui_tk.ingest.find_duplicates`, or None if
+                  duplicates have not been searched for
+        """
+        return self._duplicates
+
+    @property
+    def ingest_mode(self):
+        """Return the mode used to put items into the dataset.
+
+        :returns: one of :data:`dtool_gui_tk.ingest.INGEST_MODES`
+        """
+        return self._ingest_mode
+
+    @property
+    def journal_directory(self):
+        """Return the directory where dataset creation journals are kept.
+
+        A relative journal directory is kept in the base URI, if the base
+        URI is on local disk.
+
+        :returns: path to the journal directory or None if journals are
+                  disabled
+        """
+        if self._journal_directory is None:
+            return None
+        if os.path.isabs(self._journal_directory):
+            return self._journal_directory
+        if self.base_uri is None:
+            return None
+        parsed_uri = dtoolcore.utils.generous_parse_uri(self.base_uri)
+        if parsed_uri.scheme != "file":
+            return None
+        base_path = parsed_uri.path
+        if dtoolcore.utils.IS_WINDOWS:
+            base_path = dtoolcore.utils.unix_to_windows_path(base_path)
+        return os.path.join(base_path, self._journal_directory)
+
+    @property
+    def ingest_stats(self):
+        """Return throughput statistics from the last dataset creation.
+
+        The number of items and bytes only include the items added; items
+        already stored before resuming are counted in "num_skipped".
+
+        The "strategy_counts" are the number of items put in place using
+        each strategy, see
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.set_ingest_mode`.
+
+        Items stored once as duplicates of other items are counted in
+        "num_duplicates", and the bytes they would otherwise have taken up in
+        "duplicate_bytes".
+
+        :returns: dictionary with the keys "num_items", "num_skipped",
+                  "total_bytes", "items_seconds", "freeze_seconds",
+                  "total_seconds", "bytes_per_second", "items_per_second",
+                  "strategy_counts", "num_duplicates" and "duplicate_bytes",
+                  or None if no dataset has been created
+        """
+        return self._ingest_stats
+
+    @property
+    def input_items(self):
+        """Return the files in the input directory.
+
+        The input directory is scanned the first time this is accessed, see
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.scan_input_directory`.
+
+        :returns: list of (path, handle, size in bytes, modification time in
+                  nanoseconds) tuples
+        """
+        with self._scan_lock:
+            input_items = self._input_items
+            if input_items is None:
+                input_items = self.scan_input_directory()
+            return input_items
+
+    def scan_input_directory(self):
+        """Scan the input directory for files to add to the dataset.
+
+        The result is kept and used when the dataset is created, so that the
+        input directory only needs to be walked once.
+
+        The scan may be run in a background thread. Only one scan runs at a
+        time; :attr:`dtool_gui_tk.models.ProtoDataSetModel.input_items`
+        waits for a scan in progress and uses its result. If the input
+        directory or the patterns are changed whilst it is being scanned,
+        the result is returned but not kept.
+
+        :returns: list of (path, handle, size in bytes, modification time in
+                  nanoseconds) tuples
+        """
+        with self._scan_lock:
+            scan_generation = self._scan_generation
+            input_directory = self.input_directory
+            logger.info("Scanning input directory: {}".format(
+                input_directory
+            ))
+            input_items = scan_input_directory(
+                input_directory,
+                num_workers=self.num_workers,
+                include_patterns=self.include_patterns,
+                exclude_patterns=self.exclude_patterns
+            )
+            if scan_generation == self._scan_generation:
+                self._input_items = input_items
+            return input_items
+
+    def _invalidate_scan(self):
+        """Discard the scan of the input directory and any scan in progress."""
+        self._scan_generation += 1
+        self._input_items = None
+
+    def _get_throughput(self):
+        """Return the measured throughput of a local base URI or None."""
+        base_uri = self.base_uri
+        if base_uri is None or not self.measure_throughput:
+            return None
+        if self._throughput is not None and self._throughput[0] == base_uri:
+            return self._throughput[1]
+        parsed_uri = dtoolcore.utils.generous_parse_uri(base_uri)
+        if parsed_uri.scheme != "file" or not os.path.isdir(parsed_uri.path):
+            return None
+        throughput = measure_throughput(parsed_uri.path)
+        logger.info("Measured throughput of {}: {}".format(
+            base_uri,
+            throughput
+        ))
+        self._throughput = (base_uri, throughput)
+        return throughput
+
+    def get_preflight_report(self, num_largest=10):
+        """Return a report on the dataset that would be created.
+
+        The report describes the files found by scanning the input directory,
+        see :func:`dtool_gui_tk.ingest.preflight_report`. If
+        :attr:`dtool_gui_tk.models.ProtoDataSetModel.measure_throughput` is
+        set and the base URI is on local disk, the throughput is measured
+        by writing a scratch file to it, once per base URI, and used to
+        estimate how long it would take to add the items.
+
+        :param num_largest: number of largest files to list
+        :returns: dictionary as returned by
+                  :func:`dtool_gui_tk.ingest.preflight_report` with the
+                  additional keys "throughput" and "eta_seconds", which are
+                  None if the throughput was not measured
+        """
+        report = preflight_report(self.input_items, num_largest)
+        report["throughput"] = self._get_throughput()
+        report["eta_seconds"] = None
+        if report["throughput"] is not None:
+            report["eta_seconds"] = estimate_ingest_seconds(
+                report["num_items"],
+                report["total_size"],
+                report["throughput"]
+            )
+        return report
+
+    def find_duplicates(self, progressbar=None):
+        """Find input files with the same content.
+
+        Candidates are grouped by size and confirmed by hashing them
+        concurrently, see :func:`dtool_gui_tk.ingest.find_duplicates`. The
+        result is kept and reported by
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.duplicates`.
+
+        :param progressbar: optional object the progress of hashing the
+                            candidates is reported to, see
+                            :func:`dtool_gui_tk.ingest.find_duplicates`
+        :returns: list of groups of identical files
+        """
+        duplicates = find_duplicates(
+            self.input_items,
+            hash_function_name=dtoolcore.storagebroker.DiskStorageBroker.hasher.name,  # NOQA
+            num_workers=self.num_workers,
+            cancel_event=self._cancel_event,
+            progressbar=progressbar
+        )
+        num_duplicates = sum(len(d["handles"]) - 1 for d in duplicates)
+        duplicate_bytes = sum(
+            d["size"] * (len(d["handles"]) - 1) for d in duplicates
+        )
+        logger.info(
+            "Found {} duplicate input file(s) ({} bytes) in {} group(s)".format(  # NOQA
+                num_duplicates,
+                duplicate_bytes,
+                len(duplicates)
+            )
+        )
+        for d in duplicates:
+            logger.info("Identical files ({} bytes each): {}".format(
+                d["size"],
+                ", ".join(d["handles"])
+            ))
+        self._duplicates = duplicates
+        return duplicates
+
     def _yield_path_handle_tuples(self):
-        path_length = len(self.input_directory) + 1
+        for path, handle, _, _ in self.input_items:
+            yield (path, handle)
+
+    def _get_journal(self):
+        """Return the journal for the dataset or None if it is disabled."""
+        if self.name is None or self.base_uri is None:
+            return None
+        journal_directory = self.journal_directory
+        if journal_directory is None:
+            return None
+        key = hashlib.sha1(
+            json.dumps([self.base_uri, self.name]).encode("utf-8")
+        ).hexdigest()
+        return IngestJournal(
+            os.path.join(journal_directory, key + ".jsonl")
+        )
+
+    def _load_journalled_proto_dataset(self, journal):
+        """Return the proto dataset and items recorded in a journal.
+
+        A journal can only be resumed if its proto dataset still exists,
+        has not been frozen and was created from the same input directory.
+
+        :returns: tuple with the :class:`dtoolcore.ProtoDataSet`, or None if
+                  there is nothing to resume, and the recorded items
+        """
+        header, entries = journal.read()
+        if header is None:
+            return None, {}
+        if header["input_directory"] != os.path.abspath(self.input_directory):
+            return None, {}
+        try:
+            proto_dataset = dtoolcore.ProtoDataSet.from_uri(header["uri"])
+        except dtoolcore.DtoolCoreTypeError:
+            logger.info("Ignoring stale journal: {}".format(journal.path))
+            return None, {}
+        return proto_dataset, entries
+
+    def _journalled_manifest_items(self, entries):
+        """Return manifest items of input files that have already been stored.
+
+        Files are only skipped if their size and modification time are the
+        same as when they were stored.
+
+        :returns: dictionary of item properties keyed by identifier
+        """
+        manifest_items = {}
+        input_handles = set()
+        for _, handle, size, mtime_ns in self.input_items:
+            input_handles.add(handle)
+            entry = entries.get(handle)
+            if entry is None:
+                continue
+            if entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                manifest_items[entry["identifier"]] = entry["props"]
+
+        num_removed = len(set(entries.keys()) - input_handles)
+        if num_removed > 0:
+            logger.warning(
+                "{} item(s) stored before resuming are no longer in the input directory".format(  # NOQA
+                    num_removed
+                )
+            )
+        return manifest_items
+
+    def _prune_journalled_items(self, proto_dataset, journal, entries):
+        """Remove stored items that are no longer in the input directory.
+
+        Otherwise they would end up in the dataset, and the manifest could
+        not be built from the recorded items.
+
+        :returns: dictionary of the remaining recorded items keyed by handle
+        """
+        input_handles = set(handle for _, handle, _, _ in self.input_items)
+        stale_handles = sorted(set(entries.keys()) - input_handles)
+        if len(stale_handles) == 0:
+            return entries
+
+        storage_broker = proto_dataset._storage_broker
+        if not isinstance(
+            storage_broker,
+            dtoolcore.storagebroker.DiskStorageBroker
+        ):
+            logger.warning(
+                "Cannot remove {} item(s) stored before resuming that are no longer in the input directory".format(  # NOQA
+                    len(stale_handles)
+                )
+            )
+            return entries
+
+        logger.info(
+            "Removing {} item(s) stored before resuming that are no longer in the input directory".format(  # NOQA
+                len(stale_handles)
+            )
+        )
+        for handle in stale_handles:
+            item_path = os.path.join(
+                storage_broker._data_abspath,
+                dtoolcore.utils.handle_to_osrelpath(
+                    handle,
+                    dtoolcore.utils.IS_WINDOWS
+                )
+            )
+            if os.path.isfile(item_path):
+                os.remove(item_path)
+        journal.remove_entries(stale_handles)
+        return dict(
+            (handle, entry) for handle, entry in entries.items()
+            if handle in input_handles
+        )
+
+    def _delete_proto_dataset(self, proto_dataset):
+        """Delete a proto dataset, returning False if it is not supported."""
+        storage_broker = proto_dataset._storage_broker
+        if not isinstance(
+            storage_broker,
+            dtoolcore.storagebroker.DiskStorageBroker
+        ):
+            logger.warning("Cannot delete proto dataset: {}".format(
+                proto_dataset.uri
+            ))
+            return False
+        logger.info("Deleting proto dataset: {}".format(proto_dataset.uri))
+        shutil.rmtree(storage_broker._abspath)
+        return True
+
+    def _roll_back(self, proto_dataset, journal):
+        """Clean up after the creation of the dataset has been cancelled."""
+        if self._keep_on_cancel:
+            logger.info("Keeping proto dataset for resuming: {}".format(
+                proto_dataset.uri
+            ))
+            return
+        if self._delete_proto_dataset(proto_dataset) and journal is not None:
+            journal.remove()
+
+    def cancel(self, keep=False):
+        """Cancel the creation of the dataset.
+
+        May be called from any thread whilst
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.create` is running. No
+        more items are started; items being cloned or copied in the kernel
+        are interrupted between chunks and items being copied by the storage
+        broker are completed. The proto dataset is then deleted, or kept so
+        that the creation can be resumed later, and ``create`` raises
+        :class:`dtool_gui_tk.models.DataSetCreationCancelledError`. Once the
+        dataset is being frozen it can no longer be cancelled.
+
+        Only proto datasets on local disk can be deleted; others are kept.
 
-        for dirpath, dirnames, filenames in os.walk(self.input_directory):
-            for fn in filenames:
-                path = os.path.join(dirpath, fn)
-                handle = path[path_length:]
-                if dtoolcore.utils.IS_WINDOWS:
-                    handle = dtoolcore.utils.windows_to_unix_path(handle)  # NOQA
-                yield (path, handle)
+        :param keep: keep the proto dataset so that the creation can be
+                     resumed
+        """
+        self._keep_on_cancel = keep
+        self._cancel_event.set()
+        process_cancel_event = self._process_cancel_event
+        if process_cancel_event is not None:
+            process_cancel_event.set()
+
+    def discard_resumable(self):
+        """Delete the proto dataset left by an interrupted creation.
+
+        Does nothing if there is nothing to resume.
+        """
+        journal = self._get_journal()
+        if journal is None or self.input_directory is None:
+            return
+        proto_dataset, _ = self._load_journalled_proto_dataset(journal)
+        if proto_dataset is None:
+            return
+        if self._delete_proto_dataset(proto_dataset):
+            journal.remove()
+
+    def get_resume_info(self):
+        """Return information about a dataset creation that can be resumed.
+
+        :returns: dictionary with the "uri" of the proto dataset and the
+                  "num_items" and "total_bytes" of the items that have
+                  already been stored, or None if there is nothing to resume
+        """
+        journal = self._get_journal()
+        if journal is None or self.input_directory is None:
+            return None
+        proto_dataset, entries = self._load_journalled_proto_dataset(journal)
+        if proto_dataset is None:
+            return None
+        manifest_items = self._journalled_manifest_items(entries)
+        return {
+            "uri": proto_dataset.uri,
+            "num_items": len(manifest_items),
+            "total_bytes": sum(
+                props["size_in_bytes"] for props in manifest_items.values()
+            ),
+        }
 
     def set_name(self, name):
         """Set the name to use for the dataset.
@@ -762,6 +2051,34 @@ class ProtoDataSetModel(object):
                 "Cannot set input directory to: {}".format(input_directory)
             ))
         self._input_directory = input_directory
+        self._invalidate_scan()
+
+    def set_include_patterns(self, include_patterns):
+        """Set the glob patterns of input files to include in the dataset.
+
+        Patterns without a ``/`` match file names at any depth, e.g.
+        ``*.tif``; other patterns match paths relative to the input directory,
+        e.g. ``images/*.tif``. ``*`` does not match ``/`` whereas ``**``
+        does. If no include patterns are set all files are included.
+
+        :param include_patterns: list of glob patterns
+        """
+        self._include_patterns = list(include_patterns)
+        self._invalidate_scan()
+
+    def set_exclude_patterns(self, exclude_patterns):
+        """Set the glob patterns of input files and directories to exclude.
+
+        Patterns are matched as described in
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.set_include_patterns`.
+        Excluded directories are not scanned, e.g. ``.git`` skips all
+        ``.git`` directories. Exclude patterns take precedence over include
+        patterns.
+
+        :param exclude_patterns: list of glob patterns
+        """
+        self._exclude_patterns = list(exclude_patterns)
+        self._invalidate_scan()
 
     def set_base_uri_model(self, base_uri_model):
         """Set the base URI model.
@@ -777,9 +2094,227 @@ class ProtoDataSetModel(object):
         """
         self._metadata_model = metadata_model
 
-    def create(self, progressbar=None):
+    def set_ingest_mode(self, ingest_mode):
+        """Set the mode used to put items into the dataset.
+
+        - ``"copy"``: items are copied (default); on local disk each item is
+          hashed whilst it is copied, so the input files are read only once
+        - ``"clone"``: items are cloned (reflinked) where the file system
+          supports it and otherwise copied in the kernel using
+          :func:`os.copy_file_range`, falling back to :func:`shutil.copyfile`
+        - ``"hardlink"``: as ``"clone"``, but items that cannot be cloned are
+          hard linked to the input files. The dataset then shares the files
+          with the input directory; use this only if the input files will
+          not be modified.
+
+        The ``"clone"`` and ``"hardlink"`` modes only apply to datasets on
+        local disk; other datasets are always created using ``"copy"``.
+
+        :param ingest_mode: one of :data:`dtool_gui_tk.ingest.INGEST_MODES`
+        :raises: ValueError if the ingest mode is not supported
+        """
+        if ingest_mode not in INGEST_MODES:
+            raise(ValueError("Unsupported ingest mode: {}".format(ingest_mode)))  # NOQA
+        self._ingest_mode = ingest_mode
+
+    def set_io_budget(self, io_budget):
+        """Limit the rate at which items are added to the dataset.
+
+        Before an item is started, its size is taken from the token bucket.
+        Sharing a bucket between models gives them a common I/O budget.
+
+        :param io_budget: :class:`dtool_gui_tk.ingest.TokenBucket` or None
+                          for no limit
+        """
+        self._io_budget = io_budget
+
+    def set_deduplicate(self, deduplicate):
+        """Find and store duplicate input files once when creating a dataset.
+
+        Before any items are added, input files with the same content are
+        found, see
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.find_duplicates`. If
+        the dataset is on local disk, the first file of each group is added
+        and the others are hard linked to it within the dataset, so that
+        their content is neither copied nor hashed again. The hash of the
+        first file is reused too. Otherwise the duplicates are only reported.
+
+        Finding duplicates reads every candidate file in full before any
+        items are added. When few candidates turn out to be duplicates, this
+        adds up to one extra read of the input data.
+
+        :param deduplicate: boolean
+        """
+        self._deduplicate = deduplicate
+
+    def set_measure_throughput(self, measure_throughput):
+        """Set whether the preflight report measures the throughput.
+
+        Measuring the throughput writes a 16 MB scratch file to the base URI,
+        see :func:`dtool_gui_tk.ingest.measure_throughput`.
+
+        :param measure_throughput: boolean
+        """
+        self._measure_throughput = measure_throughput
+
+    def set_journal_directory(self, journal_directory):
+        """Set the directory where dataset creation journals are kept.
+
+        A journal records the items stored whilst a dataset is being
+        created, so that an interrupted creation can be resumed. It is
+        deleted once the dataset has been frozen.
+
+        By default journals are kept in the
+        :data:`dtool_gui_tk.models.DEFAULT_JOURNAL_DIRECTORY` of a base URI
+        on local disk, and are disabled for other base URIs.
+
+        :param journal_directory: path to the journal directory, relative
+                                  paths are relative to the base URI, or
+                                  None to disable journals
+        """
+        self._journal_directory = journal_directory
+
+    def set_num_workers(self, num_workers):
+        """Set the number of workers used to add items to the dataset.
+
+        Each worker copies and hashes one item at a time.
+
+        :param num_workers: number of worker threads or processes
+        :raises: ValueError if the number of workers is less than one
+        """
+        if num_workers < 1:
+            raise(ValueError("Number of workers must be at least 1"))
+        self._num_workers = num_workers
+
+    def set_use_processes(self, use_processes):
+        """Set whether to add items using processes rather than threads.
+
+        Processes avoid contention on the global interpreter lock when
+        hashing, at the cost of more expensive start up.
+
+        :param use_processes: boolean
+        """
+        self._use_processes = use_processes
+
+    def set_mp_context(self, mp_context):
+        """Set the multiprocessing context used to start the processes.
+
+        Processes are forked by default on Linux. A GUI, or any other
+        process with threads of its own, should use a "spawn" context, as
+        forked processes would inherit the state of those threads.
+
+        :param mp_context: :mod:`multiprocessing` context or None for the
+                           default
+        """
+        self._mp_context = mp_context
+
+    def _iter_put_items(self, proto_dataset, tasks):
+        """Yield (identifier, item properties, strategy) as items are added."""
+        ingest_mode = self.ingest_mode
+        if ingest_mode != INGEST_MODE_COPY and not isinstance(
+            proto_dataset._storage_broker,
+            dtoolcore.storagebroker.DiskStorageBroker
+        ):
+            logger.warning(
+                "Ingest mode {} only applies to local disk, using copy".format(  # NOQA
+                    ingest_mode
+                )
+            )
+            ingest_mode = INGEST_MODE_COPY
+
+        ingester = _make_ingester(
+            proto_dataset._storage_broker,
+            ingest_mode,
+            self._cancel_event
+        )
+
+        if self.num_workers == 1:
+            for task in tasks:
+                if self._cancel_event.is_set():
+                    return
+                yield _put_item(proto_dataset, task, ingester)
+            return
+
+        if self.use_processes:
+            mp_context = self.mp_context
+            if mp_context is None:
+                mp_context = multiprocessing.get_context()
+            # Set by cancel, so that items being copied by the worker
+            # processes are interrupted too.
+            self._process_cancel_event = mp_context.Event()
+            if self._cancel_event.is_set():
+                self._process_cancel_event.set()
+            executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=mp_context,
+                initializer=_init_ingest_worker,
+                initargs=(
+                    proto_dataset.uri,
+                    ingest_mode,
+                    self._process_cancel_event
+                )
+            )
+            func = _put_item_in_worker_process
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            func = partial(_put_item, proto_dataset, ingester=ingester)
+
+        try:
+            with executor:
+                for task, result in iter_completed(
+                    executor,
+                    func,
+                    tasks,
+                    window=4 * self.num_workers,
+                    cancel_event=self._cancel_event
+                ):
+                    yield result
+        finally:
+            self._process_cancel_event = None
+
+    def _iter_put_duplicates(self, proto_dataset, links):
+        """Yield (identifier, item properties, strategy) as duplicates are added."""  # NOQA
+        for handle, stored_handle, file_hash in links:
+            if self._cancel_event.is_set():
+                return
+            yield _put_duplicate(proto_dataset, handle, stored_handle, file_hash)  # NOQA
+
+    def create(self, progressbar=None, resume=True):
         """Create the dataset in the base URI.
 
+        The items found by the last scan of the input directory are added,
+        see :func:`dtool_gui_tk.models.ProtoDataSetModel.scan_input_directory`.
+        If the input directory has not been scanned it is scanned first.
+
+        Items are copied and hashed concurrently using
+        :attr:`dtool_gui_tk.models.ProtoDataSetModel.num_workers` threads or
+        processes. If an item cannot be added, the items already being added
+        are completed, the error is raised and the proto dataset is left
+        unfrozen.
+
+        Stored items are recorded in a journal in the
+        :attr:`dtool_gui_tk.models.ProtoDataSetModel.journal_directory`. If
+        a previous attempt to create the dataset was interrupted, it is
+        resumed: input files that have not changed since they were stored
+        are not copied again, and stored items that are no longer in the
+        input directory are removed.
+
+        :param progressbar: optional object with an
+                            ``update(steps, nbytes=0, current=None)`` method,
+                            called once for each item added to the dataset,
+                            e.g. a
+                            :class:`dtool_gui_tk.progress.ProgressChannel`;
+                            if it also has a
+                            ``phase(label, total_bytes=None)`` method, that
+                            is called before the items are added with the
+                            number of bytes still to add and, when finding
+                            duplicates, before the candidates are hashed;
+                            progress hashing them is then reported as well
+        :param resume: resume an interrupted creation of the dataset
+
+        The creation can be cancelled from another thread using
+        :func:`dtool_gui_tk.models.ProtoDataSetModel.cancel`.
+
         :raises dtool_gui_tk.models.MissingInputDirectoryError: if the input
             directory has not been set
         :raises dtool_gui_tk.models.MissingDataSetNameError: if the dataset
@@ -788,6 +2323,8 @@ class ProtoDataSetModel(object):
             model has not been set.
         :raises dtool_gui_tk.models.MissingMetadataModelError: if the metadata
             model has not been set.
+        :raises dtool_gui_tk.models.DataSetCreationCancelledError: if the
+            creation was cancelled
         """
 
         if self._name is None:
@@ -816,30 +2353,220 @@ class ProtoDataSetModel(object):
                     "Metadata {} value not valid: {}".format(name, value)
                 ))
 
-        with dtoolcore.DataSetCreator(self.name, self.base_uri) as ds_creator:
-
-            # Add metadata.
-            readme_lines = ["---"]
-            for key in self.metadata_model.in_scope_item_names:
-                value = self.metadata_model.get_value(key)
-                ds_creator.put_annotation(key, value)
-                readme_lines.append("{}: {}".format(key, value))
-            ds_creator.put_readme("\n".join(readme_lines))
-
-            # Add the metadata schema.
-            metadata_schema = self.metadata_model.get_master_schema()
-            ds_creator.put_annotation(
-                METADATA_SCHEMA_ANNOTATION_NAME,
-                metadata_schema
+        try:
+            self._create(progressbar, resume)
+        finally:
+            # Ready for the next attempt.
+            self._cancel_event.clear()
+
+    def _create(self, progressbar, resume):
+        if self._cancel_event.is_set():
+            raise(DataSetCreationCancelledError("Dataset creation cancelled"))
+
+        start = time.monotonic()
+        duplicates = []
+        if self.deduplicate:
+            try:
+                duplicates = self.find_duplicates(
+                    progressbar if hasattr(progressbar, "phase") else None
+                )
+            except InterruptedError:
+                raise(DataSetCreationCancelledError(
+                    "Dataset creation cancelled"
+                ))
+
+        readme_content = _generate_readme_content(self.metadata_model)
+        journal = self._get_journal()
+        proto_dataset = None
+        journal_entries = {}
+        if resume and journal is not None:
+            proto_dataset, journal_entries = self._load_journalled_proto_dataset(journal)  # NOQA
+
+        if proto_dataset is None:
+            proto_dataset = dtoolcore.create_proto_dataset(
+                self.name,
+                self.base_uri,
+                readme_content=readme_content
+            )
+            if journal is not None:
+                journal.start({
+                    "uri": proto_dataset.uri,
+                    "input_directory": os.path.abspath(self.input_directory),
+                })
+        else:
+            logger.info("Resuming creation of {}".format(proto_dataset.uri))
+            proto_dataset.put_readme(readme_content)
+            journal_entries = self._prune_journalled_items(
+                proto_dataset,
+                journal,
+                journal_entries
+            )
+            journal.resume()
+
+        # Add metadata.
+        for key in self.metadata_model.in_scope_item_names:
+            value = self.metadata_model.get_value(key)
+            proto_dataset.put_annotation(key, value)
+
+        # Add the metadata schema.
+        metadata_schema = self.metadata_model.get_master_schema()
+        proto_dataset.put_annotation(
+            METADATA_SCHEMA_ANNOTATION_NAME,
+            metadata_schema
+        )
+
+        # Add data items.
+        logger.info("Adding items using {} {}".format(
+            self.num_workers,
+            "process(es)" if self.use_processes else "thread(s)"
+        ))
+        manifest_items = self._journalled_manifest_items(journal_entries)
+        num_skipped = len(manifest_items)
+        skipped_handles = set(
+            props["relpath"] for props in manifest_items.values()
+        )
+        input_stats = dict(
+            (handle, (size, mtime_ns))
+            for _, handle, size, mtime_ns in self.input_items
+        )
+        if hasattr(progressbar, "phase"):
+            progressbar.phase("Adding items", sum(
+                size for handle, (size, _) in input_stats.items()
+                if handle not in skipped_handles
+            ))
+
+        # Duplicates are stored once if the dataset is on local disk. The
+        # first file of each group has already been hashed, so its hash is
+        # passed on with its task rather than computed again.
+        duplicate_links = {}
+        known_hashes = {}
+        if isinstance(
+            proto_dataset._storage_broker,
+            dtoolcore.storagebroker.DiskStorageBroker
+        ):
+            for d in duplicates:
+                known_hashes[d["handles"][0]] = d["hash"]
+                for handle in d["handles"][1:]:
+                    duplicate_links[handle] = (d["handles"][0], d["hash"])
+        elif len(duplicates) > 0:
+            logger.info("Duplicates are only stored once on local disk")
+
+        tasks = (
+            task + (known_hashes[task[1]],) if task[1] in known_hashes
+            else task
+            for task in self._yield_path_handle_tuples()
+            if task[1] not in skipped_handles
+            and task[1] not in duplicate_links
+        )
+        if self.io_budget is not None:
+            tasks = _iter_throttled(
+                tasks,
+                input_stats,
+                self.io_budget,
+                self._cancel_event
             )
 
-            # Add data items.
-            for fpath, handle in self._yield_path_handle_tuples():
-                ds_creator.put_item(fpath, handle)
+        # The duplicates are linked once all other items have been stored.
+        links = sorted(
+            (handle, stored_handle, file_hash)
+            for handle, (stored_handle, file_hash) in duplicate_links.items()
+            if handle not in skipped_handles
+        )
+
+        num_items = 0
+        total_bytes = 0
+        num_duplicates = 0
+        duplicate_bytes = 0
+        strategy_counts = {}
+        items_start = time.monotonic()
+        try:
+            for identifier, props, strategy in itertools.chain(
+                self._iter_put_items(proto_dataset, tasks),
+                self._iter_put_duplicates(proto_dataset, links)
+            ):
+                if props["relpath"] in duplicate_links:
+                    num_duplicates += 1
+                    duplicate_bytes += props["size_in_bytes"]
+                num_items += 1
+                strategy_counts[strategy] = strategy_counts.get(strategy, 0) + 1  # NOQA
+                total_bytes += props["size_in_bytes"]
+                manifest_items[identifier] = props
+                if journal is not None:
+                    size, mtime_ns = input_stats.get(
+                        props["relpath"],
+                        (None, None)
+                    )
+                    journal.record(
+                        props["relpath"],
+                        size,
+                        mtime_ns,
+                        identifier,
+                        props
+                    )
                 if progressbar is not None:
-                    progressbar.update(1)
+                    progressbar.update(
+                        1,
+                        nbytes=props["size_in_bytes"],
+                        current=props["relpath"]
+                    )
+        except Exception:
+            # Items interrupted by a cancellation may raise errors.
+            if not self._cancel_event.is_set():
+                raise
+        finally:
+            if journal is not None:
+                journal.close()
+
+        if self._cancel_event.is_set():
+            self._roll_back(proto_dataset, journal)
+            raise(DataSetCreationCancelledError(
+                "Dataset creation cancelled after adding {} item(s)".format(
+                    num_items
+                )
+            ))
 
-            self._uri = ds_creator.uri
+        freeze_start = time.monotonic()
+        _freeze_with_manifest_items(proto_dataset, manifest_items)
+        end = time.monotonic()
+        self._uri = proto_dataset.uri
+        if journal is not None:
+            journal.remove()
+
+        items_seconds = freeze_start - items_start
+        bytes_per_second = None
+        items_per_second = None
+        if items_seconds > 0:
+            bytes_per_second = total_bytes / items_seconds
+            items_per_second = num_items / items_seconds
+        self._ingest_stats = {
+            "num_items": num_items,
+            "num_skipped": num_skipped,
+            "total_bytes": total_bytes,
+            "items_seconds": items_seconds,
+            "freeze_seconds": end - freeze_start,
+            "total_seconds": end - start,
+            "bytes_per_second": bytes_per_second,
+            "items_per_second": items_per_second,
+            "strategy_counts": strategy_counts,
+            "num_duplicates": num_duplicates,
+            "duplicate_bytes": duplicate_bytes,
+        }
+        logger.info(
+            "Created {} adding {} items ({} bytes) and skipping {} already stored in {:.2f}s; adding items took {:.2f}s ({} bytes/s), freezing took {:.2f}s".format(  # NOQA
+                self._uri,
+                num_items,
+                total_bytes,
+                num_skipped,
+                self._ingest_stats["total_seconds"],
+                items_seconds,
+                bytes_per_second,
+                self._ingest_stats["freeze_seconds"],
+            )
+        )
+        logger.info("Items added in {} mode using: {}".format(
+            self.ingest_mode,
+            strategy_counts
+        ))
 
 
 class DataSetListModel(object):
@@ -895,9 +2622,13 @@ class DataSetListModel(object):
     def set_tag_filter(self, tag):
         """Set the tag filter.
 
+        The datasets are reindexed if the base URI model has been set.
+
         :param tag: tag string
         """
         self._tag_filter = tag
+        if self._base_uri_model is None:
+            return
         if self._base_uri_model.get_base_uri() is not None:
             self.reindex()
 
@@ -915,6 +2646,36 @@ class DataSetListModel(object):
             return None
         return self._datasets[self.active_index].name
 
+    def get_uri(self, index):
+        """Return the URI of the dataset at an index.
+
+        :param index: index of the dataset
+        :returns: URI of the dataset
+        :raises: IndexError if the index is invalid
+        """
+        return self.get_dataset(index).uri
+
+    def get_dataset(self, index):
+        """Return the dataset at an index.
+
+        The dataset is the one loaded when the base URI was indexed.
+
+        :param index: index of the dataset
+        :returns: :class:`dtoolcore.DataSet`
+        :raises: IndexError if the index is invalid
+        """
+        if index < 0:
+            raise(IndexError())
+        return self._datasets[index]
+
+    def yield_datasets(self):
+        """Yield the datasets loaded when the base URI was indexed.
+
+        :returns: iterator of :class:`dtoolcore.DataSet`
+        """
+        for dataset in self._datasets:
+            yield dataset
+
     def set_active_index(self, index):
         """Set the active_index.
 
@@ -946,6 +2707,11 @@ class DataSetListModel(object):
         base_uri = self._base_uri_model.get_base_uri()
         if base_uri is None:
             return
+
+        # Imported here as dtool_info.inventory is slow to import, which
+        # would delay the start of the command line interface.
+        from dtool_info.inventory import _dataset_info
+
         for ds in dtoolcore.iter_datasets_in_base_uri(base_uri):
             append_okay = True
             ds_tags = set(ds.list_tags())
@@ -0,0 +1,237 @@
+"""Module for reporting progress from worker threads.
+
+Example usage:
+
+>>> from dtool_gui_tk.progress import ProgressChannel
+>>> channel = ProgressChannel()
+>>> channel.update(1, nbytes=10, current="a.txt")
+>>> channel.update(1, nbytes=20, current="b.txt")
+>>> channel.finish()
+>>> progress = channel.drain()
+>>> progress["items"], progress["bytes"], progress["current"], progress["done"]
+(2, 30, 'b.txt', True)
+
+>>> from dtool_gui_tk.progress import ThroughputEstimator, format_duration
+>>> estimator = ThroughputEstimator(total_bytes=300, start=0)
+>>> estimator.update(100, now=1)
+>>> estimator.bytes_per_second, estimator.eta
+(100.0, 2.0)
+>>> format_duration(3725)
+'1:02:05'
+"""
+
+import math
+import queue
+import threading
+import time
+
+_PROGRESS = "progress"
+_ERROR = "error"
+_DONE = "done"
+_PHASE = "phase"
+
+
+class ProgressChannel(object):
+    """Pass progress from a worker to the main loop of a GUI.
+
+    The worker reports progress using :meth:`update`, :meth:`phase`,
+    :meth:`error` and :meth:`finish`. Updates are accumulated and posted to
+    a queue at most once per ``interval`` seconds, so reporting stays cheap
+    even when thousands of items are processed per second. The main loop calls
+    :meth:`drain` on its own schedule to collect everything posted since
+    the previous call. No GUI code is ever called from the worker.
+    """
+
+    def __init__(self, interval=0.05):
+        self._interval = interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending_items = 0
+        self._pending_bytes = 0
+        self._pending_current = None
+        self._last_post = time.monotonic()
+
+    def _post_pending(self):
+        if self._pending_items == 0 and self._pending_bytes == 0:
+            return
+        self._queue.put((
+            _PROGRESS,
+            self._pending_items,
+            self._pending_bytes,
+            self._pending_current
+        ))
+        self._pending_items = 0
+        self._pending_bytes = 0
+        self._last_post = time.monotonic()
+
+    def update(self, steps, nbytes=0, current=None):
+        """Report that items have been processed.
+
+        :param steps: number of items processed
+        :param nbytes: number of bytes processed
+        :param current: name of the item most recently processed
+        """
+        with self._lock:
+            self._pending_items += steps
+            self._pending_bytes += nbytes
+            if current is not None:
+                self._pending_current = current
+            if time.monotonic() - self._last_post >= self._interval:
+                self._post_pending()
+
+    def phase(self, label, total_bytes=None):
+        """Report that the worker has started a new phase of its work.
+
+        Progress reported from then on counts towards the new phase.
+
+        :param label: description of the phase, e.g. "Adding items"
+        :param total_bytes: number of bytes the phase will process, if known
+        """
+        with self._lock:
+            self._post_pending()
+            self._pending_current = None
+            self._queue.put((_PHASE, label, total_bytes))
+
+    def error(self, message):
+        """Report a problem that does not stop the worker.
+
+        :param message: description of the problem
+        """
+        with self._lock:
+            self._post_pending()
+            self._queue.put((_ERROR, message))
+
+    def finish(self, exception=None):
+        """Report that the worker has finished.
+
+        :param exception: the exception that stopped the worker, if any
+        """
+        with self._lock:
+            self._post_pending()
+            self._queue.put((_DONE, exception))
+
+    def drain(self):
+        """Return the progress posted since the last call.
+
+        :returns: dictionary with the number of "items" and "bytes"
+                  processed, the "current" item, a list of "errors", whether
+                  the worker is "done" and the "exception" that stopped it;
+                  if a new phase was started, "phase" is a (label, total
+                  bytes) tuple and the items and bytes are those processed
+                  since it started, otherwise "phase" is None
+        """
+        progress = {
+            "items": 0,
+            "bytes": 0,
+            "current": None,
+            "errors": [],
+            "done": False,
+            "exception": None,
+            "phase": None,
+        }
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == _PROGRESS:
+                _, items, nbytes, current = event
+                progress["items"] += items
+                progress["bytes"] += nbytes
+                if current is not None:
+                    progress["current"] = current
+            elif event[0] == _PHASE:
+                progress["phase"] = (event[1], event[2])
+                progress["items"] = 0
+                progress["bytes"] = 0
+                progress["current"] = None
+            elif event[0] == _ERROR:
+                progress["errors"].append(event[1])
+            elif event[0] == _DONE:
+                progress["done"] = True
+                progress["exception"] = event[1]
+        return progress
+
+
+class ThroughputEstimator(object):
+    """Estimate the transfer rate and the time remaining.
+
+    The rate is an exponentially weighted moving average of the rates
+    observed between updates. Updates arrive at irregular intervals, so the
+    weight given to each observation depends on the time since the previous
+    update: observations older than a few ``time_constant`` seconds have
+    little influence on the estimate.
+    """
+
+    def __init__(self, total_bytes, time_constant=5.0, start=None):
+        self._total_bytes = total_bytes
+        self._time_constant = time_constant
+        self._done_bytes = 0
+        self._pending_bytes = 0
+        self._bytes_per_second = None
+        if start is None:
+            start = time.monotonic()
+        self._last_time = start
+
+    @property
+    def total_bytes(self):
+        """Return the number of bytes to be transferred."""
+        return self._total_bytes
+
+    @property
+    def done_bytes(self):
+        """Return the number of bytes transferred so far."""
+        return self._done_bytes
+
+    @property
+    def bytes_per_second(self):
+        """Return the smoothed rate or None if there is no estimate yet."""
+        return self._bytes_per_second
+
+    @property
+    def eta(self):
+        """Return the estimated number of seconds remaining.
+
+        :returns: seconds remaining or None if the rate is not yet known
+        """
+        if not self._bytes_per_second:
+            return None
+        remaining = max(self._total_bytes - self._done_bytes, 0)
+        return remaining / self._bytes_per_second
+
+    def update(self, nbytes, now=None):
+        """Record that more bytes have been transferred.
+
+        :param nbytes: number of bytes transferred since the last update
+        :param now: time of the update, defaults to :func:`time.monotonic`
+        """
+        if now is None:
+            now = time.monotonic()
+        self._done_bytes += nbytes
+        self._pending_bytes += nbytes
+        elapsed = now - self._last_time
+        if elapsed <= 0:
+            # Fold the bytes into the next observation.
+            return
+        rate = self._pending_bytes / elapsed
+        self._pending_bytes = 0
+        if self._bytes_per_second is None:
+            self._bytes_per_second = float(rate)
+        else:
+            weight = 1.0 - math.exp(-elapsed / self._time_constant)
+            self._bytes_per_second += weight * (rate - self._bytes_per_second)
+        self._last_time = now
+
+
+def format_duration(seconds):
+    """Return a duration formatted as H:MM:SS.
+
+    :param seconds: duration in seconds or None
+    :returns: formatted duration or "-" if the duration is None
+    """
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
@@ -0,0 +1,147 @@
+"""Module for summarising the sizes of dataset items.
+
+NumPy is used if it is installed, otherwise a pure Python implementation
+based on the :mod:`array` module is used. Both give the same results.
+
+Example usage:
+
+>>> from dtool_gui_tk.stats import size_statistics
+>>> stats = size_statistics([0, 3, 5, 12], ["a.txt", "b.txt", "c", "d.csv"])
+>>> stats["num_items"], stats["total_size"], stats["num_empty"]
+(4, 20, 1)
+>>> stats["percentiles"][50]
+4.0
+>>> stats["extension_counts"]
+[('.txt', 2), ('', 1), ('.csv', 1)]
+>>> stats["histogram"]
+[(2, 1), (4, 1), (8, 1)]
+"""
+
+import os
+
+from array import array
+from collections import Counter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Percentiles reported by :func:`size_statistics`.
+PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+
+def _extension_counts(relpaths):
+    counts = Counter(os.path.splitext(p)[1].lower() for p in relpaths)
+    return sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+
+
+def _histogram_from_bin_counts(bin_counts):
+    """Return list of (lower bound, count) tuples from log2 bin counts.
+
+    Leading empty bins are dropped.
+    """
+    histogram = []
+    for exponent, count in enumerate(bin_counts):
+        if count == 0 and len(histogram) == 0:
+            continue
+        histogram.append((2 ** exponent, int(count)))
+    return histogram
+
+
+def _size_statistics_python(sizes, percentiles):
+    values = array("q", sorted(sizes))
+    num_items = len(values)
+
+    percentile_values = {}
+    for p in percentiles:
+        # Linear interpolation between closest ranks, as numpy.percentile.
+        position = (num_items - 1) * p / 100.0
+        lower = int(position)
+        upper = min(lower + 1, num_items - 1)
+        fraction = position - lower
+        percentile_values[p] = float(
+            values[lower] + (values[upper] - values[lower]) * fraction
+        )
+
+    bin_counts = []
+    num_empty = 0
+    for size in values:
+        if size == 0:
+            num_empty += 1
+            continue
+        exponent = size.bit_length() - 1
+        while len(bin_counts) <= exponent:
+            bin_counts.append(0)
+        bin_counts[exponent] += 1
+
+    total_size = sum(values)
+    return {
+        "total_size": total_size,
+        "min_size": values[0],
+        "max_size": values[-1],
+        "mean_size": total_size / num_items,
+        "percentiles": percentile_values,
+        "num_empty": num_empty,
+        "histogram": _histogram_from_bin_counts(bin_counts),
+    }
+
+
+def _size_statistics_numpy(sizes, percentiles):
+    values = numpy.asarray(sizes, dtype=numpy.int64)
+
+    percentile_values = numpy.percentile(values, percentiles)
+
+    non_empty = values[values > 0]
+    bin_counts = []
+    if len(non_empty) > 0:
+        _, exponents = numpy.frexp(non_empty.astype(numpy.float64))
+        bin_counts = numpy.bincount(exponents - 1)
+
+    total_size = int(values.sum())
+    return {
+        "total_size": total_size,
+        "min_size": int(values.min()),
+        "max_size": int(values.max()),
+        "mean_size": total_size / len(values),
+        "percentiles": {
+            p: float(v) for p, v in zip(percentiles, percentile_values)
+        },
+        "num_empty": int(len(values) - len(non_empty)),
+        "histogram": _histogram_from_bin_counts(bin_counts),
+    }
+
+
+def size_statistics(sizes, relpaths, percentiles=PERCENTILES):
+    """Return statistics describing the distribution of item sizes.
+
+    The histogram has log2 bins; each bin is represented by a tuple of its
+    lower bound and the number of items with sizes in the range
+    ``[lower bound, 2 * lower bound)``. Empty items are counted separately.
+
+    :param sizes: sequence of item sizes in bytes
+    :param relpaths: sequence of item relpaths in the same order as the sizes
+    :param percentiles: percentiles to compute
+    :returns: dictionary with the keys "num_items", "total_size",
+              "min_size", "max_size", "mean_size", "percentiles",
+              "num_empty", "histogram" and "extension_counts"
+    """
+    num_items = len(sizes)
+    if num_items == 0:
+        stats = {
+            "total_size": 0,
+            "min_size": None,
+            "max_size": None,
+            "mean_size": None,
+            "percentiles": {},
+            "num_empty": 0,
+            "histogram": [],
+        }
+    elif numpy is not None:
+        stats = _size_statistics_numpy(sizes, percentiles)
+    else:
+        stats = _size_statistics_python(sizes, percentiles)
+
+    stats["num_items"] = num_items
+    stats["extension_counts"] = _extension_counts(relpaths)
+    return stats
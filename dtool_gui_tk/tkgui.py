@@ -4,11 +4,15 @@
 import os
 import sys
 import json
+import queue
 import logging
 import threading
+import multiprocessing
 
 import dtoolcore.utils
 
+from dtool_info.utils import sizeof_fmt
+
 import tkinter as tk
 import tkinter.ttk as ttk
 import tkinter.filedialog as fd
@@ -16,40 +20,45 @@ import tkinter.messagebox as mb
 
 from idlelib.tooltip import Hovertip
 
+from dtool_gui_tk.audit import (
+    AUDIT_PROBLEM_STATUSES,
+    iter_audit,
+    list_dataset_uris,
+    write_audit_report,
+)
+from dtool_gui_tk.batch import BatchScheduler, JOB_DONE, load_job_list
+from dtool_gui_tk.bulk import (
+    BULK_FAILED,
+    BULK_UPDATED,
+    iter_bulk_update,
+    prepare_changes,
+)
+from dtool_gui_tk.ingest import DEFAULT_EXCLUDE_PATTERNS, INGEST_MODES
+from dtool_gui_tk.progress import (
+    ProgressChannel,
+    ThroughputEstimator,
+    format_duration,
+)
 from dtool_gui_tk.models import (
+    DEFAULT_METADATA_SCHEMA_DIRECTORY,
+    DataSetCreationCancelledError,
     LocalBaseURIModel,
     DataSetListModel,
     DataSetModel,
     ProtoDataSetModel,
     MetadataSchemaListModel,
     UnsupportedTypeError,
+    VERIFY_OK,
+    setup_metadata_schema_directory,
+    warm_up_metadata_schemas,
 )
 
 logger = logging.getLogger(__file__)
 
-CONFIG_DIR = os.path.dirname(dtoolcore.utils.DEFAULT_CONFIG_PATH)
-METADATA_SCHEMAS_DIR = os.path.join(CONFIG_DIR, "metadata_schemas")
 HOME_DIR = os.path.expanduser("~")
 
-# Create the metadata schemas directory if it does not exist.
-dtoolcore.utils.mkdir_parents(METADATA_SCHEMAS_DIR)
-
-
-# Make sure a basic metadata schema is present in the metadata schemas
-# directory.
-_basic_schema = {
-    "type": "object",
-    "properties": {
-        "description": {
-            "type": "string"
-        }
-    },
-    "required": ["description"]
-}
-_basic_schema_fpath = os.path.join(METADATA_SCHEMAS_DIR, "basic.json")
-if not os.path.isfile(_basic_schema_fpath):
-    with open(_basic_schema_fpath, "w") as fh:
-        json.dump(_basic_schema, fh)
+# Milliseconds after the main window is idle before warming up the schemas.
+WARM_UP_DELAY = 500
 
 
 def _set_combobox_default_selection(combobox, choices, selected):
@@ -60,6 +69,97 @@ def _set_combobox_default_selection(combobox, choices, selected):
         combobox.current(index)
 
 
+class DataSetLoadJob(object):
+    """Load a dataset into a new DataSetModel in a worker thread.
+
+    The job never touches any Tk widgets. The main loop polls
+    :meth:`is_alive` and applies the result once the job has finished.
+    A job that has been superseded by a newer selection is cancelled; this
+    stops it between loading stages and its result is discarded.
+    """
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.dataset_model = DataSetModel()
+        self.metadata_supported = False
+        self.error = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        logger.info("Start dataset load thread for: {}".format(self.uri))
+        self._thread.start()
+
+    def cancel(self):
+        logger.info("Cancelling dataset load for: {}".format(self.uri))
+        self._cancelled.set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        try:
+            self.dataset_model.load_dataset(self.uri)
+            self.metadata_supported = True
+        except UnsupportedTypeError:
+            logger.warning("Dataset contains unsupported metadata type")
+        except Exception as e:
+            logger.warning("Failed to load dataset {}: {}".format(self.uri, e))
+            self.error = e
+            if self.dataset_model.is_empty:
+                return
+
+        if self.cancelled:
+            return
+
+        # Build the item listing whilst still off the main thread.
+        try:
+            self.dataset_model.get_item_props_list()
+            self.dataset_model.get_size_statistics()
+        except Exception as e:
+            logger.warning("Failed to list items {}: {}".format(self.uri, e))
+            self.error = e
+
+
+class PreflightJob(object):
+    """Compute the preflight report of a new dataset in a worker thread.
+
+    Like :class:`DataSetLoadJob` the job never touches any Tk widgets; the
+    main loop polls :meth:`is_alive` and shows the report once the job has
+    finished.
+    """
+
+    def __init__(self, proto_dataset_model):
+        self.proto_dataset_model = proto_dataset_model
+        self.input_directory = proto_dataset_model.input_directory
+        self.report = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        logger.info("Start preflight thread for: {}".format(
+            self.input_directory
+        ))
+        self._thread.start()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        try:
+            self.report = self.proto_dataset_model.get_preflight_report()
+        except Exception as e:
+            logger.warning("Preflight failed for {}: {}".format(
+                self.input_directory,
+                e
+            ))
+            self.error = e
+
+
 class DataSetCollectionFrame(ttk.Frame):
     """Dataset collection frame."""
 
@@ -151,7 +251,7 @@ class DataSetListFrame(ttk.Frame):
             self,
             show="headings",
             height=10,
-            selectmode="browse",
+            selectmode="extended",
             columns=self.columns
         )
         self.dataset_list.heading("name", text="Dataset name", command=self.sort_by_name)  # NOQA
@@ -209,10 +309,25 @@ class DataSetListFrame(ttk.Frame):
         self._sort("date")
 
     def update_selected_dataset_event(self, event):
-        selected = self.dataset_list.selection()[0]
+        selection = self.dataset_list.selection()
+        if len(selection) == 0:
+            return
+        # With several datasets selected, the one clicked last is shown.
+        selected = self.dataset_list.focus()
+        if selected not in selection:
+            selected = selection[0]
         index = self.dataset_list.index(selected)
+        if index == self.root.dataset_list_model.active_index:
+            return
         self.update_selected_dataset(index)
 
+    @property
+    def selected_indices(self):
+        """Return the sorted indices of the selected datasets."""
+        return sorted(
+            self.dataset_list.index(i) for i in self.dataset_list.selection()
+        )
+
     def update_selected_dataset(self, index):
         self.root.dataset_list_model.set_active_index(index)
         dataset_uri = self.root.dataset_list_model.get_active_uri()
@@ -234,7 +349,7 @@ class DataSetListFrame(ttk.Frame):
         if dataset_uri is not None:
             self.root.load_dataset(dataset_uri)
         else:
-            self.root.dataset_model.clear()
+            self.root.clear_dataset()
 
 
 class DataSetFrame(ttk.Frame):
@@ -249,19 +364,24 @@ class DataSetFrame(ttk.Frame):
         self.rowconfigure(3, weight=1)
 
         self.dataset_title_frame = DataSetTitleFrame(self, root)
-        self.dataset_title_frame.grid(row=0, column=0, sticky="ew")
+        self.dataset_title_frame.grid(row=0, column=0, columnspan=2, sticky="ew")  # NOQA
 
         self.dataset_tags_frame = DataSetTagsFrame(self, root)
-        self.dataset_tags_frame.grid(row=1, column=0, sticky="ew")
+        self.dataset_tags_frame.grid(row=1, column=0, columnspan=2, sticky="ew")  # NOQA
 
         self.dataset_metadata_frame = DataSetMetadataFrame(self, root)
-        self.dataset_metadata_frame.grid(row=2, column=0, sticky="news")
+        self.dataset_metadata_frame.grid(row=2, column=0, columnspan=2, sticky="news")  # NOQA
 
         self.dataset_item_frame = DataSetItemsFrame(self, root)
         self.dataset_item_frame.grid(
             row=3, column=0, sticky="news", pady=(4, 0)
         )
 
+        self.dataset_size_stats_frame = DataSetSizeStatsFrame(self, root)
+        self.dataset_size_stats_frame.grid(
+            row=3, column=1, sticky="news", padx=(4, 0), pady=(4, 0)
+        )
+
         self.root = root
         if self.root.base_uri_model.get_base_uri() is not None:
             self.refresh()
@@ -272,6 +392,7 @@ class DataSetFrame(ttk.Frame):
         self.dataset_tags_frame.refresh()
         self.dataset_metadata_frame.refresh()
         self.dataset_item_frame.refresh()
+        self.dataset_size_stats_frame.refresh()
 
 
 class DataSetTitleFrame(ttk.Frame):
@@ -295,7 +416,10 @@ class DataSetTitleFrame(ttk.Frame):
         )
 
     def refresh(self):
-        self.name.config(text=self.root.dataset_model.name)
+        if self.root.is_loading_dataset:
+            self.name.config(text="Loading dataset...")
+        else:
+            self.name.config(text=self.root.dataset_model.name)
 
 
 class DataSetTagsFrame(ttk.Frame):
@@ -376,6 +500,94 @@ class DataSetItemsFrame(ttk.Frame):
             self.item_list.insert("", "end", values=values)
 
 
+class DataSetSizeStatsFrame(ttk.Frame):
+    """View dataset item size statistics."""
+
+    HISTOGRAM_WIDTH = 200
+    HISTOGRAM_HEIGHT = 80
+    NUM_EXTENSIONS = 5
+
+    def __init__(self, master, root):
+        super().__init__(master)
+        logger.info("Initialising {}".format(self))
+
+        self.root = root
+
+        self.label_frame = ttk.LabelFrame(self, text="Item sizes")
+        self.label_frame.grid(row=0, column=0, sticky="nsew")
+
+        if self.root.base_uri_model.get_base_uri() is not None:
+            self.refresh()
+
+    def _add_row(self, row, name, value):
+        ttk.Label(self.label_frame, text=name).grid(row=row, column=0, sticky="w")  # NOQA
+        ttk.Label(self.label_frame, text=value).grid(row=row, column=1, sticky="e")  # NOQA
+        return row + 1
+
+    def _draw_histogram(self, row, histogram):
+        canvas = tk.Canvas(
+            self.label_frame,
+            width=self.HISTOGRAM_WIDTH,
+            height=self.HISTOGRAM_HEIGHT,
+            background="white"
+        )
+        canvas.grid(row=row, column=0, columnspan=2, sticky="ew")
+        if len(histogram) == 0:
+            return row + 1
+
+        max_count = max(count for _, count in histogram)
+        bar_width = self.HISTOGRAM_WIDTH / len(histogram)
+        for i, (lower_bound, count) in enumerate(histogram):
+            bar_height = (self.HISTOGRAM_HEIGHT - 2) * count / max_count
+            canvas.create_rectangle(
+                i * bar_width,
+                self.HISTOGRAM_HEIGHT - bar_height,
+                (i + 1) * bar_width - 1,
+                self.HISTOGRAM_HEIGHT,
+                fill="grey"
+            )
+        first, last = histogram[0][0], histogram[-1][0]
+        ttk.Label(self.label_frame, text=sizeof_fmt(first).strip()).grid(row=row + 1, column=0, sticky="w")  # NOQA
+        ttk.Label(self.label_frame, text=sizeof_fmt(last).strip()).grid(row=row + 1, column=1, sticky="e")  # NOQA
+        return row + 2
+
+    def refresh(self):
+        """Refreshing dataset item size statistics frame."""
+        logger.info("Refreshing {}".format(self))
+        for widget in self.label_frame.winfo_children():
+            widget.destroy()
+
+        # Skip if a dataset is not loaded.
+        if self.root.dataset_model.name is None:
+            return
+
+        stats = self.root.dataset_model.get_size_statistics()
+        row = self._add_row(0, "Items", stats["num_items"])
+        if stats["num_items"] == 0:
+            return
+
+        row = self._add_row(row, "Total", sizeof_fmt(stats["total_size"]).strip())  # NOQA
+        row = self._add_row(row, "Empty items", stats["num_empty"])
+        for p, value in sorted(stats["percentiles"].items()):
+            name = "{}th percentile".format(p)
+            row = self._add_row(row, name, sizeof_fmt(value).strip())
+
+        ttk.Separator(self.label_frame, orient=tk.HORIZONTAL).grid(
+            row=row, column=0, columnspan=2, sticky="ew", pady=4
+        )
+        row = row + 1
+        for ext, count in stats["extension_counts"][:self.NUM_EXTENSIONS]:
+            if ext == "":
+                ext = "(no extension)"
+            row = self._add_row(row, ext, count)
+
+        ttk.Separator(self.label_frame, orient=tk.HORIZONTAL).grid(
+            row=row, column=0, columnspan=2, sticky="ew", pady=4
+        )
+        row = row + 1
+        self._draw_histogram(row, stats["histogram"])
+
+
 class DataSetMetadataFrame(ttk.Frame):
     """View dataset metadata."""
 
@@ -425,6 +637,51 @@ class DataSetMetadataFrame(ttk.Frame):
                 entry.grid(row=row, column=1, sticky="ew")  # NOQA
 
 
+class PreflightFrame(ttk.Frame):
+    """Preflight report of the dataset to be created."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        logger.info("Initialising {}".format(self))
+        self.columnconfigure(0, weight=1)
+
+        self.label_frame = ttk.LabelFrame(self, text="Preflight")
+        self.label_frame.grid(row=0, column=0, sticky="ew")
+        self.label_frame.columnconfigure(0, weight=1)
+
+        self.report_label = ttk.Label(
+            self.label_frame,
+            text="Select a data directory",
+            justify=tk.LEFT
+        )
+        self.report_label.grid(row=0, column=0, sticky="w")
+
+    def show_message(self, message):
+        self.report_label.config(text=message)
+
+    def show_report(self, report):
+        lines = ["Files: {} ({})".format(
+            report["num_items"],
+            sizeof_fmt(report["total_size"]).strip()
+        )]
+        if len(report["largest"]) > 0:
+            lines.append("Largest: {}".format(", ".join(
+                "{} ({})".format(handle, sizeof_fmt(size).strip())
+                for handle, size in report["largest"][:3]
+            )))
+        lines.append("Empty files: {}".format(len(report["empty"])))
+        lines.append("Candidate duplicates (same size): {} group(s), up to {} duplicated".format(  # NOQA
+            len(report["duplicate_candidates"]),
+            sizeof_fmt(report["duplicate_candidate_size"]).strip()
+        ))
+        if report["eta_seconds"] is not None:
+            lines.append("Estimated time to add items: {} at {:.1f} MB/s".format(  # NOQA
+                format_duration(report["eta_seconds"]),
+                report["throughput"]["bytes_per_second"] / 1e6
+            ))
+        self.show_message("\n".join(lines))
+
+
 class NewDataSetConfigFrame(ttk.Frame):
     """New dataset configuration frame."""
 
@@ -440,6 +697,10 @@ class NewDataSetConfigFrame(ttk.Frame):
         self.label_frame = ttk.LabelFrame(self, text="New dataset configuration")  # NOQA
         self.label_frame.grid(row=0, column=0, sticky="ew")
         self.label_frame.columnconfigure(1, weight=1)
+
+        self._preflight_job = None
+        self.preflight_frame = PreflightFrame(self)
+        self.preflight_frame.grid(row=1, column=0, sticky="ew")
         self.refresh()
 
     def _validate_name_callback(self, name):
@@ -490,6 +751,34 @@ class NewDataSetConfigFrame(ttk.Frame):
         logger.info("Data directory set to: {}".format(data_directory))
         self.refresh()
         self.metadata_schema_combobox.focus_set()
+        self._start_preflight()
+
+    def _start_preflight(self):
+        job = PreflightJob(self.master.proto_dataset_model)
+        self._preflight_job = job
+        self.preflight_frame.show_message("Scanning input directory...")
+        job.start()
+        self.after(100, lambda: self._check_preflight_job(job))
+
+    def _check_preflight_job(self, job):
+        if job is not self._preflight_job:
+            # Superseded by a newer selection.
+            return
+        if job.is_alive():
+            self.after(100, lambda: self._check_preflight_job(job))
+            return
+
+        self._preflight_job = None
+        if job.input_directory != self.master.proto_dataset_model.input_directory:  # NOQA
+            logger.info("Discarding stale preflight: {}".format(
+                job.input_directory
+            ))
+        elif job.error is not None:
+            self.preflight_frame.show_message(
+                "Preflight failed: {}".format(job.error)
+            )
+        else:
+            self.preflight_frame.show_report(job.report)
 
     def _setup_input_directory_field(self, row):
         lbl = ttk.Label(self.label_frame, text="Input data directory")
@@ -548,6 +837,104 @@ class NewDataSetConfigFrame(ttk.Frame):
         self.master.proto_dataset_model.set_metadata_model(metadata_model)
         self.master.refresh()
 
+    def _setup_ingest_mode_selection(self, row):
+        lbl = ttk.Label(self.label_frame, text="Ingest mode")
+        Hovertip(lbl, "copy: copy items into the dataset. clone: clone items if the file system supports it, otherwise copy them. hardlink: clone or hard link items; the dataset then shares the files with the input directory.")  # NOQA
+
+        self.ingest_mode_combobox = ttk.Combobox(
+            self.label_frame,
+            state="readonly",
+            values=INGEST_MODES
+        )
+        self.ingest_mode_combobox.bind("<<ComboboxSelected>>", self._select_ingest_mode)  # NOQA
+        _set_combobox_default_selection(
+            self.ingest_mode_combobox,
+            INGEST_MODES,
+            self.master.proto_dataset_model.ingest_mode
+        )
+
+        lbl.grid(row=row, column=0, sticky="e")
+        self.ingest_mode_combobox.grid(row=row, column=1, sticky="ew")
+
+    def _select_ingest_mode(self, event):
+        ingest_mode = event.widget.get()
+        logger.info("Setting ingest mode to: {}".format(ingest_mode))
+        self.master.proto_dataset_model.set_ingest_mode(ingest_mode)
+
+    def _setup_deduplicate_field(self, row):
+        self.deduplicate_var = tk.BooleanVar(
+            value=self.master.proto_dataset_model.deduplicate
+        )
+        check_btn = ttk.Checkbutton(
+            self.label_frame,
+            text="Store identical files once",
+            variable=self.deduplicate_var,
+            command=self._update_deduplicate
+        )
+        Hovertip(check_btn, "Find input files with the same content before adding items. On local disk they are stored once and hard linked within the dataset.")  # NOQA
+        check_btn.grid(row=row, column=1, sticky="w")
+
+    def _update_deduplicate(self):
+        deduplicate = self.deduplicate_var.get()
+        logger.info("Setting deduplicate to: {}".format(deduplicate))
+        self.master.proto_dataset_model.set_deduplicate(deduplicate)
+
+    def _setup_measure_throughput_field(self, row):
+        self.measure_throughput_var = tk.BooleanVar(
+            value=self.master.proto_dataset_model.measure_throughput
+        )
+        check_btn = ttk.Checkbutton(
+            self.label_frame,
+            text="Estimate time to add items",
+            variable=self.measure_throughput_var,
+            command=self._update_measure_throughput
+        )
+        Hovertip(check_btn, "Measure the write speed of the base URI by writing a 16 MB scratch file to it.")  # NOQA
+        check_btn.grid(row=row, column=1, sticky="w")
+
+    def _update_measure_throughput(self):
+        measure_throughput = self.measure_throughput_var.get()
+        logger.info("Setting measure throughput to: {}".format(
+            measure_throughput
+        ))
+        proto_dataset_model = self.master.proto_dataset_model
+        proto_dataset_model.set_measure_throughput(measure_throughput)
+        if proto_dataset_model.input_directory is not None:
+            self._start_preflight()
+
+    def _setup_patterns_field(self, row, text, tooltip, patterns, command):
+        lbl = ttk.Label(self.label_frame, text=text)
+        Hovertip(lbl, tooltip)
+        entry = ttk.Entry(self.label_frame)
+        entry.insert(0, " ".join(patterns))
+
+        def update(event):
+            command(event.widget.get().split())
+
+        entry.bind("<FocusOut>", update)
+        entry.bind("<Return>", update)
+
+        lbl.grid(row=row, column=0, sticky="e")
+        entry.grid(row=row, column=1, sticky="ew")
+
+    def _update_include_patterns(self, patterns):
+        proto_dataset_model = self.master.proto_dataset_model
+        if patterns == proto_dataset_model.include_patterns:
+            return
+        logger.info("Setting include patterns to: {}".format(patterns))
+        proto_dataset_model.set_include_patterns(patterns)
+        if proto_dataset_model.input_directory is not None:
+            self._start_preflight()
+
+    def _update_exclude_patterns(self, patterns):
+        proto_dataset_model = self.master.proto_dataset_model
+        if patterns == proto_dataset_model.exclude_patterns:
+            return
+        logger.info("Setting exclude patterns to: {}".format(patterns))
+        proto_dataset_model.set_exclude_patterns(patterns)
+        if proto_dataset_model.input_directory is not None:
+            self._start_preflight()
+
     def refresh(self):
         """Refresh new dataset config frame."""
         logger.info("Refreshing {}".format(self))
@@ -557,6 +944,23 @@ class NewDataSetConfigFrame(ttk.Frame):
         self._setup_name_input_field(0)
         self._setup_input_directory_field(1)
         self._setup_metadata_schema_selection(3)
+        self._setup_ingest_mode_selection(4)
+        self._setup_patterns_field(
+            5,
+            "Include files",
+            "Space separated glob patterns, e.g. *.tif images/*.png. Leave empty to include all files.",  # NOQA
+            self.master.proto_dataset_model.include_patterns,
+            self._update_include_patterns
+        )
+        self._setup_patterns_field(
+            6,
+            "Exclude files",
+            "Space separated glob patterns, e.g. *.tmp .git. Matching directories are skipped.",  # NOQA
+            self.master.proto_dataset_model.exclude_patterns,
+            self._update_exclude_patterns
+        )
+        self._setup_deduplicate_field(7)
+        self._setup_measure_throughput_field(8)
 
 
 class OptionalMetadataFrame(ttk.Frame):
@@ -649,11 +1053,7 @@ class MetadataFormFrame(ttk.Frame):
         widget = event.widget
         name = widget.name
         self._value_update_event(event)
-        index = self.metadata_model.in_scope_item_names.index(name)  # NOQA
-        next_index = index + 1
-        if next_index >= len(self.metadata_model.in_scope_item_names):  # NOQA
-            next_index = 0
-        next_name = self.metadata_model.in_scope_item_names[next_index]  # NOQA
+        next_name = self.metadata_model.next_in_scope_item_name(name)
         self.entries[next_name].focus_set()
 
     def setup_boolean_input_field(self, row, name, value):
@@ -694,7 +1094,7 @@ class MetadataFormFrame(ttk.Frame):
 
         # Create the label.
         display_name = name
-        if name in self.metadata_model.required_item_names:
+        if self.metadata_model.is_required_item(name):
             display_name = name + "*"
 
         lbl = ttk.Label(self.label_frame, text=display_name)
@@ -711,7 +1111,7 @@ class MetadataFormFrame(ttk.Frame):
             self.setup_enum_input_field(row, name, value)
 
         # Add button to enable the removal of the field if it is optional.
-        if name in self.metadata_model.optional_item_names:
+        if self.metadata_model.is_optional_item(name):
             btn = ttk.Button(self.label_frame, text="Remove")
             btn._name_to_clear = name
             btn.bind("<Button-1>", self.master.deselect_optional_metadata)
@@ -756,14 +1156,22 @@ class NewDataSetFrame(ttk.Frame):
         self.columnconfigure(1, weight=1)
         self.rowconfigure(1, weight=1)
 
-        self.metadata_schema_list_model = MetadataSchemaListModel()
-        self.metadata_schema_list_model.put_metadata_schema_directory(METADATA_SCHEMAS_DIR)  # NOQA
+        # The metadata schema list model is shared so that the schemas are
+        # only read from disk when they change.
+        self.metadata_schema_list_model = self.root.metadata_schema_list_model
+        if self.metadata_schema_list_model.get_metadata_schema_directory() != DEFAULT_METADATA_SCHEMA_DIRECTORY:  # NOQA
+            self.metadata_schema_list_model.put_metadata_schema_directory(DEFAULT_METADATA_SCHEMA_DIRECTORY)  # NOQA
         assert "basic" in self.metadata_schema_list_model.metadata_model_names
         default_metadata_model = self.metadata_schema_list_model.get_metadata_model("basic")  # NOQA
 
         self.proto_dataset_model = ProtoDataSetModel()
+        # Forked workers would inherit the state of the Tk thread.
+        self.proto_dataset_model.set_mp_context(
+            multiprocessing.get_context("spawn")
+        )
         self.proto_dataset_model.set_base_uri_model(self.root.base_uri_model)
         self.proto_dataset_model.set_metadata_model(default_metadata_model)
+        self.proto_dataset_model.set_exclude_patterns(DEFAULT_EXCLUDE_PATTERNS)
 
         self.new_dataset_config_frame = NewDataSetConfigFrame(self, self.root)
         self.new_dataset_config_frame.grid(row=0, column=0, columnspan=2, sticky="ew")  # NOQA
@@ -796,33 +1204,82 @@ class NewDataSetFrame(ttk.Frame):
         self.proto_dataset_model.metadata_model.deselect_optional_item(name)
         self.refresh()
 
-    def _check_create_thread(self, thread):
-        if thread.is_alive():
-            self.after(100, lambda: self._check_create_thread(thread))
-        else:
-            self.create_btn.config(state=tk.NORMAL)
-            self.progressbar.destroy()
-            self.root.refresh()
+    def _check_create_progress(self, progress_channel):
+        progress = progress_channel.drain()
+        if progress["phase"] is not None:
+            self.progressbar.start_phase(*progress["phase"])
+        if progress["items"] > 0:
+            self.progressbar.update(progress["bytes"], progress["current"])
+        for error in progress["errors"]:
+            logger.warning("Dataset creation problem: {}".format(error))
+
+        if not progress["done"]:
+            self.after(100, lambda: self._check_create_progress(progress_channel))  # NOQA
+            return
+
+        self.create_btn.config(state=tk.NORMAL)
+        self.cancel_btn.destroy()
+        self.progressbar.destroy()
+        self.root.refresh()
+
+        exception = progress["exception"]
+        if isinstance(exception, DataSetCreationCancelledError):
+            mb.showinfo("Dataset creation cancelled", exception)
+            self.focus_set()
+            return
+        if exception is not None:
+            mb.showwarning("Failed to create dataset", exception)
+            self.focus_set()
+            return
+        message = "{} dataset created at: {}".format(
+            self.proto_dataset_model.name,
+            self.proto_dataset_model.uri
+        )
+        ingest_stats = self.proto_dataset_model.ingest_stats
+        if ingest_stats["bytes_per_second"] is not None:
+            message += "\n\nAdded {} in {} ({:.1f} MB/s)".format(
+                sizeof_fmt(ingest_stats["total_bytes"]).strip(),
+                format_duration(ingest_stats["items_seconds"]),
+                ingest_stats["bytes_per_second"] / 1e6
+            )
+        if len(ingest_stats["strategy_counts"]) > 0:
+            message += "\nItems added using: {}".format(", ".join(
+                "{} ({})".format(strategy, count)
+                for strategy, count in sorted(ingest_stats["strategy_counts"].items())  # NOQA
+            ))
+        if ingest_stats["num_duplicates"] > 0:
+            message += "\n{} identical item(s) stored once, saving {}".format(
+                ingest_stats["num_duplicates"],
+                sizeof_fmt(ingest_stats["duplicate_bytes"]).strip()
+            )
+        mb.showinfo("Dataset created", message=message)
 
-    def _run_create(self):
+    def _run_create(self, progress_channel, discard):
+        # Runs in the creation thread; must not touch any Tk widgets.
         try:
-            self.proto_dataset_model.create(progressbar=self.progressbar)
+            if discard:
+                self.proto_dataset_model.discard_resumable()
+            self.proto_dataset_model.create(progressbar=progress_channel)
         except Exception as e:
             logger.warning("Dataset creation exception: {}".format(e))
-            mb.showwarning("Failed to create dataset", e)
-            self.focus_set()
+            progress_channel.finish(e)
             return
         logger.info("Finished dataset creation")
-        mb.showinfo(
-            "Dataset created",
-            message="{} dataset created at: {}".format(
-                self.proto_dataset_model._name,
-                self.proto_dataset_model._uri
-            )
+        progress_channel.finish()
+
+    def cancel(self):
+        keep = mb.askyesnocancel(
+            "Cancel dataset creation",
+            "Keep the items added so far so that the dataset creation can be resumed later?"  # NOQA
         )
+        if keep is None:
+            return
+        logger.info("Cancelling dataset creation, keep: {}".format(keep))
+        self.proto_dataset_model.cancel(keep=keep)
+        self.cancel_btn.config(state=tk.DISABLED, text="Cancelling...")
 
     def create(self):
-        # Need to check this as _yield_path_handle_tuples will fail if the
+        # Need to check this as scan_input_directory will fail if the
         # input directory has not been set.
         if self.proto_dataset_model.input_directory is None:
             mb.showwarning(
@@ -840,21 +1297,51 @@ class NewDataSetFrame(ttk.Frame):
             self.focus_set()
             return
 
-        # The number of items is needed for the progress bar.
-        num_items = len(list(self.proto_dataset_model._yield_path_handle_tuples()))  # NOQA
-        self.progressbar = NewDataSetProgressBar(self, maximum=num_items)
+        # Items stored by an interrupted attempt are not copied again, unless
+        # the user chooses to discard them.
+        discard = False
+        resume_info = self.proto_dataset_model.get_resume_info()
+        if resume_info is not None:
+            resume = mb.askyesnocancel(
+                "Resume dataset creation",
+                "An earlier attempt to create this dataset added {} item(s). Resume it? Choose no to delete them and start again.".format(  # NOQA
+                    resume_info["num_items"]
+                )
+            )
+            if resume is None:
+                return
+            if resume:
+                logger.info("Resuming creation of {}".format(
+                    resume_info["uri"]
+                ))
+            else:
+                discard = True
+        # The input directory is scanned in the creation thread, unless the
+        # preflight scan can be used; the total size is then reported by
+        # the model.
+        self.progressbar = NewDataSetProgressBar(self, label="Preparing")
         self.progressbar.grid(row=3, column=0, columnspan=2, sticky="we")
 
+        self.cancel_btn = ttk.Button(self, text="Cancel", command=self.cancel)
+        self.cancel_btn.grid(row=4, column=0, columnspan=2, sticky="we")
+
         # Disable the "create" button whilst the creation process is happening.
         self.create_btn.config(state=tk.DISABLED)
 
-        # Create and start the dataset creation in a separate thread.
-        thread = threading.Thread(target=self._run_create)
+        # Create and start the dataset creation in a separate thread. The
+        # thread reports its progress through the channel.
+        progress_channel = ProgressChannel()
+        thread = threading.Thread(
+            target=self._run_create,
+            args=(progress_channel, discard),
+            daemon=True
+        )
         logger.info("Start creation thread")
         thread.start()
 
-        # Call function that will continue polling until the thread is done.
-        self._check_create_thread(thread)
+        # Call function that will continue draining the progress channel
+        # until the thread is done.
+        self._check_create_progress(progress_channel)
 
     def refresh(self):
         self.optional_metadata_frame.refresh()
@@ -1113,99 +1600,1035 @@ class EditTagsWindow(tk.Toplevel):
         self.destroy()
 
 
-class PreferencesWindow(tk.Toplevel):
-    """Preferences window."""
+class VerifyDataSetFrame(ttk.Frame):
+    """Verify dataset frame."""
 
-    def __init__(self, master):
+    def __init__(self, master, root, dataset_model):
         super().__init__(master)
-        self.title("Preferences")
+        logger.info("Initialising {}".format(self))
+        self.master = master
+        self.root = root
+        self.dataset_model = dataset_model
 
-        # Implement custom behaviour when closing the window.
-        # Needed to set the App.preferences_window to None.
-        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+        self._queue = None
+        self._cancel_event = None
+        self._num_items = len(self.dataset_model.get_item_props_list())
+        self._num_checked = 0
+        self._num_problems = 0
 
-        logger.info("Initialising {}".format(self))
-        self.root = master
-        mainframe = ttk.Frame(self)
-        mainframe.grid(row=0, column=0, sticky="nwes")
-        self.label_frame = ttk.LabelFrame(mainframe, text="Local base URI")  # NOQA
-        self.label_frame.grid(row=0, column=0,)
-        self.local_base_uri_directory = tk.StringVar()
-        self.local_base_uri_directory.set(
-            self.root.base_uri_model.get_base_uri()
-        )
-        self.refresh()
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(3, weight=1)
 
-    def dismiss(self):
-        self.root.preferences_window = None
-        self.destroy()
+        self.full_mode = tk.BooleanVar(value=False)
+        mode_frame = ttk.LabelFrame(self, text="Mode")
+        ttk.Radiobutton(
+            mode_frame,
+            text="Fast (existence and size)",
+            variable=self.full_mode,
+            value=False
+        ).grid(row=0, column=0, sticky="w")
+        ttk.Radiobutton(
+            mode_frame,
+            text="Full (recompute hashes)",
+            variable=self.full_mode,
+            value=True
+        ).grid(row=1, column=0, sticky="w")
+
+        self.progressbar = ttk.Progressbar(self, maximum=max(self._num_items, 1))  # NOQA
+        self.summary_lbl = ttk.Label(self)
+
+        self.columns = ("relpath", "status")
+        self.problem_list = ttk.Treeview(
+            self,
+            show="headings",
+            height=10,
+            columns=self.columns
+        )
+        self.problem_list.heading("relpath", text="Relpath")
+        self.problem_list.heading("status", text="Status")
+        self.problem_list.column("relpath", width=300, anchor="w")
+        self.problem_list.column("status", width=100, anchor="w")
 
-    def _setup_base_uri_directory_input_field(self):
-        self.help_lbl = ttk.Label(
-            self.label_frame,
-            text="Directory where datasets are stored."
+        # Add a scrollbar.
+        yscrollbar = ttk.Scrollbar(
+            self,
+            orient=tk.VERTICAL,
+            command=self.problem_list.yview
         )
-        self.lbl = ttk.Label(self.label_frame, text="Base URI")
+        self.problem_list.configure(yscroll=yscrollbar.set)
 
-        # Show the current base URI if set.
-        if self.root.base_uri_model.get_base_uri() is not None:
-            self.entry = ttk.Entry(
-                self.label_frame,
-                width=len(self.root.base_uri_model.get_base_uri())
-            )
-            self.entry.insert(0, self.root.base_uri_model.get_base_uri())
-            self.entry.configure(state="readonly")
-            self.entry.grid(row=1, column=0, sticky="ew")
+        button_frame = ttk.Frame(self)
+        self.start_btn = ttk.Button(button_frame, text="Verify", command=self.start)  # NOQA
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)  # NOQA
+        self.start_btn.grid(row=0, column=0)
+        self.cancel_btn.grid(row=0, column=1)
 
-        self.button = ttk.Button(
-            self.label_frame,
-            text="Select local base URI directory",
-            command=self.select_local_base_uri_directory
+        # Layout the frame.
+        mode_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.progressbar.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.summary_lbl.grid(row=2, column=0, columnspan=2, sticky="ew")
+        self.problem_list.grid(row=3, column=0, sticky="nswe")
+        yscrollbar.grid(row=3, column=1, sticky="ns")
+        button_frame.grid(row=4, column=0, columnspan=2)
+
+        self._update_summary()
+
+    def _update_summary(self, state=""):
+        text = "{} of {} items checked, {} problem(s) {}".format(
+            self._num_checked,
+            self._num_items,
+            self._num_problems,
+            state
         )
-        self.help_lbl.grid(row=0, column=0, columnspan=2, sticky="ew")
-        self.button.grid(row=1, column=1)
+        self.summary_lbl.config(text=text)
 
-    def select_local_base_uri_directory(self):
-        base_uri_directory = fd.askdirectory(
-            title="Select data directory",
-            initialdir=HOME_DIR
-        )
-        self.root.base_uri_model.put_base_uri(base_uri_directory)
-        self.local_base_uri_directory.set(base_uri_directory)
-        logger.info(
-            "Local base URI directory set to: {}".format(
-                base_uri_directory
-            )
-        )
-        self.refresh()
-        self.root.refresh()
+    def _run_verify(self, full, results_queue, cancel_event):
+        try:
+            # Forked workers would inherit the state of the Tk thread.
+            for result in self.dataset_model.iter_verify_items(
+                full=full,
+                cancel_event=cancel_event,
+                mp_context=multiprocessing.get_context("spawn")
+            ):
+                results_queue.put(result)
+        except Exception as e:
+            logger.warning("Dataset verification exception: {}".format(e))
+            results_queue.put(e)
+        results_queue.put(None)
 
-    def refresh(self):
-        logger.info("Refreshing {}".format(self))
-        for widget in self.label_frame.winfo_children():
-            logger.info("Destroying widget: {}".format(widget))
-            widget.destroy()
+    def _check_verify_queue(self):
+        finished = False
+        error = None
+        try:
+            # Limit the work done per tick to keep the GUI responsive.
+            for _ in range(1000):
+                result = self._queue.get_nowait()
+                if result is None:
+                    finished = True
+                    break
+                if isinstance(result, Exception):
+                    error = result
+                    continue
+                self._num_checked += 1
+                if result["status"] != VERIFY_OK:
+                    self._num_problems += 1
+                    values = [result["relpath"], result["status"]]
+                    self.problem_list.insert("", "end", values=values)
+        except queue.Empty:
+            pass
 
-        self._setup_base_uri_directory_input_field()
+        self.progressbar.config(value=self._num_checked)
+        if not finished:
+            self._update_summary("(verifying...)")
+            self.after(100, self._check_verify_queue)
+            return
 
+        self.start_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        if error is not None:
+            self._update_summary("(failed)")
+            mb.showwarning("Failed to verify dataset", error)
+        elif self._cancel_event.is_set():
+            self._update_summary("(cancelled)")
+        else:
+            self._update_summary("(done)")
+
+    def start(self):
+        logger.info("Verifying dataset {}".format(self.dataset_model.name))
+        self.problem_list.delete(*self.problem_list.get_children())
+        self._num_checked = 0
+        self._num_problems = 0
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self.start_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+
+        thread = threading.Thread(
+            target=self._run_verify,
+            args=(self.full_mode.get(), self._queue, self._cancel_event),
+            daemon=True
+        )
+        thread.start()
+        self._check_verify_queue()
 
-class ExportMetadataTemplateWindow(tk.Toplevel):
-    """Export metadata template window."""
+    def cancel(self):
+        if self._cancel_event is not None:
+            logger.info("Cancelling dataset verification")
+            self._cancel_event.set()
 
-    def __init__(self, master):
+
+class VerifyDataSetWindow(tk.Toplevel):
+    """Verify dataset window."""
+
+    def __init__(self, master, dataset_model):
         super().__init__(master)
-        self.title("Export metadata template")
+
+        self.root = master
 
         # Implement custom behaviour when closing the window.
-        # Needed to set the App.preferences_window to None.
+        # Needed to set the App.verify_dataset_window to None.
         self.protocol("WM_DELETE_WINDOW", self.dismiss)
 
-        logger.info("Initialising {}".format(self))
-        self.root = master
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.title("Verify dataset: {}".format(dataset_model.name))
+        logger.info("Initialising {}".format(self))
+        self.verify_dataset_frame = VerifyDataSetFrame(self, master, dataset_model)  # NOQA
+        self.verify_dataset_frame.grid(row=0, column=0, sticky="nwes")
+
+    def dismiss(self):
+        self.verify_dataset_frame.cancel()
+        self.root.verify_dataset_window = None
+        self.destroy()
+
+
+class BatchCreateFrame(ttk.Frame):
+    """Batch creation of datasets from a job list frame."""
+
+    def __init__(self, master, root):
+        super().__init__(master)
+        logger.info("Initialising {}".format(self))
+        self.master = master
+        self.root = root
+
+        self._scheduler = None
+        self._jobs = []
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(3, weight=1)
+
+        self.job_list_var = tk.StringVar()
+        job_list_entry = ttk.Entry(self, textvariable=self.job_list_var, state="readonly")  # NOQA
+        self.select_btn = ttk.Button(self, text="Select job list", command=self._select_job_list)  # NOQA
+
+        options_frame = ttk.Frame(self)
+        self.max_jobs_var = tk.IntVar(value=2)
+        self.io_budget_var = tk.StringVar(value="")
+        ttk.Label(options_frame, text="Concurrent datasets").grid(row=0, column=0, sticky="e")  # NOQA
+        ttk.Spinbox(options_frame, from_=1, to=16, width=4, textvariable=self.max_jobs_var).grid(row=0, column=1, sticky="w")  # NOQA
+        ttk.Label(options_frame, text="I/O budget (MB/s)").grid(row=0, column=2, sticky="e")  # NOQA
+        io_budget_entry = ttk.Entry(options_frame, width=8, textvariable=self.io_budget_var)  # NOQA
+        io_budget_entry.grid(row=0, column=3, sticky="w")
+        Hovertip(io_budget_entry, "Shared by all datasets, leave empty for no limit")  # NOQA
+
+        self.columns = ("name", "status", "progress", "detail")
+        self.job_tree = ttk.Treeview(
+            self,
+            show="headings",
+            height=10,
+            columns=self.columns
+        )
+        self.job_tree.heading("name", text="Name")
+        self.job_tree.heading("status", text="Status")
+        self.job_tree.heading("progress", text="Progress")
+        self.job_tree.heading("detail", text="Detail")
+        self.job_tree.column("name", width=150, anchor="w")
+        self.job_tree.column("status", width=80, anchor="w")
+        self.job_tree.column("progress", width=150, anchor="w")
+        self.job_tree.column("detail", width=300, anchor="w")
+
+        # Add a scrollbar.
+        yscrollbar = ttk.Scrollbar(
+            self,
+            orient=tk.VERTICAL,
+            command=self.job_tree.yview
+        )
+        self.job_tree.configure(yscroll=yscrollbar.set)
+
+        self.summary_lbl = ttk.Label(self)
+
+        button_frame = ttk.Frame(self)
+        self.start_btn = ttk.Button(button_frame, text="Create datasets", command=self.start, state=tk.DISABLED)  # NOQA
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)  # NOQA
+        self.start_btn.grid(row=0, column=0)
+        self.cancel_btn.grid(row=0, column=1)
+
+        # Layout the frame.
+        ttk.Label(self, text="Job list").grid(row=0, column=0, sticky="e")
+        job_list_entry.grid(row=0, column=1, sticky="ew")
+        self.select_btn.grid(row=0, column=2, columnspan=2)
+        options_frame.grid(row=1, column=0, columnspan=4, sticky="w")
+        self.summary_lbl.grid(row=2, column=0, columnspan=4, sticky="ew")
+        self.job_tree.grid(row=3, column=0, columnspan=3, sticky="nswe")
+        yscrollbar.grid(row=3, column=3, sticky="ns")
+        button_frame.grid(row=4, column=0, columnspan=4)
+
+    def _select_job_list(self):
+        fpath = fd.askopenfilename(
+            filetypes=[("Job lists", "*.csv *.json"), ("All files", "*")]
+        )
+        if not fpath:
+            return
+        try:
+            jobs = load_job_list(fpath)
+        except (OSError, ValueError) as e:
+            mb.showwarning("Failed to load job list", e)
+            return
+        self.job_list_var.set(fpath)
+        self._jobs = jobs
+        self.job_tree.delete(*self.job_tree.get_children())
+        for job in jobs:
+            self.job_tree.insert(
+                "",
+                "end",
+                iid=job.name,
+                values=[job.name, job.status, "", job.input_directory]
+            )
+        self.summary_lbl.config(text="{} job(s) loaded".format(len(jobs)))
+        self.start_btn.config(state=tk.NORMAL if len(jobs) > 0 else tk.DISABLED)  # NOQA
+
+    def _update_job_tree(self):
+        for job in self._jobs:
+            progress = job.progress()
+            text = "{}/{} items, {} of {}".format(
+                progress["items"],
+                progress["num_items"],
+                sizeof_fmt(progress["bytes"]).strip(),
+                sizeof_fmt(progress["total_bytes"]).strip()
+            )
+            if job.status == JOB_DONE:
+                detail = job.uri
+            elif job.error is not None:
+                detail = str(job.error)
+            else:
+                detail = progress["current"] or job.input_directory
+            self.job_tree.item(
+                job.name,
+                values=[job.name, job.status, text, detail]
+            )
+
+    def _check_batch(self):
+        self._update_job_tree()
+        if self._scheduler.is_alive():
+            self.after(200, self._check_batch)
+            return
+
+        summary = self._scheduler.summary()
+        self.summary_lbl.config(text="{} done, {} failed, {} cancelled in {}".format(  # NOQA
+            summary["num_done"],
+            summary["num_failed"],
+            summary["num_cancelled"],
+            format_duration(summary["seconds"])
+        ))
+        self.select_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self._scheduler = None
+        if summary["num_done"] > 0:
+            self.root.refresh()
+
+    def start(self):
+        io_budget = None
+        try:
+            max_jobs = int(self.max_jobs_var.get())
+            if self.io_budget_var.get().strip():
+                io_budget = float(self.io_budget_var.get()) * 1e6
+            if max_jobs < 1 or (io_budget is not None and io_budget <= 0):
+                raise(ValueError())
+        except (tk.TclError, ValueError):
+            mb.showwarning(
+                "Invalid settings",
+                "The number of concurrent datasets and the I/O budget must be positive numbers"  # NOQA
+            )
+            return
+
+        logger.info("Starting batch of {} job(s)".format(len(self._jobs)))
+        self._scheduler = BatchScheduler(
+            self._jobs,
+            self.root.base_uri_model,
+            self.root.metadata_schema_list_model,
+            max_concurrent_jobs=max_jobs,
+            io_budget=io_budget,
+            model_options=lambda m: m.set_exclude_patterns(DEFAULT_EXCLUDE_PATTERNS)  # NOQA
+        )
+        self.start_btn.config(state=tk.DISABLED)
+        self.select_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.summary_lbl.config(text="Creating datasets...")
+        self._scheduler.start()
+        self._check_batch()
+
+    def cancel(self):
+        if self._scheduler is not None:
+            logger.info("Cancelling batch")
+            self._scheduler.cancel(keep=True)
+
+
+class BatchCreateWindow(tk.Toplevel):
+    """Batch creation of datasets window."""
+
+    def __init__(self, master):
+        super().__init__(master)
+
+        self.root = master
+
+        # Implement custom behaviour when closing the window.
+        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.title("Create datasets from job list")
+        logger.info("Initialising {}".format(self))
+        self.batch_create_frame = BatchCreateFrame(self, master)
+        self.batch_create_frame.grid(row=0, column=0, sticky="nwes")
+
+    def dismiss(self):
+        self.batch_create_frame.cancel()
+        self.destroy()
+
+
+class AuditFrame(ttk.Frame):
+    """Audit of the metadata of all datasets in the base URI frame."""
+
+    STORED_SCHEMA = "Schema stored in dataset"
+
+    def __init__(self, master, root):
+        super().__init__(master)
+        logger.info("Initialising {}".format(self))
+        self.master = master
+        self.root = root
+
+        self._queue = None
+        self._cancel_event = None
+        self._results = []
+        self._num_datasets = 0
+        self._num_problems = 0
+        self._sort_key = None
+        self._sort_reverse = False
+
+        self.metadata_schema_list_model = self.root.metadata_schema_list_model
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(3, weight=1)
+
+        self.schema_var = tk.StringVar(value=self.STORED_SCHEMA)
+        schema_combobox = ttk.Combobox(
+            self,
+            state="readonly",
+            values=[self.STORED_SCHEMA] + self.metadata_schema_list_model.metadata_model_names,  # NOQA
+            textvariable=self.schema_var
+        )
+        self.problems_only_var = tk.BooleanVar(value=True)
+        problems_only_btn = ttk.Checkbutton(
+            self,
+            text="Only show problems",
+            variable=self.problems_only_var,
+            command=self._refresh_report
+        )
+
+        self.progressbar = ttk.Progressbar(self)
+        self.summary_lbl = ttk.Label(self)
+
+        self.columns = ("name", "status", "issues", "uri")
+        self.report_tree = ttk.Treeview(
+            self,
+            show="headings",
+            height=15,
+            columns=self.columns
+        )
+        for column, text, width in (
+            ("name", "Name", 150),
+            ("status", "Status", 80),
+            ("issues", "Issues", 400),
+            ("uri", "URI", 300),
+        ):
+            self.report_tree.heading(
+                column,
+                text=text,
+                command=lambda c=column: self._sort(c)
+            )
+            self.report_tree.column(column, width=width, anchor="w")
+
+        # Add a scrollbar.
+        yscrollbar = ttk.Scrollbar(
+            self,
+            orient=tk.VERTICAL,
+            command=self.report_tree.yview
+        )
+        self.report_tree.configure(yscroll=yscrollbar.set)
+
+        button_frame = ttk.Frame(self)
+        self.start_btn = ttk.Button(button_frame, text="Audit", command=self.start)  # NOQA
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)  # NOQA
+        self.export_btn = ttk.Button(button_frame, text="Export report", command=self.export, state=tk.DISABLED)  # NOQA
+        self.start_btn.grid(row=0, column=0)
+        self.cancel_btn.grid(row=0, column=1)
+        self.export_btn.grid(row=0, column=2)
+
+        # Layout the frame.
+        ttk.Label(self, text="Metadata schema").grid(row=0, column=0, sticky="e")  # NOQA
+        schema_combobox.grid(row=0, column=1, sticky="w")
+        problems_only_btn.grid(row=0, column=2, columnspan=2, sticky="e")
+        self.progressbar.grid(row=1, column=0, columnspan=4, sticky="ew")
+        self.summary_lbl.grid(row=2, column=0, columnspan=4, sticky="ew")
+        self.report_tree.grid(row=3, column=0, columnspan=3, sticky="nswe")
+        yscrollbar.grid(row=3, column=3, sticky="ns")
+        button_frame.grid(row=4, column=0, columnspan=4)
+
+    def _update_summary(self, state=""):
+        text = "{} of {} datasets audited, {} with problems {}".format(
+            len(self._results),
+            self._num_datasets,
+            self._num_problems,
+            state
+        )
+        self.summary_lbl.config(text=text)
+
+    def _show(self, result):
+        if self.problems_only_var.get():
+            return result["status"] in AUDIT_PROBLEM_STATUSES
+        return True
+
+    def _insert(self, result):
+        values = [
+            result["name"],
+            result["status"],
+            "; ".join(result["issues"]),
+            result["uri"]
+        ]
+        self.report_tree.insert("", "end", values=values)
+
+    def _refresh_report(self):
+        self.report_tree.delete(*self.report_tree.get_children())
+        for result in self._results:
+            if self._show(result):
+                self._insert(result)
+
+    def _sort(self, key):
+        if key == self._sort_key:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_key = key
+            self._sort_reverse = False
+        if key == "issues":
+            def sort_key(r):
+                return len(r["issues"])
+        else:
+            def sort_key(r):
+                return r[key]
+        self._results.sort(key=sort_key, reverse=self._sort_reverse)
+        self._refresh_report()
+
+    def _get_metadata_schema(self):
+        name = self.schema_var.get()
+        if name == self.STORED_SCHEMA:
+            return None
+        metadata_model = self.metadata_schema_list_model.get_metadata_model(name)  # NOQA
+        return metadata_model.get_master_schema()
+
+    def _run_audit(self, base_uri, metadata_schema, results_queue,
+                   cancel_event):
+        try:
+            uris = list_dataset_uris(base_uri)
+            results_queue.put(len(uris))
+            # Forked workers would inherit the state of the Tk thread.
+            for result in iter_audit(
+                uris,
+                metadata_schema=metadata_schema,
+                cancel_event=cancel_event,
+                mp_context=multiprocessing.get_context("spawn")
+            ):
+                results_queue.put(result)
+        except Exception as e:
+            logger.warning("Metadata audit exception: {}".format(e))
+            results_queue.put(e)
+        results_queue.put(None)
+
+    def _check_audit_queue(self):
+        finished = False
+        error = None
+        try:
+            # Limit the work done per tick to keep the GUI responsive.
+            for _ in range(1000):
+                result = self._queue.get_nowait()
+                if result is None:
+                    finished = True
+                    break
+                if isinstance(result, Exception):
+                    error = result
+                    continue
+                if isinstance(result, int):
+                    self._num_datasets = result
+                    self.progressbar.config(maximum=max(result, 1))
+                    continue
+                self._results.append(result)
+                if result["status"] in AUDIT_PROBLEM_STATUSES:
+                    self._num_problems += 1
+                if self._show(result):
+                    self._insert(result)
+        except queue.Empty:
+            pass
+
+        self.progressbar.config(value=len(self._results))
+        if not finished:
+            self._update_summary("(auditing...)")
+            self.after(100, self._check_audit_queue)
+            return
+
+        self.start_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.export_btn.config(state=tk.NORMAL)
+        if error is not None:
+            self._update_summary("(failed)")
+            mb.showwarning("Failed to audit datasets", error)
+        elif self._cancel_event.is_set():
+            self._update_summary("(cancelled)")
+        else:
+            self._update_summary("(done)")
+
+    def start(self):
+        base_uri = self.root.base_uri_model.get_base_uri()
+        if base_uri is None:
+            mb.showinfo(
+                "Configure local base URI",
+                "Please configure the local base URI in the preferences."
+            )
+            return
+        try:
+            metadata_schema = self._get_metadata_schema()
+        except (OSError, ValueError) as e:
+            mb.showwarning("Failed to load metadata schema", e)
+            return
+
+        logger.info("Auditing datasets in {}".format(base_uri))
+        self.report_tree.delete(*self.report_tree.get_children())
+        self._results = []
+        self._num_datasets = 0
+        self._num_problems = 0
+        self._sort_key = None
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self.start_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.export_btn.config(state=tk.DISABLED)
+
+        thread = threading.Thread(
+            target=self._run_audit,
+            args=(base_uri, metadata_schema, self._queue, self._cancel_event),
+            daemon=True
+        )
+        thread.start()
+        self._check_audit_queue()
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            logger.info("Cancelling metadata audit")
+            self._cancel_event.set()
+
+    def export(self):
+        fpath = fd.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")]
+        )
+        if not fpath:
+            return
+        logger.info("Export audit report to: {}".format(fpath))
+        try:
+            write_audit_report(self._results, fpath)
+        except (OSError, ValueError) as e:
+            mb.showwarning("Failed to export audit report", e)
+
+
+class AuditWindow(tk.Toplevel):
+    """Audit of the metadata of all datasets window."""
+
+    def __init__(self, master):
+        super().__init__(master)
+
+        self.root = master
+
+        # Implement custom behaviour when closing the window.
+        # Needed to set the App.audit_window to None.
+        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.title("Audit metadata")
+        logger.info("Initialising {}".format(self))
+        self.audit_frame = AuditFrame(self, master)
+        self.audit_frame.grid(row=0, column=0, sticky="nwes")
+
+    def dismiss(self):
+        self.audit_frame.cancel()
+        self.root.audit_window = None
+        self.destroy()
+
+
+class BulkEditMetadataFrame(ttk.Frame):
+    """Edit the metadata of several datasets at once frame."""
+
+    NO_SCHEMA = "No schema"
+
+    def __init__(self, master, root, datasets):
+        super().__init__(master)
+        logger.info("Initialising {}".format(self))
+        self.master = master
+        self.root = root
+        self.datasets = datasets
+
+        self._changes = {}
+        self._queue = None
+        self._cancel_event = None
+        self._num_done = 0
+        self._num_failed = 0
+        self._num_updated = 0
+
+        self.metadata_schema_list_model = self.root.metadata_schema_list_model
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(5, weight=1)
+
+        self.schema_var = tk.StringVar(value=self.NO_SCHEMA)
+        schema_combobox = ttk.Combobox(
+            self,
+            state="readonly",
+            values=[self.NO_SCHEMA] + self.metadata_schema_list_model.metadata_model_names,  # NOQA
+            textvariable=self.schema_var
+        )
+        Hovertip(schema_combobox, "Schema to convert and validate the values with; without a schema JSON values such as 1 or true are stored by type")  # NOQA
+
+        change_frame = ttk.Frame(self)
+        self.key_entry = ttk.Entry(change_frame, width=20)
+        self.value_entry = ttk.Entry(change_frame, width=30)
+        add_btn = ttk.Button(change_frame, text="Add", command=self.add_change)  # NOQA
+        remove_btn = ttk.Button(change_frame, text="Remove", command=self.remove_change)  # NOQA
+        self.value_entry.bind("<Return>", lambda event: self.add_change())
+        ttk.Label(change_frame, text="Key").grid(row=0, column=0)
+        self.key_entry.grid(row=0, column=1)
+        ttk.Label(change_frame, text="Value").grid(row=0, column=2)
+        self.value_entry.grid(row=0, column=3)
+        add_btn.grid(row=0, column=4)
+        remove_btn.grid(row=0, column=5)
+
+        self.change_tree = ttk.Treeview(
+            self,
+            show="headings",
+            height=5,
+            columns=("key", "value")
+        )
+        self.change_tree.heading("key", text="Key")
+        self.change_tree.heading("value", text="Value")
+        self.change_tree.column("key", width=150, anchor="w")
+        self.change_tree.column("value", width=300, anchor="w")
+
+        self.progressbar = ttk.Progressbar(self, maximum=max(len(self.datasets), 1))  # NOQA
+        self.summary_lbl = ttk.Label(self)
+
+        self.columns = ("name", "status", "error")
+        self.result_tree = ttk.Treeview(
+            self,
+            show="headings",
+            height=10,
+            columns=self.columns
+        )
+        self.result_tree.heading("name", text="Name")
+        self.result_tree.heading("status", text="Status")
+        self.result_tree.heading("error", text="Error")
+        self.result_tree.column("name", width=150, anchor="w")
+        self.result_tree.column("status", width=80, anchor="w")
+        self.result_tree.column("error", width=300, anchor="w")
+
+        # Add a scrollbar.
+        yscrollbar = ttk.Scrollbar(
+            self,
+            orient=tk.VERTICAL,
+            command=self.result_tree.yview
+        )
+        self.result_tree.configure(yscroll=yscrollbar.set)
+
+        button_frame = ttk.Frame(self)
+        self.start_btn = ttk.Button(button_frame, text="Apply", command=self.start)  # NOQA
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)  # NOQA
+        self.start_btn.grid(row=0, column=0)
+        self.cancel_btn.grid(row=0, column=1)
+
+        # Layout the frame.
+        ttk.Label(self, text="Metadata schema").grid(row=0, column=0, sticky="e")  # NOQA
+        schema_combobox.grid(row=0, column=1, sticky="w")
+        change_frame.grid(row=1, column=0, columnspan=3, sticky="w")
+        self.change_tree.grid(row=2, column=0, columnspan=3, sticky="ew")
+        self.progressbar.grid(row=3, column=0, columnspan=3, sticky="ew")
+        self.summary_lbl.grid(row=4, column=0, columnspan=3, sticky="ew")
+        self.result_tree.grid(row=5, column=0, columnspan=2, sticky="nswe")
+        yscrollbar.grid(row=5, column=2, sticky="ns")
+        button_frame.grid(row=6, column=0, columnspan=3)
+
+        self._update_summary()
+
+    def _update_summary(self, state=""):
+        text = "{} of {} datasets edited, {} updated, {} failed {}".format(
+            self._num_done,
+            len(self.datasets),
+            self._num_updated,
+            self._num_failed,
+            state
+        )
+        self.summary_lbl.config(text=text)
+
+    def _refresh_changes(self):
+        self.change_tree.delete(*self.change_tree.get_children())
+        for key in sorted(self._changes):
+            self.change_tree.insert("", "end", values=[key, self._changes[key]])  # NOQA
+
+    def add_change(self):
+        key = self.key_entry.get().strip()
+        if key == "":
+            return
+        self._changes[key] = self.value_entry.get()
+        self.key_entry.delete(0, tk.END)
+        self.value_entry.delete(0, tk.END)
+        self.key_entry.focus_set()
+        self._refresh_changes()
+
+    def remove_change(self):
+        for selected in self.change_tree.selection():
+            key = self.change_tree.item(selected, "values")[0]
+            self._changes.pop(key, None)
+        self._refresh_changes()
+
+    def _get_metadata_model(self):
+        name = self.schema_var.get()
+        if name == self.NO_SCHEMA:
+            return None
+        return self.metadata_schema_list_model.get_metadata_model(name)
+
+    def _run_bulk_update(self, changes, results_queue, cancel_event):
+        try:
+            for result in iter_bulk_update(
+                self.datasets,
+                changes,
+                cancel_event=cancel_event
+            ):
+                results_queue.put(result)
+        except Exception as e:
+            logger.warning("Bulk metadata edit exception: {}".format(e))
+            results_queue.put(e)
+        results_queue.put(None)
+
+    def _check_bulk_update_queue(self):
+        finished = False
+        error = None
+        try:
+            # Limit the work done per tick to keep the GUI responsive.
+            for _ in range(1000):
+                result = self._queue.get_nowait()
+                if result is None:
+                    finished = True
+                    break
+                if isinstance(result, Exception):
+                    error = result
+                    continue
+                self._num_done += 1
+                if result["status"] == BULK_UPDATED:
+                    self._num_updated += 1
+                elif result["status"] == BULK_FAILED:
+                    self._num_failed += 1
+                values = [
+                    result["name"],
+                    result["status"],
+                    result["error"] or ""
+                ]
+                self.result_tree.insert("", "end", values=values)
+        except queue.Empty:
+            pass
+
+        self.progressbar.config(value=self._num_done)
+        if not finished:
+            self._update_summary("(editing...)")
+            self.after(100, self._check_bulk_update_queue)
+            return
+
+        self.start_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        if error is not None:
+            self._update_summary("(failed)")
+            mb.showwarning("Failed to edit metadata", error)
+        elif self._cancel_event.is_set():
+            self._update_summary("(cancelled)")
+        else:
+            self._update_summary("(done)")
+
+        # Show the new metadata of the updated datasets.
+        if self._num_updated > 0:
+            self.root.refresh()
+
+    def start(self):
+        if len(self._changes) == 0:
+            mb.showinfo("No metadata changes", "Please add a key and a value.")  # NOQA
+            return
+        try:
+            # Validated once, rather than for each dataset.
+            changes = prepare_changes(
+                self._changes,
+                self._get_metadata_model(),
+                from_str=True
+            )
+        except (OSError, ValueError, UnsupportedTypeError) as e:
+            mb.showwarning("Invalid metadata", e)
+            return
+        if not mb.askyesno(
+            title="Edit metadata",
+            message="Change {} in {} dataset(s)?".format(
+                ", ".join(sorted(changes)),
+                len(self.datasets)
+            ),
+            icon="question"
+        ):
+            return
+
+        logger.info("Editing metadata of {} datasets".format(len(self.datasets)))  # NOQA
+        self.result_tree.delete(*self.result_tree.get_children())
+        self._num_done = 0
+        self._num_failed = 0
+        self._num_updated = 0
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self.start_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+
+        thread = threading.Thread(
+            target=self._run_bulk_update,
+            args=(changes, self._queue, self._cancel_event),
+            daemon=True
+        )
+        thread.start()
+        self._check_bulk_update_queue()
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            logger.info("Cancelling bulk metadata edit")
+            self._cancel_event.set()
+
+
+class BulkEditMetadataWindow(tk.Toplevel):
+    """Edit the metadata of several datasets at once window."""
+
+    def __init__(self, master, datasets):
+        super().__init__(master)
+
+        self.root = master
+
+        # Implement custom behaviour when closing the window.
+        # Needed to set the App.bulk_edit_metadata_window to None.
+        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        # Make sure that the GUI expands/shrinks when the window is resized.
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.title("Edit metadata of {} datasets".format(len(datasets)))
+        logger.info("Initialising {}".format(self))
+        self.bulk_edit_metadata_frame = BulkEditMetadataFrame(self, master, datasets)  # NOQA
+        self.bulk_edit_metadata_frame.grid(row=0, column=0, sticky="nwes")
+
+    def dismiss(self):
+        self.bulk_edit_metadata_frame.cancel()
+        self.root.bulk_edit_metadata_window = None
+        self.destroy()
+
+
+class PreferencesWindow(tk.Toplevel):
+    """Preferences window."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Preferences")
+
+        # Implement custom behaviour when closing the window.
+        # Needed to set the App.preferences_window to None.
+        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        logger.info("Initialising {}".format(self))
+        self.root = master
         mainframe = ttk.Frame(self)
         mainframe.grid(row=0, column=0, sticky="nwes")
+        self.label_frame = ttk.LabelFrame(mainframe, text="Local base URI")  # NOQA
+        self.label_frame.grid(row=0, column=0,)
+        self.local_base_uri_directory = tk.StringVar()
+        self.local_base_uri_directory.set(
+            self.root.base_uri_model.get_base_uri()
+        )
+        self.refresh()
 
-        self.metadata_schema_list_model = MetadataSchemaListModel()
+    def dismiss(self):
+        self.root.preferences_window = None
+        self.destroy()
+
+    def _setup_base_uri_directory_input_field(self):
+        self.help_lbl = ttk.Label(
+            self.label_frame,
+            text="Directory where datasets are stored."
+        )
+        self.lbl = ttk.Label(self.label_frame, text="Base URI")
+
+        # Show the current base URI if set.
+        if self.root.base_uri_model.get_base_uri() is not None:
+            self.entry = ttk.Entry(
+                self.label_frame,
+                width=len(self.root.base_uri_model.get_base_uri())
+            )
+            self.entry.insert(0, self.root.base_uri_model.get_base_uri())
+            self.entry.configure(state="readonly")
+            self.entry.grid(row=1, column=0, sticky="ew")
+
+        self.button = ttk.Button(
+            self.label_frame,
+            text="Select local base URI directory",
+            command=self.select_local_base_uri_directory
+        )
+        self.help_lbl.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.button.grid(row=1, column=1)
+
+    def select_local_base_uri_directory(self):
+        base_uri_directory = fd.askdirectory(
+            title="Select data directory",
+            initialdir=HOME_DIR
+        )
+        self.root.base_uri_model.put_base_uri(base_uri_directory)
+        self.local_base_uri_directory.set(base_uri_directory)
+        logger.info(
+            "Local base URI directory set to: {}".format(
+                base_uri_directory
+            )
+        )
+        self.refresh()
+        self.root.refresh()
+
+    def refresh(self):
+        logger.info("Refreshing {}".format(self))
+        for widget in self.label_frame.winfo_children():
+            logger.info("Destroying widget: {}".format(widget))
+            widget.destroy()
+
+        self._setup_base_uri_directory_input_field()
+
+
+class ExportMetadataTemplateWindow(tk.Toplevel):
+    """Export metadata template window."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Export metadata template")
+
+        # Implement custom behaviour when closing the window.
+        # Needed to set the App.preferences_window to None.
+        self.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        logger.info("Initialising {}".format(self))
+        self.root = master
+        mainframe = ttk.Frame(self)
+        mainframe.grid(row=0, column=0, sticky="nwes")
+
+        self.metadata_schema_list_model = self.root.metadata_schema_list_model
 
         self.metadata_model_name = tk.StringVar()
         self.label_frame = ttk.LabelFrame(mainframe, text="Metadata schema export")  # NOQA
@@ -1248,21 +2671,62 @@ class ExportMetadataTemplateWindow(tk.Toplevel):
             json.dump(schema, fh, indent=2)
 
 
-class NewDataSetProgressBar(ttk.Progressbar):
+class NewDataSetProgressBar(ttk.Frame):
+    """Progress bar measuring dataset creation in bytes.
 
-    def __init__(self, master, maximum):
-        super().__init__(master, maximum=maximum)
+    Shows the phase of the creation, the amount of data processed, a
+    smoothed transfer rate and an estimate of the time remaining.
+    """
+
+    def __init__(self, master, total_bytes=0, label=None):
+        super().__init__(master)
         logger.info("Initialising {}".format(self))
-        self.current = 0
-        self._maximum = maximum
+        self.columnconfigure(0, weight=1)
+
+        self._bar = ttk.Progressbar(self)
+        self._bar.grid(row=0, column=0, sticky="we")
+
+        self._status_label = ttk.Label(self)
+        self._status_label.grid(row=1, column=0, sticky="w")
+        self.start_phase(label, total_bytes)
+
+    def start_phase(self, label, total_bytes):
+        """Restart the progress bar for a new phase of the creation."""
+        self._label = label
+        self._estimator = ThroughputEstimator(total_bytes or 0)
+        # A maximum of zero would make the bar indeterminate.
+        self._bar.config(maximum=max(total_bytes or 0, 1), value=0)
+        self._refresh_status(None)
 
     @property
     def total(self):
-        return self._maximum
+        return self._estimator.total_bytes
 
-    def update(self, steps):
-        self.current = self.current + steps
-        self.config(value=self.current)
+    @property
+    def current(self):
+        return self._estimator.done_bytes
+
+    def _refresh_status(self, current):
+        rate = self._estimator.bytes_per_second
+        status = "{} of {}".format(
+            sizeof_fmt(self.current).strip(),
+            sizeof_fmt(self.total).strip()
+        )
+        if rate is not None:
+            status += ", {:.1f} MB/s, ETA {}".format(
+                rate / 1e6,
+                format_duration(self._estimator.eta)
+            )
+        if current is not None:
+            status += " ({})".format(current)
+        if self._label is not None:
+            status = "{}: {}".format(self._label, status)
+        self._status_label.config(text=status)
+
+    def update(self, nbytes, current=None):
+        self._estimator.update(nbytes)
+        self._bar.config(value=self.current)
+        self._refresh_status(current)
 
 
 class App(tk.Tk):
@@ -1273,11 +2737,20 @@ class App(tk.Tk):
         logger.info("Initialising dtool-gui")
         self.title("dtool")
 
+        # Make sure the basic metadata schema is present in the metadata
+        # schemas directory.
+        setup_metadata_schema_directory()
+        self.metadata_schema_list_model = MetadataSchemaListModel()
+
         self.preferences_window = None
         self.export_metadata_template_window = None
         self.edit_metadata_window = None
         self.active_dataset_metadata_supported = False
         self.edit_tags_window = None
+        self.verify_dataset_window = None
+        self.audit_window = None
+        self.bulk_edit_metadata_window = None
+        self._dataset_load_job = None
 
         # Make sure that the GUI expands/shrinks when the window is resized.
         self.columnconfigure(0, weight=1)
@@ -1324,6 +2797,10 @@ class App(tk.Tk):
             cmd=self.new_dataset,
             event_cmd=self._new_dataset_event
         )
+        menu_file.add_command(
+            label="New datasets from job list...",
+            command=self.batch_create
+        )
         menu_file.add_separator()
         self._add_menu_command(
             menu=menu_file,
@@ -1358,6 +2835,11 @@ class App(tk.Tk):
             event_cmd=self._edit_metadata_event
         )
 
+        menu_edit.add_command(
+            label="Edit metadata of selected datasets...",
+            command=self.bulk_edit_metadata
+        )
+
         self._add_menu_command(
             menu=menu_edit,
             label="Edit tags...",
@@ -1366,6 +2848,15 @@ class App(tk.Tk):
             event_cmd=self._edit_tags_event
         )
 
+        menu_edit.add_command(
+            label="Verify dataset...",
+            command=self.verify_dataset
+        )
+        menu_edit.add_command(
+            label="Audit metadata of all datasets...",
+            command=self.audit_metadata
+        )
+
         if self.platform != "aqua":
             self._add_menu_command(
                 menu=menu_edit,
@@ -1405,6 +2896,20 @@ class App(tk.Tk):
                 "This is where datasets will be created on your computer."
             )
 
+        # Load the metadata schemas and compile their validators once the
+        # main window has been shown, so that the first new dataset window
+        # opens quickly.
+        self.after_idle(self.after, WARM_UP_DELAY, self._start_warm_up)
+
+    def _start_warm_up(self):
+        thread = threading.Thread(
+            target=warm_up_metadata_schemas,
+            args=(self.metadata_schema_list_model,),
+            name="warm-up",
+            daemon=True
+        )
+        thread.start()
+
     def _get_accelerator(self, key):
         key = key.upper()
         if self.platform == "aqua":
@@ -1436,6 +2941,11 @@ class App(tk.Tk):
         logger.info(self.new_dataset.__doc__)
         NewDataSetWindow(self)
 
+    def batch_create(self):
+        """Open window to create datasets from a job list."""
+        logger.info(self.batch_create.__doc__)
+        BatchCreateWindow(self)
+
     def _import_metadata_schema(self, event):
         self.import_metadata_schema()
 
@@ -1446,7 +2956,7 @@ class App(tk.Tk):
         fname = os.path.basename(fpath)
         name, _ = os.path.splitext(fname)
 
-        metadata_schema_list_model = MetadataSchemaListModel()
+        metadata_schema_list_model = self.metadata_schema_list_model
 
         # If a metadata schema with the same name exists check
         # if the user really wants to overwrite it.
@@ -1494,6 +3004,9 @@ class App(tk.Tk):
     def edit_metadata(self):
         """Open window with form to edit a dataset's metadata."""
         logger.info(self.edit_metadata.__doc__)
+        if self.is_loading_dataset:
+            logger.info("Can't edit metadata whilst the dataset is loading")
+            return
         if self.edit_metadata_window is None:
             if self.active_dataset_metadata_supported:
                 self.edit_metadata_window = EditMetadataWindow(
@@ -1509,6 +3022,25 @@ class App(tk.Tk):
         else:
             self.edit_metadata_window.focus_set()
 
+    def bulk_edit_metadata(self):
+        """Open window to edit the metadata of the selected datasets."""
+        logger.info(self.bulk_edit_metadata.__doc__)
+        if self.bulk_edit_metadata_window is not None:
+            self.bulk_edit_metadata_window.focus_set()
+            return
+        indices = self.dataset_collection_frame.dataset_list_frame.selected_indices  # NOQA
+        if len(indices) == 0:
+            mb.showinfo(
+                "No datasets selected",
+                "Please select the datasets in the list, using Shift or Ctrl to select several."  # NOQA
+            )
+            return
+        self.bulk_edit_metadata_window = BulkEditMetadataWindow(
+            self,
+            # The datasets loaded by the listing are not loaded again.
+            [self.dataset_list_model.get_dataset(i) for i in indices]
+        )
+
     def _edit_tags_event(self, tags):
         self.edit_tags()
 
@@ -1523,6 +3055,28 @@ class App(tk.Tk):
         else:
             self.edit_tags_window.focus_set()
 
+    def verify_dataset(self):
+        """Open window to verify the items of a dataset."""
+        logger.info(self.verify_dataset.__doc__)
+        if self.is_loading_dataset or self.dataset_model.is_empty:
+            logger.info("No dataset loaded to verify")
+            return
+        if self.verify_dataset_window is None:
+            self.verify_dataset_window = VerifyDataSetWindow(
+                self,
+                self.dataset_model
+            )
+        else:
+            self.verify_dataset_window.focus_set()
+
+    def audit_metadata(self):
+        """Open window to audit the metadata of all datasets."""
+        logger.info(self.audit_metadata.__doc__)
+        if self.audit_window is None:
+            self.audit_window = AuditWindow(self)
+        else:
+            self.audit_window.focus_set()
+
     def _quit_event(self, event):
         self.quit()
 
@@ -1542,14 +3096,50 @@ class App(tk.Tk):
         else:
             self.preferences_window.focus_set()
 
+    @property
+    def is_loading_dataset(self):
+        """Return True if a dataset is being loaded in the background."""
+        return self._dataset_load_job is not None
+
+    def _cancel_dataset_load(self):
+        if self._dataset_load_job is not None:
+            self._dataset_load_job.cancel()
+            self._dataset_load_job = None
+
+    def clear_dataset(self):
+        """Clear the active dataset and cancel any in-flight load."""
+        self._cancel_dataset_load()
+        self.dataset_model = DataSetModel()
+        self.active_dataset_metadata_supported = False
+
     def load_dataset(self, dataset_uri):
-        """Load dataset and deal with UnsupportedTypeError exceptions."""
-        try:
-            self.dataset_model.load_dataset(dataset_uri)
-            self.active_dataset_metadata_supported = True
-        except UnsupportedTypeError:
-            logging.warning("Dataset contains unsupported metadata type")
-            self.active_dataset_metadata_supported = False
+        """Load dataset in a worker thread.
+
+        Any load that is still in flight is cancelled. Whilst loading, the
+        dataset frame shows a placeholder. The result is only applied if it
+        still matches the active dataset when the load finishes.
+        """
+        self.clear_dataset()
+        job = DataSetLoadJob(dataset_uri)
+        self._dataset_load_job = job
+        job.start()
+        self.after(50, lambda: self._check_dataset_load_job(job))
+
+    def _check_dataset_load_job(self, job):
+        if job is not self._dataset_load_job:
+            # Superseded by a newer selection.
+            return
+        if job.is_alive():
+            self.after(50, lambda: self._check_dataset_load_job(job))
+            return
+
+        self._dataset_load_job = None
+        if job.uri != self.dataset_list_model.get_active_uri():
+            logger.info("Discarding stale dataset load: {}".format(job.uri))
+        else:
+            self.dataset_model = job.dataset_model
+            self.active_dataset_metadata_supported = job.metadata_supported
+        self.dataset_frame.refresh()
 
     def refresh(self):
         """Refreshing all frames."""
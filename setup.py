@@ -18,10 +18,13 @@ setup(
         "dtoolcore>=3.18.0",
         "dtool-info",  # TODO: Should work to remove this.
         "ruamel.yaml",
-        "jsonschema",
+        "jsonschema>=4.21.0",
     ],
     entry_points={
-        'console_scripts': ['dtool-tk=dtool_gui_tk.tkgui:tkgui'],
+        'console_scripts': [
+            'dtool-tk=dtool_gui_tk.tkgui:tkgui',
+            'dtool-tk-cli=dtool_gui_tk.cli:main',
+        ],
     },
     download_url="{}/tarball/{}".format(url, version),
     license="MIT"
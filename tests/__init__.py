@@ -1,3 +1,4 @@
+import os
 import shutil
 import tempfile
 
@@ -13,3 +14,34 @@ def tmp_dir_fixture(request):
         shutil.rmtree(d)
 
     return d
+
+
+def create_dataset(base_uri, name, readme="", annotations=None,
+                   metadata_schema=None, freeze=True):
+    """Create a dataset without items and return its URI."""
+    import dtoolcore
+    from dtool_gui_tk.models import METADATA_SCHEMA_ANNOTATION_NAME
+
+    proto_dataset = dtoolcore.create_proto_dataset(name, base_uri, readme)
+    if annotations is not None:
+        for key, value in annotations.items():
+            proto_dataset.put_annotation(key, value)
+    if metadata_schema is not None:
+        proto_dataset.put_annotation(
+            METADATA_SCHEMA_ANNOTATION_NAME,
+            metadata_schema
+        )
+    if freeze:
+        proto_dataset.freeze()
+    return proto_dataset.uri
+
+
+def create_input_directory(tmp_dir_fixture, name, num_files):  # NOQA
+    """Create an input directory with files named after the directory."""
+    input_directory = os.path.join(tmp_dir_fixture, "runs", name)
+    os.makedirs(input_directory)
+    for i in range(num_files):
+        fpath = os.path.join(input_directory, "file{}.txt".format(i))
+        with open(fpath, "w") as fh:
+            fh.write("{} {}".format(name, i) * 100)
+    return input_directory
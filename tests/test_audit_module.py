@@ -0,0 +1,197 @@
+"""Test the dtool_gui_tk.audit module."""
+
+import csv
+import json
+import os
+
+import pytest
+
+from . import create_dataset, tmp_dir_fixture  # NOQA
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project": {"type": "string", "minLength": 3},
+        "age": {"type": "integer", "minimum": 0},
+    },
+    "required": ["project"]
+}
+
+
+def _setup_datasets(base_uri):
+    uris = {}
+    uris["ok"] = create_dataset(
+        base_uri, "ok", "---\nproject: abc", {"project": "abc"}, SCHEMA
+    )
+    uris["invalid"] = create_dataset(
+        base_uri, "invalid", "", {"project": "x", "age": -1}, SCHEMA
+    )
+    uris["conflict"] = create_dataset(
+        base_uri, "conflict", "---\nproject: abc", {"project": "xyz"}, SCHEMA
+    )
+    uris["no-schema"] = create_dataset(
+        base_uri, "no-schema", "---\nproject: x"
+    )
+    create_dataset(base_uri, "proto", freeze=False)
+    return uris
+
+
+def test_audit_dataset(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.audit import (
+        AUDIT_CONFLICT,
+        AUDIT_INVALID,
+        AUDIT_NO_SCHEMA,
+        AUDIT_OK,
+        audit_dataset,
+        list_dataset_uris,
+    )
+
+    uris = _setup_datasets(tmp_dir_fixture)
+
+    # Proto datasets are listed but not audited.
+    assert len(list_dataset_uris(tmp_dir_fixture)) == 5
+
+    result = audit_dataset(uris["ok"])
+    assert result == {
+        "uri": uris["ok"],
+        "name": "ok",
+        "status": AUDIT_OK,
+        "issues": []
+    }
+
+    result = audit_dataset(uris["invalid"])
+    assert result["status"] == AUDIT_INVALID
+    assert result["issues"] == [
+        "project: 'x' is too short",
+        "age: -1 is less than the minimum of 0",
+    ]
+
+    result = audit_dataset(uris["conflict"])
+    assert result["status"] == AUDIT_CONFLICT
+    assert len(result["issues"]) == 1
+
+    assert audit_dataset(uris["no-schema"])["status"] == AUDIT_NO_SCHEMA
+
+    # A chosen schema is used instead of the stored schema.
+    schema = {
+        "type": "object",
+        "properties": {"description": {"type": "string"}},
+        "required": ["description"]
+    }
+    result = audit_dataset(uris["no-schema"], schema)
+    assert result["status"] == AUDIT_INVALID
+    assert result["issues"] == ["description: missing required value"]
+    assert audit_dataset(uris["ok"], SCHEMA)["status"] == AUDIT_OK
+
+
+@pytest.mark.parametrize("num_workers,use_processes,start_method", [
+    (1, True, None),
+    (2, False, None),
+    (2, True, None),
+    (2, True, "spawn"),
+])
+def test_iter_audit(tmp_dir_fixture, num_workers, use_processes, start_method):  # NOQA
+    import multiprocessing
+    from dtool_gui_tk.audit import (
+        count_statuses,
+        iter_audit,
+        list_dataset_uris,
+    )
+
+    _setup_datasets(tmp_dir_fixture)
+    uris = list_dataset_uris(tmp_dir_fixture)
+
+    mp_context = None
+    if start_method is not None:
+        mp_context = multiprocessing.get_context(start_method)
+    results = list(iter_audit(
+        uris,
+        num_workers=num_workers,
+        use_processes=use_processes,
+        chunk_size=2,
+        mp_context=mp_context
+    ))
+    assert sorted(r["name"] for r in results) == [
+        "conflict", "invalid", "no-schema", "ok"
+    ]
+    assert count_statuses(results) == {
+        "ok": 1,
+        "invalid": 1,
+        "conflict": 1,
+        "no schema": 1,
+    }
+
+
+def test_iter_audit_config_path(tmp_dir_fixture, monkeypatch):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.audit import iter_audit, list_dataset_uris
+
+    _setup_datasets(tmp_dir_fixture)
+    config_path = os.path.join(tmp_dir_fixture, "dtool.json")
+    config_paths = []
+    original_from_uri = dtoolcore.DataSet.from_uri
+
+    def recording_from_uri(uri, config_path=None):
+        config_paths.append(config_path)
+        return original_from_uri(uri, config_path=config_path)
+
+    monkeypatch.setattr(dtoolcore.DataSet, "from_uri", recording_from_uri)
+    results = list(iter_audit(
+        list_dataset_uris(tmp_dir_fixture, config_path),
+        num_workers=2,
+        use_processes=False,
+        config_path=config_path
+    ))
+    assert len(results) == 4
+    assert config_paths == [config_path] * 5
+
+
+def test_iter_audit_cancel(tmp_dir_fixture):  # NOQA
+    import threading
+    from dtool_gui_tk.audit import iter_audit, list_dataset_uris
+
+    _setup_datasets(tmp_dir_fixture)
+    cancel_event = threading.Event()
+    cancel_event.set()
+    results = iter_audit(
+        list_dataset_uris(tmp_dir_fixture),
+        num_workers=1,
+        cancel_event=cancel_event
+    )
+    assert list(results) == []
+
+
+def test_write_audit_report(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.audit import write_audit_report
+
+    results = [
+        {"uri": "file:///a", "name": "a", "status": "ok", "issues": []},
+        {
+            "uri": "file:///b",
+            "name": "b",
+            "status": "invalid",
+            "issues": ["x: bad", "y: bad"]
+        },
+    ]
+
+    fpath = os.path.join(tmp_dir_fixture, "audit.csv")
+    write_audit_report(results, fpath)
+    with open(fpath) as fh:
+        rows = list(csv.DictReader(fh))
+    assert rows[1] == {
+        "name": "b",
+        "status": "invalid",
+        "num_issues": "2",
+        "issues": "x: bad; y: bad",
+        "uri": "file:///b"
+    }
+
+    fpath = os.path.join(tmp_dir_fixture, "audit.json")
+    write_audit_report(results, fpath)
+    with open(fpath) as fh:
+        rows = json.load(fh)
+    assert rows[1]["issues"] == ["x: bad", "y: bad"]
+    assert rows[1]["num_issues"] == 2
+
+    with pytest.raises(ValueError):
+        write_audit_report(results, os.path.join(tmp_dir_fixture, "a.txt"))
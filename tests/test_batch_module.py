@@ -0,0 +1,175 @@
+"""Test the dtool_gui_tk.batch module."""
+
+import json
+import os
+
+import pytest
+
+from . import create_input_directory, tmp_dir_fixture  # NOQA
+
+
+def _models(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.models import LocalBaseURIModel, MetadataSchemaListModel
+
+    base_uri_directory = os.path.join(tmp_dir_fixture, "datasets")
+    os.mkdir(base_uri_directory)
+    schema_directory = os.path.join(tmp_dir_fixture, "metadata_schemas")
+    os.mkdir(schema_directory)
+    with open(os.path.join(schema_directory, "run.json"), "w") as fh:
+        json.dump({
+            "type": "object",
+            "properties": {
+                "description": {"type": "string"},
+                "replicate": {"type": "integer"},
+            },
+            "required": ["description"]
+        }, fh)
+
+    config_path = os.path.join(tmp_dir_fixture, "config.json")
+    base_uri_model = LocalBaseURIModel(config_path)
+    base_uri_model.put_base_uri(base_uri_directory)
+    metadata_schema_list_model = MetadataSchemaListModel(config_path)
+    metadata_schema_list_model.put_metadata_schema_directory(schema_directory)
+    return base_uri_model, metadata_schema_list_model
+
+
+def test_load_job_list_csv(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.batch import JOB_PENDING, load_job_list
+
+    fpath = os.path.join(tmp_dir_fixture, "jobs.csv")
+    with open(fpath, "w") as fh:
+        fh.write("name,input_directory,metadata_schema,description,replicate\n")  # NOQA
+        fh.write("run-001,runs/001,run,First run,1\n")
+        fh.write("run-002,/data/002,,Second run,\n")
+
+    jobs = load_job_list(fpath)
+    assert [j.name for j in jobs] == ["run-001", "run-002"]
+    assert jobs[0].input_directory == os.path.join(tmp_dir_fixture, "runs", "001")  # NOQA
+    assert jobs[1].input_directory == "/data/002"
+    assert jobs[0].metadata_schema == "run"
+    assert jobs[1].metadata_schema is None
+    assert jobs[0].metadata == {"description": "First run", "replicate": "1"}
+    assert jobs[1].metadata == {"description": "Second run"}
+    assert jobs[0].metadata_from_str
+    assert jobs[0].status == JOB_PENDING
+
+    with open(fpath, "w") as fh:
+        fh.write("name,description\n")
+        fh.write("run-001,First run\n")
+    with pytest.raises(ValueError):
+        load_job_list(fpath)
+
+
+def test_load_job_list_json(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.batch import load_job_list
+
+    fpath = os.path.join(tmp_dir_fixture, "jobs.json")
+    with open(fpath, "w") as fh:
+        json.dump([
+            {
+                "name": "run-001",
+                "input_directory": "runs/001",
+                "metadata_schema": "schemas/run.json",
+                "metadata": {"description": "First run", "replicate": 1}
+            },
+        ], fh)
+
+    jobs = load_job_list(fpath)
+    assert len(jobs) == 1
+    assert jobs[0].metadata == {"description": "First run", "replicate": 1}
+    assert jobs[0].metadata_schema == os.path.join(tmp_dir_fixture, "schemas", "run.json")  # NOQA
+    assert not jobs[0].metadata_from_str
+
+    # Dataset names must be unique.
+    with open(fpath, "w") as fh:
+        json.dump([
+            {"name": "run-001", "input_directory": "a"},
+            {"name": "run-001", "input_directory": "b"},
+        ], fh)
+    with pytest.raises(ValueError):
+        load_job_list(fpath)
+
+    with pytest.raises(ValueError):
+        load_job_list(os.path.join(tmp_dir_fixture, "jobs.txt"))
+
+
+def test_BatchScheduler(tmp_dir_fixture):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.batch import (
+        BatchJob,
+        BatchScheduler,
+        JOB_DONE,
+        JOB_FAILED,
+    )
+
+    base_uri_model, metadata_schema_list_model = _models(tmp_dir_fixture)
+
+    jobs = [
+        BatchJob(
+            "run-{}".format(i),
+            create_input_directory(tmp_dir_fixture, str(i), 3),
+            {"description": "Run {}".format(i), "replicate": str(i)},
+            metadata_from_str=True
+        )
+        for i in range(3)
+    ]
+    # Missing required metadata.
+    jobs.append(BatchJob(
+        "run-bad",
+        create_input_directory(tmp_dir_fixture, "bad", 1)
+    ))
+
+    scheduler = BatchScheduler(
+        jobs,
+        base_uri_model,
+        metadata_schema_list_model,
+        max_concurrent_jobs=2,
+        io_budget=100e6,
+        num_workers=2,
+        default_metadata_schema="run"
+    )
+    summary = scheduler.run()
+
+    assert summary["num_jobs"] == 4
+    assert summary["num_done"] == 3
+    assert summary["num_failed"] == 1
+    assert jobs[3].status == JOB_FAILED
+    assert jobs[3].error is not None
+
+    for i, job in enumerate(jobs[:3]):
+        assert job.status == JOB_DONE
+        progress = job.progress()
+        assert progress["items"] == 3
+        assert progress["bytes"] == progress["total_bytes"]
+        assert job.ingest_stats["num_items"] == 3
+        dataset = dtoolcore.DataSet.from_uri(job.uri)
+        assert dataset.name == "run-{}".format(i)
+        assert dataset.get_annotation("replicate") == i
+        assert len(dataset.identifiers) == 3
+
+    report = scheduler.format_summary()
+    assert "3 done, 1 failed" in report
+
+
+def test_BatchScheduler_cancel(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.batch import BatchJob, BatchScheduler, JOB_CANCELLED
+
+    base_uri_model, metadata_schema_list_model = _models(tmp_dir_fixture)
+    jobs = [
+        BatchJob(
+            "run-{}".format(i),
+            create_input_directory(tmp_dir_fixture, str(i), 1),
+            {"description": "Run {}".format(i)}
+        )
+        for i in range(2)
+    ]
+    scheduler = BatchScheduler(
+        jobs,
+        base_uri_model,
+        metadata_schema_list_model,
+        default_metadata_schema="run"
+    )
+    scheduler.cancel()
+    summary = scheduler.run()
+    assert summary["num_cancelled"] == 2
+    assert all(j.status == JOB_CANCELLED for j in jobs)
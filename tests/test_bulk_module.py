@@ -0,0 +1,166 @@
+"""Test the dtool_gui_tk.bulk module."""
+
+import threading
+
+import pytest
+
+from . import create_dataset, tmp_dir_fixture  # NOQA
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project": {"type": "string", "minLength": 3},
+        "replicate": {"type": "integer", "minimum": 1},
+    },
+    "required": ["project"]
+}
+
+
+def _create_dataset(base_uri, name, project):
+    return create_dataset(
+        base_uri,
+        name,
+        "---\nproject: {}".format(project),
+        {"project": project},
+        SCHEMA
+    )
+
+
+def test_prepare_changes():
+    from dtool_gui_tk.bulk import prepare_changes
+    from dtool_gui_tk.models import (
+        MetadataModel,
+        MetadataValidationError,
+        UnsupportedTypeError,
+    )
+
+    # Without a metadata model values are parsed as JSON if possible.
+    changes = {"project": "P-0042", "replicate": "2", "done": "true"}
+    assert prepare_changes(changes, from_str=True) == {
+        "project": "P-0042",
+        "replicate": 2,
+        "done": True
+    }
+    assert prepare_changes({"replicate": 2}) == {"replicate": 2}
+    with pytest.raises(UnsupportedTypeError):
+        prepare_changes({"replicate": None})
+
+    # With a metadata model values are converted to the type in the schema
+    # and validated.
+    metadata_model = MetadataModel()
+    metadata_model.load_master_schema(SCHEMA)
+    changes = {"project": "123", "replicate": "2", "other": "1"}
+    assert prepare_changes(changes, metadata_model, from_str=True) == {
+        "project": "123",
+        "replicate": 2,
+        "other": 1
+    }
+    with pytest.raises(MetadataValidationError):
+        prepare_changes({"project": "ab"}, metadata_model)
+    with pytest.raises(MetadataValidationError):
+        prepare_changes({"replicate": "0"}, metadata_model, from_str=True)
+    with pytest.raises(MetadataValidationError):
+        prepare_changes({"replicate": "two"}, metadata_model, from_str=True)
+
+    # The metadata model is not changed.
+    assert metadata_model.get_value("replicate") is None
+
+
+def test_update_dataset_metadata(tmp_dir_fixture):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.bulk import (
+        BULK_FAILED,
+        BULK_UNCHANGED,
+        BULK_UPDATED,
+        update_dataset_metadata,
+    )
+
+    uri = _create_dataset(tmp_dir_fixture, "ds", "abc")
+
+    changes = {"project": "P-0042", "replicate": 2, "operator": "me"}
+    assert update_dataset_metadata(uri, changes) == {
+        "uri": uri,
+        "name": "ds",
+        "status": BULK_UPDATED,
+        "error": None
+    }
+    dataset = dtoolcore.DataSet.from_uri(uri)
+    for key, value in changes.items():
+        assert dataset.get_annotation(key) == value
+    readme = dataset.get_readme_content()
+    assert "project: P-0042" in readme
+    assert "replicate: 2" in readme
+    assert "operator: me" in readme
+
+    # Nothing is written if the values are already set.
+    result = update_dataset_metadata(uri, changes)
+    assert result["status"] == BULK_UNCHANGED
+
+    # Optional values that are not changed are kept in the README.
+    result = update_dataset_metadata(uri, {"project": "P-0043"})
+    assert result["status"] == BULK_UPDATED
+    readme = dataset.get_readme_content()
+    assert "project: P-0043" in readme
+    assert "replicate: 2" in readme
+
+    # Values that are not valid according to the schema stored in the
+    # dataset are not written.
+    result = update_dataset_metadata(uri, {"project": 1})
+    assert result["status"] == BULK_FAILED
+    assert dataset.get_annotation("project") == "P-0043"
+
+    missing_uri = uri + "-missing"
+    result = update_dataset_metadata(missing_uri, changes)
+    assert result["name"] == "ds-missing"
+    assert result["status"] == BULK_FAILED
+    assert result["error"] is not None
+
+
+def test_iter_bulk_update(tmp_dir_fixture, monkeypatch):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.audit import count_statuses
+    from dtool_gui_tk.bulk import (
+        BULK_FAILED,
+        BULK_UNCHANGED,
+        BULK_UPDATED,
+        iter_bulk_update,
+    )
+    from dtool_gui_tk.models import DataSetModel
+
+    uris = [
+        _create_dataset(tmp_dir_fixture, "ds-{}".format(i), "abc")
+        for i in range(10)
+    ]
+    uris.append(uris[0] + "-missing")
+
+    results = list(iter_bulk_update(uris, {"project": "abc"}, max_workers=3))
+    assert count_statuses(results) == {BULK_UNCHANGED: 10, BULK_FAILED: 1}
+
+    results = list(iter_bulk_update(uris, {"project": "xyz"}, max_workers=3))
+    assert count_statuses(results) == {BULK_UPDATED: 10, BULK_FAILED: 1}
+    for uri in uris[:-1]:
+        assert dtoolcore.DataSet.from_uri(uri).get_annotation("project") == "xyz"  # NOQA
+
+    # Datasets that have already been loaded are not loaded again.
+    datasets = [dtoolcore.DataSet.from_uri(uri) for uri in uris[:-1]]
+    loaded = []
+    monkeypatch.setattr(
+        DataSetModel,
+        "load_dataset",
+        lambda self, uri, config_path=None: loaded.append(uri)
+    )
+    results = list(iter_bulk_update(datasets, {"project": "P-1"}))
+    assert count_statuses(results) == {BULK_UPDATED: 10}
+    assert sorted(r["uri"] for r in results) == sorted(uris[:-1])
+    assert loaded == []
+    for uri in uris[:-1]:
+        assert dtoolcore.DataSet.from_uri(uri).get_annotation("project") == "P-1"  # NOQA
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    results = list(iter_bulk_update(
+        uris,
+        {"project": "abc"},
+        cancel_event=cancel_event
+    ))
+    assert results == []
@@ -0,0 +1,299 @@
+"""Test the dtool_gui_tk.cli module."""
+
+import json
+import os
+import subprocess
+import sys
+
+from . import tmp_dir_fixture  # NOQA
+
+
+def _setup(tmp_dir_fixture):  # NOQA
+    base_uri_directory = os.path.join(tmp_dir_fixture, "datasets")
+    os.mkdir(base_uri_directory)
+    schema_directory = os.path.join(tmp_dir_fixture, "metadata_schemas")
+    os.mkdir(schema_directory)
+    with open(os.path.join(schema_directory, "run.json"), "w") as fh:
+        json.dump({
+            "type": "object",
+            "properties": {
+                "description": {"type": "string"},
+                "replicate": {"type": "integer", "minimum": 1},
+            },
+            "required": ["description"]
+        }, fh)
+
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    os.mkdir(input_directory)
+    for name in ("a.txt", "b.txt", ".DS_Store"):
+        with open(os.path.join(input_directory, name), "w") as fh:
+            fh.write(name)
+
+    return [
+        "--base-uri", base_uri_directory,
+        "--config", os.path.join(tmp_dir_fixture, "config.json"),
+    ], [
+        "--metadata-schema-directory", schema_directory,
+        "--metadata-schema", "run",
+    ], input_directory
+
+
+def test_create_list_query(tmp_dir_fixture, capsys):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+
+    for name, replicate in (("run-1", "1"), ("run-2", "2")):
+        status = main(
+            ["create", name, input_directory, "--workers", "1"]
+            + config_args + schema_args
+            + ["--metadata", "description=A run",
+               "--metadata", "replicate=" + replicate]
+        )
+        assert status == 0
+    uri = capsys.readouterr().out.splitlines()[0]
+    dataset = dtoolcore.DataSet.from_uri(uri)
+    assert dataset.name == "run-1"
+    assert dataset.get_annotation("replicate") == 1
+    assert sorted(p["relpath"] for p in (
+        dataset.item_properties(i) for i in dataset.identifiers
+    )) == ["a.txt", "b.txt"]
+
+    assert main(["list", "--json"] + config_args) == 0
+    datasets = json.loads(capsys.readouterr().out)
+    assert [d["name"] for d in datasets] == ["run-1", "run-2"]
+
+    assert main(["list", "--reverse"] + config_args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split("\t")[0] for line in lines] == ["run-2", "run-1"]
+
+    assert main(["query", "--where", "replicate=2"] + config_args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split("\t")[0] for line in lines] == ["run-2"]
+
+    assert main(["query", "--where", "description=Other"] + config_args) == 0  # NOQA
+    assert capsys.readouterr().out == ""
+
+
+def test_query_uses_config(tmp_dir_fixture, capsys, monkeypatch):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+    main(
+        ["create", "run-1", input_directory] + config_args + schema_args
+        + ["--metadata", "description=A run"]
+    )
+    capsys.readouterr()
+
+    config_paths = []
+    original_from_uri = dtoolcore.DataSet.from_uri
+
+    def recording_from_uri(uri, config_path=None):
+        config_paths.append(config_path)
+        return original_from_uri(uri, config_path=config_path)
+
+    monkeypatch.setattr(dtoolcore.DataSet, "from_uri", recording_from_uri)
+    assert main(["query", "--where", "description=A run"] + config_args) == 0  # NOQA
+    assert capsys.readouterr().out.startswith("run-1\t")
+    # The datasets matching the conditions are loaded with the config file.
+    assert config_paths[-1] == os.path.join(tmp_dir_fixture, "config.json")
+
+
+def test_list_indexes_datasets_once(tmp_dir_fixture, capsys, monkeypatch):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.cli import main
+    from dtool_gui_tk.models import DataSetListModel
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+    main(
+        ["create", "run-1", input_directory] + config_args + schema_args
+        + ["--metadata", "description=A run"]
+    )
+    capsys.readouterr()
+    base_uri = dtoolcore.utils.sanitise_uri(os.path.join(tmp_dir_fixture, "datasets"))  # NOQA
+    for dataset in dtoolcore.iter_datasets_in_base_uri(base_uri):
+        dataset.put_tag("x")
+
+    calls = []
+    original_reindex = DataSetListModel.reindex
+
+    def counting_reindex(self):
+        calls.append(self)
+        original_reindex(self)
+
+    monkeypatch.setattr(DataSetListModel, "reindex", counting_reindex)
+    for args in (["list"], ["list", "--tag", "x"], ["query", "--tag", "x"]):
+        del calls[:]
+        assert main(args + config_args) == 0
+        assert len(calls) == 1
+    assert capsys.readouterr().out.splitlines()[0].startswith("run-1\t")
+
+    del calls[:]
+    assert main(["edit", "--tag", "x", "--metadata", "a=b"] + config_args) == 0  # NOQA
+    assert len(calls) == 1
+
+
+def test_TextProgressBar(capsys):
+    from dtool_gui_tk.cli import _TextProgressBar
+
+    progressbar = _TextProgressBar(interval=0)
+    progressbar.phase("Finding duplicates", 2e6)
+    progressbar.update(1, nbytes=1e6, current="a.txt")
+    progressbar.phase("Adding items", 4e6)
+    progressbar.update(1, nbytes=1e6, current="a.txt")
+    lines = capsys.readouterr().err.splitlines()
+    assert lines[0].startswith("Finding duplicates: 1 items, 1.0 of 2.0 MB")
+    assert lines[1].startswith("Adding items: 1 items, 1.0 of 4.0 MB")
+
+
+def test_create_errors(tmp_dir_fixture, capsys):  # NOQA
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+
+    # Missing required metadata.
+    status = main(["create", "run-1", input_directory] + config_args + schema_args)  # NOQA
+    assert status == 1
+    assert "Error" in capsys.readouterr().err
+
+    # Metadata not in the schema.
+    status = main(
+        ["create", "run-1", input_directory] + config_args + schema_args
+        + ["--metadata", "colour=red"]
+    )
+    assert status == 1
+    assert "colour" in capsys.readouterr().err
+    assert os.listdir(os.path.join(tmp_dir_fixture, "datasets")) == []
+
+
+def test_validate(tmp_dir_fixture, capsys):  # NOQA
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+
+    status = main(
+        ["validate"] + config_args + schema_args
+        + ["--metadata", "replicate=0"]
+    )
+    assert status == 1
+    out = capsys.readouterr().out
+    assert "description: missing required value" in out
+    assert "replicate:" in out
+
+    metadata_fpath = os.path.join(tmp_dir_fixture, "metadata.json")
+    with open(metadata_fpath, "w") as fh:
+        json.dump({"description": "A run", "replicate": 2}, fh)
+    status = main(
+        ["validate"] + config_args + schema_args
+        + ["--metadata-file", metadata_fpath]
+    )
+    assert status == 0
+
+    main(
+        ["create", "run-1", input_directory] + config_args + schema_args
+        + ["--metadata-file", metadata_fpath]
+    )
+    uri = capsys.readouterr().out.splitlines()[-1]
+    assert main(["validate", uri]) == 0
+
+
+def test_audit(tmp_dir_fixture, capsys):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+
+    for name in ("run-1", "run-2"):
+        main(
+            ["create", name, input_directory, "--workers", "1"]
+            + config_args + schema_args
+            + ["--metadata", "description=A run", "--metadata", "replicate=1"]
+        )
+    uri = capsys.readouterr().out.splitlines()[-1]
+    # The README is not updated, so the values conflict.
+    dtoolcore.DataSet.from_uri(uri).put_annotation("replicate", 0)
+
+    output = os.path.join(tmp_dir_fixture, "audit.json")
+    status = main(
+        ["audit", "--workers", "1", "--output", output] + config_args
+    )
+    assert status == 1
+    captured = capsys.readouterr()
+    assert captured.out.startswith("run-2\tconflict\t")
+    assert "2 dataset(s) audited: 1 conflict, 1 ok" in captured.err
+    with open(output) as fh:
+        assert [r["name"] for r in json.load(fh)] == ["run-1", "run-2"]
+
+    # Audit against a schema that the datasets were not created with.
+    schema_fpath = os.path.join(tmp_dir_fixture, "project.json")
+    with open(schema_fpath, "w") as fh:
+        json.dump({
+            "type": "object",
+            "properties": {"project": {"type": "string"}},
+            "required": ["project"]
+        }, fh)
+    status = main(
+        ["audit", "--workers", "1", "--metadata-schema", schema_fpath]
+        + config_args + schema_args[:2]
+    )
+    assert status == 1
+    out = capsys.readouterr().out
+    assert "run-1\tinvalid\tproject: missing required value" in out
+
+
+def test_edit(tmp_dir_fixture, capsys):  # NOQA
+    import dtoolcore
+    from dtool_gui_tk.cli import main
+
+    config_args, schema_args, input_directory = _setup(tmp_dir_fixture)
+
+    uris = []
+    for name in ("run-1", "run-2"):
+        main(
+            ["create", name, input_directory, "--workers", "1"]
+            + config_args + schema_args
+            + ["--metadata", "description=A run", "--metadata", "replicate=1"]
+        )
+        uris.append(capsys.readouterr().out.splitlines()[-1])
+    dtoolcore.DataSet.from_uri(uris[0]).put_tag("imaging")
+
+    # Values are validated once, before any dataset is edited.
+    status = main(
+        ["edit"] + uris + config_args + schema_args
+        + ["--metadata", "replicate=0"]
+    )
+    assert status == 1
+    assert "replicate value not valid" in capsys.readouterr().err
+
+    status = main(
+        ["edit", "--tag", "imaging"] + config_args + schema_args
+        + ["--metadata", "replicate=2"]
+    )
+    assert status == 0
+    assert "1 dataset(s) edited: 1 updated" in capsys.readouterr().err
+    assert dtoolcore.DataSet.from_uri(uris[0]).get_annotation("replicate") == 2  # NOQA
+    assert dtoolcore.DataSet.from_uri(uris[1]).get_annotation("replicate") == 1  # NOQA
+
+    status = main(
+        ["edit"] + uris + [uris[0] + "-missing"] + config_args
+        + ["--metadata", "project=P-0042"]
+    )
+    assert status == 1
+    captured = capsys.readouterr()
+    assert captured.out.startswith("run-1-missing\tfailed\t")
+    assert "3 dataset(s) edited: 1 failed, 2 updated" in captured.err
+    for uri in uris:
+        dataset = dtoolcore.DataSet.from_uri(uri)
+        assert dataset.get_annotation("project") == "P-0042"
+        assert "project: P-0042" in dataset.get_readme_content()
+
+
+def test_no_tk_import():
+    code = (
+        "import sys, dtool_gui_tk.cli; "
+        "assert 'tkinter' not in sys.modules; "
+        "assert 'dtool_info.inventory' not in sys.modules"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
@@ -0,0 +1,48 @@
+"""Test the dtool_gui_tk.concurrency module."""
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_iter_completed():
+
+    from dtool_gui_tk.concurrency import iter_completed
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(iter_completed(executor, abs, range(-10, 0), window=4))
+    assert sorted(results) == [(task, -task) for task in range(-10, 0)]
+
+
+def test_iter_completed_cancels_queued_tasks():
+
+    import time
+    from dtool_gui_tk.concurrency import iter_completed
+
+    cancel_event = threading.Event()
+    started = []
+
+    def func(task):
+        started.append(task)
+        if task > 0:
+            time.sleep(0.2)
+        return task
+
+    results = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for task, result in iter_completed(
+            executor,
+            func,
+            range(100),
+            window=8,
+            cancel_event=cancel_event
+        ):
+            # Cancel once the window is full and the first task is done.
+            cancel_event.set()
+            results.append((task, result))
+
+    # Only the tasks that were running when the event was set complete; the
+    # other queued tasks in the window are not run.
+    assert len(started) <= 3
+    assert sorted(task for task, _ in results) == sorted(started)
+    assert all(task == result for task, result in results)
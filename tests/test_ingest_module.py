@@ -0,0 +1,441 @@
+"""Test the ingest module."""
+
+import os
+
+import pytest
+
+from . import tmp_dir_fixture  # NOQA
+
+
+def _write(path, content):
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(path, "w") as fh:
+        fh.write(content)
+
+
+def test_scan_input_directory(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.ingest import scan_input_directory
+
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    _write(os.path.join(input_directory, "b.txt"), "bb")
+    _write(os.path.join(input_directory, "a", "c.txt"), "ccc")
+    _write(os.path.join(input_directory, "a", "d", "e.txt"), "")
+
+    # Symbolic links to directories are not followed.
+    other_directory = os.path.join(tmp_dir_fixture, "other")
+    _write(os.path.join(other_directory, "f.txt"), "f")
+    os.symlink(other_directory, os.path.join(input_directory, "link"))
+
+    expected = [
+        (os.path.join(input_directory, "a", "c.txt"), "a/c.txt", 3),
+        (os.path.join(input_directory, "a", "d", "e.txt"), "a/d/e.txt", 0),
+        (os.path.join(input_directory, "b.txt"), "b.txt", 2),
+    ]
+    entries = scan_input_directory(input_directory)
+    assert [e[:3] for e in entries] == expected
+    for path, _, _, mtime_ns in entries:
+        assert mtime_ns == os.stat(path).st_mtime_ns
+
+    # Trailing path separators do not affect the handles.
+    entries = scan_input_directory(input_directory + os.sep)
+    assert [e[1] for e in entries] == ["a/c.txt", "a/d/e.txt", "b.txt"]
+
+
+def test_IngestJournal(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.ingest import IngestJournal
+
+    journal_path = os.path.join(tmp_dir_fixture, "journals", "a.jsonl")
+    journal = IngestJournal(journal_path)
+    assert journal.read() == (None, {})
+
+    header = {"uri": "file:///data/my-dataset"}
+    props = {"relpath": "a.txt", "size_in_bytes": 1}
+    journal.start(header)
+    journal.record("a.txt", 1, 1000, "id-a", props)
+    journal.close()
+
+    # Simulate the application being closed whilst writing a record.
+    with open(journal_path, "a") as fh:
+        fh.write('{"handle": "b.txt", "si')
+
+    read_header, entries = journal.read()
+    assert read_header == header
+    assert list(entries.keys()) == ["a.txt"]
+    assert entries["a.txt"]["mtime_ns"] == 1000
+    assert entries["a.txt"]["props"] == props
+
+    # Records appended after resuming are not lost to the partial line.
+    journal.resume()
+    journal.record("c.txt", 2, 2000, "id-c", props)
+    journal.close()
+    _, entries = journal.read()
+    assert sorted(entries.keys()) == ["a.txt", "c.txt"]
+
+    journal.remove_entries(["a.txt"])
+    read_header, entries = journal.read()
+    assert read_header == header
+    assert list(entries.keys()) == ["c.txt"]
+
+    journal.remove()
+    assert not os.path.exists(journal_path)
+
+
+def test_FileIngester(tmp_dir_fixture):  # NOQA
+    import pytest
+
+    from dtool_gui_tk.ingest import (
+        FileIngester,
+        INGEST_MODE_CLONE,
+        INGEST_MODE_COPY,
+        INGEST_MODE_HARDLINK,
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE,
+        STRATEGY_HARDLINK,
+        STRATEGY_REFLINK,
+    )
+
+    with pytest.raises(ValueError):
+        FileIngester(INGEST_MODE_COPY)
+
+    src = os.path.join(tmp_dir_fixture, "src.txt")
+    _write(src, "hello")
+
+    # Hard links are used if the file system cannot clone files.
+    link_ingester = FileIngester(INGEST_MODE_HARDLINK)
+    dest = os.path.join(tmp_dir_fixture, "dest.txt")
+    strategy = link_ingester.ingest_file(src, dest)
+    assert strategy in (STRATEGY_REFLINK, STRATEGY_HARDLINK)
+    if strategy == STRATEGY_HARDLINK:
+        assert os.path.samefile(src, dest)
+
+    # Replacing a hard linked item must not modify the input file.
+    clone_ingester = FileIngester(INGEST_MODE_CLONE)
+    strategy = clone_ingester.ingest_file(src, dest)
+    assert strategy in (
+        STRATEGY_REFLINK,
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE
+    )
+    assert not os.path.samefile(src, dest)
+    with open(src) as fh:
+        assert fh.read() == "hello"
+    with open(dest) as fh:
+        assert fh.read() == "hello"
+
+
+def test_FileIngester_cancel(tmp_dir_fixture):  # NOQA
+    import threading
+
+    from dtool_gui_tk.ingest import FileIngester, INGEST_MODE_CLONE
+
+    src = os.path.join(tmp_dir_fixture, "src.txt")
+    _write(src, "hello")
+    dest = os.path.join(tmp_dir_fixture, "dest.txt")
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    ingester = FileIngester(INGEST_MODE_CLONE, cancel_event)
+    try:
+        # Cloning is instantaneous, so it is not interrupted.
+        assert ingester.ingest_file(src, dest) == "reflink"
+    except InterruptedError:
+        pass
+
+
+def test_scan_input_directory_concurrently(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.ingest import scan_input_directory
+
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    for i in range(5):
+        for j in range(3):
+            fpath = os.path.join(input_directory, str(i), str(j), "f.txt")
+            _write(fpath, "x" * j)
+
+    serial = scan_input_directory(input_directory)
+    assert len(serial) == 15
+    assert scan_input_directory(input_directory, num_workers=4) == serial
+
+
+@pytest.mark.parametrize("num_workers", [1, 4])
+def test_scan_input_directory_skips_unreadable_directories(tmp_dir_fixture, monkeypatch, caplog, num_workers):  # NOQA
+    import dtool_gui_tk.ingest
+    from dtool_gui_tk.ingest import scan_input_directory
+
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    _write(os.path.join(input_directory, "a.txt"), "a")
+    _write(os.path.join(input_directory, "private", "b.txt"), "b")
+    _write(os.path.join(input_directory, "public", "c.txt"), "c")
+
+    unreadable = os.path.join(input_directory, "private")
+    original_scandir = os.scandir
+
+    def scandir(path):
+        if path == unreadable:
+            raise(PermissionError(13, "Permission denied", path))
+        return original_scandir(path)
+
+    monkeypatch.setattr(dtool_gui_tk.ingest.os, "scandir", scandir)
+    entries = scan_input_directory(input_directory, num_workers=num_workers)
+    assert [e[1] for e in entries] == ["a.txt", "public/c.txt"]
+    assert unreadable in caplog.text
+
+
+def test_preflight_report():
+    from dtool_gui_tk.ingest import preflight_report
+
+    input_items = [
+        ("/in/a", "a", 10, 0),
+        ("/in/b", "b", 0, 0),
+        ("/in/c", "c", 10, 0),
+        ("/in/d", "d", 5, 0),
+        ("/in/e", "e", 0, 0),
+        ("/in/f", "f", 10, 0),
+        ("/in/g", "g", 7, 0),
+        ("/in/h", "h", 7, 0),
+    ]
+    report = preflight_report(input_items, num_largest=2)
+    assert report["num_items"] == 8
+    assert report["total_size"] == 49
+    assert report["largest"] == [("a", 10), ("c", 10)]
+    assert report["empty"] == ["b", "e"]
+    assert report["duplicate_candidates"] == [["a", "c", "f"], ["g", "h"]]
+    assert report["duplicate_candidate_size"] == 2 * 10 + 7
+
+
+def test_measure_throughput(tmp_dir_fixture):  # NOQA
+    from dtool_gui_tk.ingest import (
+        estimate_ingest_seconds,
+        measure_throughput,
+    )
+
+    throughput = measure_throughput(
+        tmp_dir_fixture,
+        nbytes=1024 * 1024,
+        num_files=4
+    )
+    assert throughput["bytes_per_second"] > 0
+    assert throughput["seconds_per_file"] >= 0
+
+    # The scratch directory is removed.
+    assert os.listdir(tmp_dir_fixture) == []
+
+    throughput = {"bytes_per_second": 100.0, "seconds_per_file": 0.5}
+    assert estimate_ingest_seconds(4, 1000, throughput) == 12.0
+
+
+def test_compile_patterns():
+    from dtool_gui_tk.ingest import compile_patterns
+
+    assert compile_patterns([]) is None
+
+    regex = compile_patterns([
+        "*.tmp",
+        ".DS_Store",
+        "raw/*.dat",
+        "cache/**",
+        "run_[!0]?",
+    ])
+    matching = [
+        "a.tmp",
+        "sub/a.tmp",
+        "sub/.DS_Store",
+        "raw/a.dat",
+        "cache/a/b.txt",
+        "run_12",
+        "sub/run_12",
+    ]
+    not_matching = [
+        "a.tmp.txt",
+        "raw/sub/a.dat",
+        "sub/raw/a.dat",
+        "cache",
+        "run_02",
+        "run_123",
+    ]
+    for handle in matching:
+        assert regex.match(handle), handle
+    for handle in not_matching:
+        assert not regex.match(handle), handle
+
+
+def test_scan_input_directory_with_patterns(tmp_dir_fixture, monkeypatch):  # NOQA
+    from dtool_gui_tk import ingest
+
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    for relpath in [
+        "a.tif",
+        "a.tif~",
+        ".DS_Store",
+        "notes.txt",
+        os.path.join("sub", "b.tif"),
+        os.path.join("sub", ".DS_Store"),
+        os.path.join(".git", "objects", "c.tif"),
+    ]:
+        _write(os.path.join(input_directory, relpath), "x")
+
+    scanned = []
+    original_scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(os.path.relpath(path, input_directory))
+        return original_scandir(path)
+
+    monkeypatch.setattr(ingest.os, "scandir", recording_scandir)
+
+    for num_workers in (1, 4):
+        del scanned[:]
+        entries = ingest.scan_input_directory(
+            input_directory,
+            num_workers=num_workers,
+            include_patterns=["*.tif", "*.tif~"],
+            exclude_patterns=ingest.DEFAULT_EXCLUDE_PATTERNS + (".git",)
+        )
+        assert [e[1] for e in entries] == ["a.tif", "sub/b.tif"]
+
+        # Excluded directories are pruned.
+        assert sorted(scanned) == [".", "sub"]
+
+
+def test_TokenBucket():
+    import threading
+    from dtool_gui_tk.ingest import TokenBucket
+
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+    bucket = TokenBucket(1000, capacity=1000)
+    assert bucket.rate == 1000
+
+    # The initial burst is free, the deficit beyond it has to be waited for.
+    assert bucket.consume(1000) == 0
+    cancel_event = threading.Event()
+    cancel_event.set()
+    wait_seconds = bucket.consume(500, cancel_event=cancel_event)
+    assert 0.4 < wait_seconds <= 0.5
+
+
+def test_HashingCopier(tmp_dir_fixture):  # NOQA
+    import hashlib
+    import threading
+    from dtool_gui_tk.ingest import (
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE,
+        HashingCopier,
+    )
+
+    assert HashingCopier.supports("md5sum_hexdigest")
+    assert not HashingCopier.supports("crc32")
+    with pytest.raises(ValueError):
+        HashingCopier("crc32")
+
+    # Content spanning several buffers, with a partial last buffer.
+    content = os.urandom(10 * 1024 + 7)
+    src = os.path.join(tmp_dir_fixture, "src.bin")
+    with open(src, "wb") as fh:
+        fh.write(content)
+    dest = os.path.join(tmp_dir_fixture, "dest.bin")
+    with open(dest, "w") as fh:
+        fh.write("old content")
+
+    copier = HashingCopier("sha256sum_hexdigest", buffer_size=1024)
+    assert copier.copy_file(src, dest) == hashlib.sha256(content).hexdigest()
+    with open(dest, "rb") as fh:
+        assert fh.read() == content
+
+    empty = os.path.join(tmp_dir_fixture, "empty.bin")
+    open(empty, "w").close()
+    assert copier.copy_file(empty, dest) == hashlib.sha256(b"").hexdigest()
+    assert os.path.getsize(dest) == 0
+
+    # A file whose hash is known is copied without being hashed.
+    assert copier.copy_file_unhashed(src, dest) in (
+        STRATEGY_COPY_FILE_RANGE,
+        STRATEGY_COPYFILE,
+    )
+    with open(dest, "rb") as fh:
+        assert fh.read() == content
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    copier = HashingCopier("md5sum_hexdigest", cancel_event=cancel_event)
+    with pytest.raises(InterruptedError):
+        copier.copy_file(src, dest)
+
+
+@pytest.mark.parametrize("num_workers", [1, 4])
+def test_find_duplicates(tmp_dir_fixture, num_workers):  # NOQA
+    import hashlib
+    from dtool_gui_tk.ingest import (
+        DUPLICATE_HEAD_SIZE,
+        find_duplicates,
+        scan_input_directory,
+    )
+
+    large = os.urandom(DUPLICATE_HEAD_SIZE + 100)
+    # Same size as large, same start but a different end.
+    large_other_end = large[:-1] + bytes([(large[-1] + 1) % 256])
+    # Same size as large, different start.
+    large_other_start = bytes([(large[0] + 1) % 256]) + large[1:]
+    contents = {
+        "calibration/a.bin": large,
+        "calibration/b.bin": large,
+        "run/c.bin": large,
+        "run/d.bin": large_other_end,
+        "run/e.bin": large_other_start,
+        "small_1.txt": b"hello",
+        "small_2.txt": b"hello",
+        "small_3.txt": b"world",
+        "empty_1.txt": b"",
+        "empty_2.txt": b"",
+    }
+    for relpath, content in contents.items():
+        fpath = os.path.join(tmp_dir_fixture, relpath)
+        if not os.path.isdir(os.path.dirname(fpath)):
+            os.makedirs(os.path.dirname(fpath))
+        with open(fpath, "wb") as fh:
+            fh.write(content)
+
+    input_items = scan_input_directory(tmp_dir_fixture)
+    duplicates = find_duplicates(input_items, num_workers=num_workers)
+    assert duplicates == [
+        {
+            "hash": hashlib.md5(large).hexdigest(),
+            "size": len(large),
+            "handles": ["calibration/a.bin", "calibration/b.bin", "run/c.bin"],  # NOQA
+        },
+        {
+            "hash": hashlib.md5(b"hello").hexdigest(),
+            "size": 5,
+            "handles": ["small_1.txt", "small_2.txt"],
+        },
+    ]
+
+    # Progress is reported for the candidates read in full.
+    class RecordingProgressBar(object):
+        def __init__(self):
+            self.phases = []
+            self.updates = []
+
+        def phase(self, label, total_bytes=None):
+            self.phases.append((label, total_bytes))
+
+        def update(self, steps, nbytes=0, current=None):
+            self.updates.append((steps, nbytes, current))
+
+    progressbar = RecordingProgressBar()
+    assert find_duplicates(
+        input_items,
+        num_workers=num_workers,
+        progressbar=progressbar
+    ) == duplicates
+    candidate_bytes = 4 * len(large) + 3 * 5
+    assert progressbar.phases == [("Finding duplicates", candidate_bytes)]
+    assert sorted(progressbar.updates) == sorted(
+        [(1, len(large), h) for h in ("calibration/a.bin", "calibration/b.bin", "run/c.bin", "run/d.bin")]  # NOQA
+        + [(1, 5, h) for h in ("small_1.txt", "small_2.txt", "small_3.txt")]
+    )
+
+    with pytest.raises(ValueError):
+        find_duplicates(input_items, hash_function_name="crc32")
@@ -71,3 +71,113 @@ def test_schema_property():
     schema = {"type": "integer", "enum": [1, 2, 3]}
     metadata_schema_item = MetadataSchemaItem(schema)
     assert metadata_schema_item.schema == schema
+
+
+def test_validators_are_shared(monkeypatch):
+    import jsonschema.validators
+    from dtool_gui_tk.metadata import (
+        MetadataSchemaItem,
+        SchemaError,
+        clear_validator_cache,
+        get_validator,
+    )
+
+    clear_validator_cache()
+    num_checks = []
+    check_schema = jsonschema.validators.Draft7Validator.check_schema
+
+    def counting_check_schema(schema):
+        num_checks.append(schema)
+        return check_schema(schema)
+
+    monkeypatch.setattr(
+        jsonschema.validators.Draft7Validator,
+        "check_schema",
+        staticmethod(counting_check_schema)
+    )
+
+    schema = {"type": "integer", "minimum": 0}
+    items = [
+        MetadataSchemaItem(schema),
+        MetadataSchemaItem({"minimum": 0, "type": "integer"}),
+        MetadataSchemaItem(dict(schema)),
+    ]
+    assert len(num_checks) == 1
+    assert items[0]._ivalidator is items[1]._ivalidator
+    assert items[0]._ivalidator is items[2]._ivalidator
+    assert get_validator({"type": "integer", "minimum": 0.0}) is not items[0]._ivalidator  # NOQA
+
+    # Changing the schema passed in does not change the shared validator.
+    schema["minimum"] = 10
+    assert items[1].is_okay(5)
+
+    # Invalid schemas are not cached.
+    for _ in range(2):
+        with pytest.raises(SchemaError):
+            MetadataSchemaItem({"type": "dontexist"})
+    clear_validator_cache()
+
+
+SIMPLE_SCHEMAS = [
+    {"type": "string"},
+    {"type": "string", "description": "A name", "minLength": 1},
+    {"type": "string", "maxLength": 0},
+    {"type": "string", "minLength": 2, "maxLength": 3},
+    {"type": "integer"},
+    {"type": "integer", "minimum": 0, "maximum": 10},
+    {"type": "number", "exclusiveMinimum": 0, "exclusiveMaximum": 1.5},
+    {"maximum": 3, "type": "number"},
+    {"type": "boolean"},
+    {"type": ["string", "null"]},
+    {"enum": ["DNA", "RNA"]},
+    {"type": "string", "enum": ["DNA", "RNA"]},
+    {"enum": [1, 2, 3], "type": "integer"},
+    {"enum": [0, True, None, 1.5, "a"]},
+    {"title": "Anything"},
+]
+
+VALUES = [
+    "", "a", "ab", "abcd", "DNA", 0, 1, 2, 3, -1, 1.0, 1.5, 2.5, 11, True,
+    False, None, [1], {"a": 1},
+]
+
+
+def test_simple_validator_matches_jsonschema():
+    import jsonschema.validators
+    from dtool_gui_tk.metadata import MetadataSchemaItem
+
+    for schema in SIMPLE_SCHEMAS:
+        item = MetadataSchemaItem(schema)
+        assert item._simple_validator is not None, schema
+        validator = jsonschema.validators.Draft7Validator(schema)
+        for value in VALUES:
+            expected = [e.message for e in validator.iter_errors(value)]
+            assert item.issues(value) == expected, (schema, value)
+            assert item.is_okay(value) == validator.is_valid(value)
+
+
+def test_simple_validator_not_used_for_other_schemas():
+    from dtool_gui_tk.metadata import MetadataSchemaItem
+
+    for schema in [
+        {"type": "array", "items": {"enum": [1, 2, 3]}},
+        {"type": "string", "pattern": "^a"},
+        {"enum": [[1, 2]]},
+        {"type": "object"},
+    ]:
+        assert MetadataSchemaItem(schema)._simple_validator is None
+
+
+def test_jsonschema_imported_lazily():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, dtool_gui_tk.models, dtool_gui_tk.metadata as m; "
+        "assert 'jsonschema' not in sys.modules; "
+        "m.MetadataSchemaItem({'type': 'string'}); "
+        "assert 'jsonschema' in sys.modules; "
+        "import jsonschema.exceptions; "
+        "assert issubclass(m.SchemaError, jsonschema.exceptions.SchemaError)"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
@@ -199,6 +199,53 @@ def test_MetadataModel_selected_API():
     assert metadata_model.in_scope_item_names == expected
 
 
+def test_MetadataModel_name_views_are_cached():
+
+    from dtool_gui_tk.models import MetadataModel
+
+    metadata_model = MetadataModel()
+    metadata_model.add_metadata_property("project", required=True)
+    metadata_model.add_metadata_property("age")
+    metadata_model.add_metadata_property("species")
+
+    assert metadata_model.in_scope_item_names == ["project"]
+    assert metadata_model.next_in_scope_item_name("project") == "project"
+    assert metadata_model.is_required_item("project")
+    assert not metadata_model.is_optional_item("project")
+    assert metadata_model.is_optional_item("age")
+
+    # Callers get copies of the cached lists.
+    metadata_model.item_names.append("other")
+    metadata_model.in_scope_item_names.append("other")
+    assert metadata_model.item_names == ["age", "project", "species"]
+    assert metadata_model.in_scope_item_names == ["project"]
+
+    # Selection changes invalidate the cached views.
+    metadata_model.select_optional_item("species")
+    metadata_model.select_optional_item("age")
+    assert metadata_model.in_scope_item_names == ["project", "age", "species"]
+    assert metadata_model.deselected_optional_item_names == []
+    assert metadata_model.next_in_scope_item_name("project") == "age"
+    assert metadata_model.next_in_scope_item_name("species") == "project"
+
+    metadata_model.deselect_optional_item("age")
+    assert metadata_model.deselected_optional_item_names == ["age"]
+    assert metadata_model.next_in_scope_item_name("project") == "species"
+
+    import pytest
+    with pytest.raises(ValueError):
+        metadata_model.next_in_scope_item_name("age")
+
+    # Schema changes invalidate the cached views.
+    metadata_model.add_metadata_property("age", required=True)
+    assert metadata_model.required_item_names == ["age", "project"]
+    assert metadata_model.optional_item_names == ["species"]
+
+    metadata_model.clear()
+    assert metadata_model.item_names == []
+    assert metadata_model.in_scope_item_names == []
+
+
 def test_MetadataModel_issues_API():
 
     from dtool_gui_tk.models import MetadataModel
@@ -228,6 +275,68 @@ def test_MetadataModel_issues_API():
     assert metadata_model.issues("project") == ["'x' is too short"]
 
 
+def test_MetadataModel_incremental_validation():
+
+    from dtool_gui_tk.models import MetadataModel
+
+    metadata_model = MetadataModel()
+
+    master_schema = {
+        "type": "object",
+        "properties": {
+            "project": {"type": "string", "minLength": 3, "maxLength": 80},
+            "age": {"type": "integer", "minimum": 0, "maximum": 90}
+        },
+        "required": ["project"]
+    }
+    metadata_model.load_master_schema(master_schema)
+    assert metadata_model.dirty_item_names == ["age", "project"]
+
+    metadata_model.set_value("project", "x")
+    metadata_model.set_value("age", -1)
+    assert metadata_model.all_issues == [("project", "'x' is too short")]
+
+    # Only the in scope item has been validated.
+    assert metadata_model.dirty_item_names == ["age"]
+
+    # Selecting an optional item changes the scope, not the values.
+    metadata_model.select_optional_item("age")
+    assert metadata_model.all_issues == [
+        ("project", "'x' is too short"),
+        ("age", "-1 is less than the minimum of 0")
+    ]
+    assert metadata_model.dirty_item_names == []
+
+    # Cached results are returned as copies.
+    metadata_model.all_issues.append(("other", "issue"))
+    metadata_model.issues("age").append("issue")
+    assert len(metadata_model.all_issues) == 2
+    assert len(metadata_model.issues("age")) == 1
+
+    # Setting a value only marks that item as dirty.
+    metadata_model.set_value("age", 3)
+    assert metadata_model.dirty_item_names == ["age"]
+    assert metadata_model.is_okay("age")
+    assert metadata_model.all_issues == [("project", "'x' is too short")]
+
+    metadata_model.deselect_optional_item("age")
+    metadata_model.set_value("project", "xyz")
+    assert metadata_model.all_issues == []
+
+    # Changing the schema invalidates the cached issues.
+    metadata_model.add_metadata_property(
+        "project",
+        {"type": "string", "minLength": 5},
+        required=True
+    )
+    assert not metadata_model.is_okay("project")
+    assert metadata_model.all_issues == [("project", "'xyz' is too short")]
+
+    metadata_model.clear()
+    assert metadata_model.dirty_item_names == []
+    assert metadata_model.all_issues == []
+
+
 def test_MetadataModel_str_to_typed():
     from dtool_gui_tk.models import MetadataModel, UnsupportedTypeError
 
@@ -293,6 +402,651 @@ def test_ProtoDataSetModel(tmp_dir_fixture):  # NOQA
     assert proto_dataset_model.input_directory == tmp_dir_fixture
 
 
+def test_ProtoDataSetModel_scans_input_directory_once(tmp_dir_fixture, monkeypatch):  # NOQA
+
+    import dtool_gui_tk.models
+
+    input_directory = _create_input_directory(tmp_dir_fixture, num_items=4)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+
+    scans = []
+
+    def counting_scan_input_directory(input_directory, *args, **kwargs):
+        scans.append(input_directory)
+        return dtool_gui_tk.ingest.scan_input_directory(
+            input_directory,
+            *args,
+            **kwargs
+        )
+
+    monkeypatch.setattr(
+        dtool_gui_tk.models,
+        "scan_input_directory",
+        counting_scan_input_directory
+    )
+
+    # Scan to work out the size of the progress bar.
+    input_items = proto_dataset_model.scan_input_directory()
+    assert len(input_items) == 4
+    assert sum(e[2] for e in input_items) == 3 * len("content 1") * 2
+
+    # Creating the dataset reuses the scan.
+    proto_dataset_model.create()
+    assert len(scans) == 1
+
+    # Changing the input directory discards the previous scan.
+    proto_dataset_model.set_input_directory(input_directory)
+    assert len(proto_dataset_model.input_items) == 4
+    assert len(scans) == 2
+
+
+def _create_input_directory(tmp_dir_fixture, num_items=20):  # NOQA
+    input_directory = os.path.join(tmp_dir_fixture, "input")
+    os.makedirs(os.path.join(input_directory, "sub"))
+    for i in range(num_items):
+        relpath = "item_{}.txt".format(i)
+        if i % 2 == 0:
+            relpath = os.path.join("sub", relpath)
+        with open(os.path.join(input_directory, relpath), "w") as fh:
+            fh.write("content {}".format(i) * i)
+    return input_directory
+
+
+def _proto_dataset_model_for_input(tmp_dir_fixture, input_directory, name):  # NOQA
+    from dtool_gui_tk.models import (
+        LocalBaseURIModel,
+        MetadataModel,
+        ProtoDataSetModel,
+    )
+
+    base_uri_directory = os.path.join(tmp_dir_fixture, "datasets")
+    if not os.path.isdir(base_uri_directory):
+        os.mkdir(base_uri_directory)
+    config_path = os.path.join(tmp_dir_fixture, "config.json")
+    base_uri_model = LocalBaseURIModel(config_path)
+    base_uri_model.put_base_uri(base_uri_directory)
+
+    metadata_model = MetadataModel()
+    metadata_model.add_metadata_property("project", {"type": "string"}, True)
+    metadata_model.set_value("project", "dtool-gui")
+
+    proto_dataset_model = ProtoDataSetModel()
+    proto_dataset_model.set_name(name)
+    proto_dataset_model.set_input_directory(input_directory)
+    proto_dataset_model.set_base_uri_model(base_uri_model)
+    proto_dataset_model.set_metadata_model(metadata_model)
+    return proto_dataset_model
+
+
+class _CountingProgressBar(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, steps, *args, **kwargs):
+        self.count += steps
+
+
+@pytest.mark.parametrize("num_workers,use_processes", [
+    (1, False),
+    (4, False),
+    (2, True),
+])
+def test_ProtoDataSetModel_create_concurrently(tmp_dir_fixture, num_workers, use_processes):  # NOQA
+
+    import dtoolcore
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(num_workers)
+    proto_dataset_model.set_use_processes(use_processes)
+
+    progressbar = _CountingProgressBar()
+    proto_dataset_model.create(progressbar=progressbar)
+    assert progressbar.count == 20
+
+    # The manifest matches the one dtoolcore would have generated.
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    assert len(dataset.identifiers) == 20
+    generated_manifest = dataset.generate_manifest()
+    for identifier in dataset.identifiers:
+        assert dataset.item_properties(identifier) == generated_manifest["items"][identifier]  # NOQA
+    assert dataset.get_annotation("project") == "dtool-gui"
+
+
+def test_freeze_with_manifest_items(tmp_dir_fixture):  # NOQA
+
+    import dtoolcore
+    from dtool_gui_tk.models import _freeze_with_manifest_items
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset = dtoolcore.create_proto_dataset(
+        "my-dataset",
+        tmp_dir_fixture
+    )
+    for root, _, fnames in os.walk(input_directory):
+        for fname in fnames:
+            fpath = os.path.join(root, fname)
+            relpath = os.path.relpath(fpath, input_directory)
+            proto_dataset.put_item(fpath, relpath.replace(os.sep, "/"))
+    expected_manifest = proto_dataset.generate_manifest()
+
+    _freeze_with_manifest_items(
+        proto_dataset,
+        dict(expected_manifest["items"])
+    )
+
+    # The manifest matches the one dtoolcore generates from the items.
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset.uri)
+    manifest = dataset._storage_broker.get_manifest()
+    assert manifest == dataset.generate_manifest()
+    assert manifest == expected_manifest
+
+    # Item properties that do not match the items are not used.
+    proto_dataset = dtoolcore.create_proto_dataset(
+        "other-dataset",
+        tmp_dir_fixture
+    )
+    proto_dataset.put_item(
+        os.path.join(input_directory, "item_1.txt"),
+        "a.txt"
+    )
+    _freeze_with_manifest_items(proto_dataset, {})
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset.uri)
+    assert len(dataset.identifiers) == 1
+    assert dataset._storage_broker.get_manifest() == dataset.generate_manifest()  # NOQA
+
+
+@pytest.mark.parametrize("ingest_mode", ["copy", "clone", "hardlink"])
+def test_ProtoDataSetModel_create_ingest_modes(tmp_dir_fixture, ingest_mode):  # NOQA
+
+    import dtoolcore
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    with pytest.raises(ValueError):
+        proto_dataset_model.set_ingest_mode("teleport")
+    proto_dataset_model.set_ingest_mode(ingest_mode)
+    proto_dataset_model.set_num_workers(4)
+    proto_dataset_model.create()
+
+    strategy_counts = proto_dataset_model.ingest_stats["strategy_counts"]
+    assert sum(strategy_counts.values()) == 20
+    if ingest_mode == "copy":
+        # Copies on local disk are hashed as they are made.
+        assert strategy_counts == {"copy_hash": 20}
+    else:
+        assert "put_item" not in strategy_counts
+
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    assert len(dataset.identifiers) == 20
+    generated_manifest = dataset.generate_manifest()
+    for identifier in dataset.identifiers:
+        expected = generated_manifest["items"][identifier]
+        actual = dataset.item_properties(identifier)
+        assert actual["hash"] == expected["hash"]
+        assert actual["size_in_bytes"] == expected["size_in_bytes"]
+
+    identifier = sorted(dataset.identifiers)[0]
+    fpath = dataset.item_content_abspath(identifier)
+    relpath = dataset.item_properties(identifier)["relpath"]
+    input_fpath = os.path.join(input_directory, relpath)
+    shares_inode = os.path.samefile(fpath, input_fpath)
+    assert shares_inode == (strategy_counts.get("hardlink", 0) == 20)
+
+
+def test_ProtoDataSetModel_create_reports_to_progress_channel(tmp_dir_fixture):  # NOQA
+
+    import os
+
+    from dtool_gui_tk.progress import ProgressChannel
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    expected_bytes = sum(
+        os.path.getsize(os.path.join(dirpath, fn))
+        for dirpath, _, filenames in os.walk(input_directory)
+        for fn in filenames
+    )
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+
+    assert proto_dataset_model.ingest_stats is None
+
+    channel = ProgressChannel()
+    proto_dataset_model.create(progressbar=channel)
+    channel.finish()
+
+    progress = channel.drain()
+    assert progress["phase"] == ("Adding items", expected_bytes)
+    assert progress["items"] == 20
+    assert progress["bytes"] == expected_bytes
+    assert progress["current"] is not None
+    assert progress["done"]
+
+    ingest_stats = proto_dataset_model.ingest_stats
+    assert ingest_stats["num_items"] == 20
+    assert ingest_stats["total_bytes"] == expected_bytes
+    assert ingest_stats["total_seconds"] >= ingest_stats["items_seconds"]
+
+
+def test_ProtoDataSetModel_get_preflight_report(tmp_dir_fixture, monkeypatch):  # NOQA
+
+    import dtool_gui_tk.models
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+
+    measurements = []
+
+    def fake_measure_throughput(directory):
+        measurements.append(directory)
+        return {"bytes_per_second": 1000.0, "seconds_per_file": 0.1}
+
+    monkeypatch.setattr(
+        dtool_gui_tk.models,
+        "measure_throughput",
+        fake_measure_throughput
+    )
+
+    # Measuring the throughput is opt-in.
+    assert proto_dataset_model.get_preflight_report()["eta_seconds"] is None
+    assert measurements == []
+    proto_dataset_model.set_measure_throughput(True)
+
+    report = proto_dataset_model.get_preflight_report(num_largest=3)
+    assert report["num_items"] == 20
+    total_size = sum(e[2] for e in proto_dataset_model.input_items)
+    assert report["total_size"] == total_size
+    assert [size for _, size in report["largest"]] == [
+        len("content 19") * 19,
+        len("content 18") * 18,
+        len("content 17") * 17,
+    ]
+    assert report["empty"] == ["sub/item_0.txt"]
+    assert report["eta_seconds"] == total_size / 1000.0 + 20 * 0.1
+
+    # The throughput of the base URI is only measured once.
+    proto_dataset_model.get_preflight_report()
+    assert measurements == [os.path.join(tmp_dir_fixture, "datasets")]
+
+
+def test_ProtoDataSetModel_input_items_waits_for_scan(tmp_dir_fixture, monkeypatch):  # NOQA
+
+    import threading
+
+    import dtool_gui_tk.models
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+
+    scans = []
+    scan_started = threading.Event()
+    release_scan = threading.Event()
+    original_scan = dtool_gui_tk.models.scan_input_directory
+
+    def blocking_scan(*args, **kwargs):
+        scans.append(args[0])
+        scan_started.set()
+        release_scan.wait(5)
+        return original_scan(*args, **kwargs)
+
+    monkeypatch.setattr(
+        dtool_gui_tk.models,
+        "scan_input_directory",
+        blocking_scan
+    )
+
+    # A preflight scan is running in the background.
+    thread = threading.Thread(target=proto_dataset_model.scan_input_directory)
+    thread.start()
+    assert scan_started.wait(5)
+
+    # The items are not scanned a second time; the scan in progress is used.
+    timer = threading.Timer(0.1, release_scan.set)
+    timer.start()
+    assert len(proto_dataset_model.input_items) == 20
+    thread.join()
+    assert scans == [input_directory]
+
+    # A scan is not kept if the patterns change whilst it is running.
+    scan_started.clear()
+    release_scan.clear()
+    thread = threading.Thread(target=proto_dataset_model.scan_input_directory)
+    thread.start()
+    assert scan_started.wait(5)
+    proto_dataset_model.set_include_patterns(["item_1*.txt"])
+    release_scan.set()
+    thread.join()
+    assert len(proto_dataset_model.input_items) == 11
+
+
+def test_ProtoDataSetModel_create_with_patterns(tmp_dir_fixture):  # NOQA
+
+    import dtoolcore
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    assert len(proto_dataset_model.input_items) == 20
+
+    # Changing the patterns invalidates the scan.
+    proto_dataset_model.set_include_patterns(["item_1*.txt"])
+    proto_dataset_model.set_exclude_patterns(["sub"])
+    assert proto_dataset_model.include_patterns == ["item_1*.txt"]
+    assert proto_dataset_model.exclude_patterns == ["sub"]
+    expected = ["item_1.txt"] + ["item_1{}.txt".format(i) for i in (1, 3, 5, 7, 9)]  # NOQA
+    assert [e[1] for e in proto_dataset_model.input_items] == expected
+
+    proto_dataset_model.create()
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    relpaths = sorted(
+        dataset.item_properties(i)["relpath"] for i in dataset.identifiers
+    )
+    assert relpaths == expected
+
+
+def test_ProtoDataSetModel_create_propagates_item_errors(tmp_dir_fixture):  # NOQA
+
+    import dtoolcore
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(4)
+
+    missing_fpath = os.path.join(input_directory, "does-not-exist.txt")
+    tasks = list(proto_dataset_model._yield_path_handle_tuples())
+    tasks.insert(5, (missing_fpath, "does-not-exist.txt"))
+    proto_dataset_model._yield_path_handle_tuples = lambda: iter(tasks)
+
+    with pytest.raises(IOError):
+        proto_dataset_model.create()
+
+    # The proto dataset has not been frozen.
+    base_uri = proto_dataset_model.base_uri
+    assert list(dtoolcore.iter_datasets_in_base_uri(base_uri)) == []
+    assert len(list(dtoolcore.iter_proto_datasets_in_base_uri(base_uri))) == 1
+
+
+def test_ProtoDataSetModel_create_resumes_from_journal(tmp_dir_fixture, monkeypatch):  # NOQA
+
+    import dtoolcore
+
+    import dtool_gui_tk.models
+    from dtool_gui_tk.progress import ProgressChannel
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(1)
+    assert proto_dataset_model.get_resume_info() is None
+
+    # Interrupt the creation after ten items have been stored.
+    tasks = list(proto_dataset_model._yield_path_handle_tuples())
+    missing_fpath = os.path.join(input_directory, "does-not-exist.txt")
+    interrupted_tasks = tasks[:10] + [(missing_fpath, "does-not-exist.txt")]
+    proto_dataset_model._yield_path_handle_tuples = lambda: iter(interrupted_tasks)  # NOQA
+    with pytest.raises(IOError):
+        proto_dataset_model.create()
+    del proto_dataset_model._yield_path_handle_tuples
+
+    resume_info = proto_dataset_model.get_resume_info()
+    assert resume_info["num_items"] == 10
+    stored_bytes = resume_info["total_bytes"]
+    assert stored_bytes == sum(
+        os.path.getsize(fpath) for fpath, _ in tasks[:10]
+    )
+
+    # Modify one of the stored input files; it has to be copied again.
+    modified_fpath, modified_handle = tasks[3]
+    with open(modified_fpath, "a") as fh:
+        fh.write("modified")
+
+    # Start a new model, as if the application had been restarted.
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    assert proto_dataset_model.get_resume_info()["num_items"] == 9
+
+    put_handles = []
+    original_put_item = dtool_gui_tk.models._put_item
+
+    def recording_put_item(proto_dataset, task, *args, **kwargs):
+        put_handles.append(task[1])
+        return original_put_item(proto_dataset, task, *args, **kwargs)
+
+    monkeypatch.setattr(dtool_gui_tk.models, "_put_item", recording_put_item)
+    proto_dataset_model.set_num_workers(1)
+    channel = ProgressChannel()
+    proto_dataset_model.create(progressbar=channel)
+
+    expected_handles = [modified_handle] + [handle for _, handle in tasks[10:]]
+    assert sorted(put_handles) == sorted(expected_handles)
+
+    # Only the bytes still to add are reported as the total.
+    assert channel.drain()["phase"] == ("Adding items", sum(
+        os.path.getsize(fpath) for fpath, handle in tasks
+        if handle in expected_handles
+    ))
+    assert proto_dataset_model.ingest_stats["num_items"] == 11
+    assert proto_dataset_model.ingest_stats["num_skipped"] == 9
+
+    # The dataset is complete and the manifest is correct.
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    assert len(dataset.identifiers) == 20
+    generated_manifest = dataset.generate_manifest()
+    for identifier in dataset.identifiers:
+        expected = generated_manifest["items"][identifier]
+        actual = dataset.item_properties(identifier)
+        assert actual["hash"] == expected["hash"]
+        assert actual["size_in_bytes"] == expected["size_in_bytes"]
+
+    # The journal is removed once the dataset has been frozen.
+    assert os.listdir(proto_dataset_model.journal_directory) == []
+    assert proto_dataset_model.get_resume_info() is None
+
+
+def test_ProtoDataSetModel_resume_removes_stale_items(tmp_dir_fixture, monkeypatch):  # NOQA
+
+    import dtoolcore
+
+    from dtool_gui_tk.models import DEFAULT_JOURNAL_DIRECTORY
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(1)
+
+    # Journals are kept in the base URI by default.
+    assert proto_dataset_model.journal_directory == os.path.join(
+        tmp_dir_fixture,
+        "datasets",
+        DEFAULT_JOURNAL_DIRECTORY
+    )
+
+    # Interrupt the creation after ten items have been stored.
+    tasks = list(proto_dataset_model._yield_path_handle_tuples())
+    missing_fpath = os.path.join(input_directory, "does-not-exist.txt")
+    interrupted_tasks = tasks[:10] + [(missing_fpath, "does-not-exist.txt")]
+    proto_dataset_model._yield_path_handle_tuples = lambda: iter(interrupted_tasks)  # NOQA
+    with pytest.raises(IOError):
+        proto_dataset_model.create()
+    del proto_dataset_model._yield_path_handle_tuples
+
+    # Remove one of the stored input files before resuming.
+    removed_fpath, removed_handle = tasks[3]
+    os.remove(removed_fpath)
+
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    journal = proto_dataset_model._get_journal()
+
+    # The manifest is built from the recorded items, not by reading them.
+    def fail(*args, **kwargs):
+        raise(AssertionError("Manifest generated from the items"))
+
+    monkeypatch.setattr(dtoolcore.ProtoDataSet, "generate_manifest", fail)
+    proto_dataset_model.create()
+
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    handles = [
+        dataset.item_properties(i)["relpath"] for i in dataset.identifiers
+    ]
+    assert len(handles) == 19
+    assert removed_handle not in handles
+    assert not os.path.exists(journal.path)
+
+
+class _CancellingProgressBar(object):
+
+    def __init__(self, proto_dataset_model, after, keep):
+        self.proto_dataset_model = proto_dataset_model
+        self.after = after
+        self.keep = keep
+        self.count = 0
+
+    def update(self, steps, *args, **kwargs):
+        self.count += steps
+        if self.count == self.after:
+            self.proto_dataset_model.cancel(keep=self.keep)
+
+
+@pytest.mark.parametrize("num_workers,use_processes", [
+    (1, False),
+    (4, False),
+    (4, True),
+])
+def test_ProtoDataSetModel_cancel_deletes_proto_dataset(tmp_dir_fixture, num_workers, use_processes):  # NOQA
+
+    import multiprocessing
+
+    import dtoolcore
+
+    from dtool_gui_tk.models import DataSetCreationCancelledError
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(num_workers)
+    proto_dataset_model.set_use_processes(use_processes)
+    if use_processes:
+        proto_dataset_model.set_mp_context(
+            multiprocessing.get_context("spawn")
+        )
+
+    progressbar = _CancellingProgressBar(proto_dataset_model, 3, keep=False)
+    with pytest.raises(DataSetCreationCancelledError):
+        proto_dataset_model.create(progressbar=progressbar)
+
+    # No more items are started once the creation has been cancelled.
+    assert progressbar.count < 20
+
+    base_uri = proto_dataset_model.base_uri
+    assert list(dtoolcore.iter_datasets_in_base_uri(base_uri)) == []
+    assert list(dtoolcore.iter_proto_datasets_in_base_uri(base_uri)) == []
+    assert os.listdir(proto_dataset_model.journal_directory) == []
+
+    # The model can be used to try again.
+    proto_dataset_model.create()
+    assert len(dtoolcore.DataSet.from_uri(proto_dataset_model.uri).identifiers) == 20  # NOQA
+
+
+def test_ingest_worker_is_interrupted_by_cancel_event(tmp_dir_fixture):  # NOQA
+
+    import multiprocessing
+
+    import dtoolcore
+
+    from dtool_gui_tk.models import (
+        _init_ingest_worker,
+        _put_item_in_worker_process,
+    )
+
+    fpath = os.path.join(tmp_dir_fixture, "a.txt")
+    with open(fpath, "w") as fh:
+        fh.write("a")
+    proto_dataset = dtoolcore.create_proto_dataset("ds", tmp_dir_fixture)
+
+    # The event set by cancel reaches the ingester of the worker process.
+    cancel_event = multiprocessing.get_context("spawn").Event()
+    _init_ingest_worker(proto_dataset.uri, "copy", cancel_event)
+    assert _put_item_in_worker_process((fpath, "a.txt"))[1]["size_in_bytes"] == 1  # NOQA
+    cancel_event.set()
+    with pytest.raises(InterruptedError):
+        _put_item_in_worker_process((fpath, "b.txt"))
+
+
+def test_ProtoDataSetModel_cancel_keeps_proto_dataset(tmp_dir_fixture):  # NOQA
+
+    import dtoolcore
+
+    from dtool_gui_tk.models import DataSetCreationCancelledError
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    proto_dataset_model.set_num_workers(1)
+
+    progressbar = _CancellingProgressBar(proto_dataset_model, 3, keep=True)
+    with pytest.raises(DataSetCreationCancelledError):
+        proto_dataset_model.create(progressbar=progressbar)
+
+    base_uri = proto_dataset_model.base_uri
+    assert len(list(dtoolcore.iter_proto_datasets_in_base_uri(base_uri))) == 1
+    assert proto_dataset_model.get_resume_info()["num_items"] == 3
+
+    # The kept proto dataset can be discarded.
+    proto_dataset_model.discard_resumable()
+    assert proto_dataset_model.get_resume_info() is None
+    assert list(dtoolcore.iter_proto_datasets_in_base_uri(base_uri)) == []
+
+
 def test_DataSetListModel(tmp_dir_fixture):  # NOQA
 
     from dtool_gui_tk.models import DataSetListModel, LocalBaseURIModel
@@ -531,6 +1285,130 @@ def test_MetadataSchemaListModel(tmp_dir_fixture):  # NOQA
     assert advanced_model == accessed_model
 
 
+def test_MetadataSchemaListModel_registry(tmp_dir_fixture, monkeypatch):  # NOQA
+    import json
+
+    import dtool_gui_tk.models
+    from dtool_gui_tk.models import MetadataSchemaListModel
+
+    # Treat all modification times as trustworthy.
+    monkeypatch.setattr(dtool_gui_tk.models, "_RACY_MTIME_NS", 0)
+
+    config_path = os.path.join(tmp_dir_fixture, "config.json")
+    metadata_schema_dir = os.path.join(tmp_dir_fixture, "metadata_schemas")
+    os.mkdir(metadata_schema_dir)
+
+    metadata_schema_list_model = MetadataSchemaListModel(config_path=config_path)  # NOQA
+    metadata_schema_list_model.put_metadata_schema_directory(metadata_schema_dir)  # NOQA
+    metadata_schema_list_model.put_metadata_schema_item(
+        "basic",
+        {
+            "type": "object",
+            "properties": {"project": {"type": "string"}},
+            "required": ["project"]
+        }
+    )
+    with open(os.path.join(metadata_schema_dir, "notes.txt"), "w") as fh:
+        fh.write("Not a schema")
+    with open(os.path.join(metadata_schema_dir, "broken.json"), "w") as fh:
+        fh.write("{")
+
+    another_model = MetadataSchemaListModel(config_path=config_path)
+    assert another_model.metadata_model_names == ["basic", "broken"]
+    with pytest.raises(ValueError):
+        another_model.get_metadata_model("broken")
+    with pytest.raises(FileNotFoundError):
+        another_model.get_metadata_model("missing")
+
+    # The models handed out are copies.
+    metadata_model = another_model.get_metadata_model("basic")
+    metadata_model.set_value("project", "x")
+    metadata_model.add_metadata_property("extra")
+    basic_model = metadata_schema_list_model.get_metadata_model("basic")
+    assert basic_model.item_names == ["project"]
+    assert basic_model.get_value("project") is None
+
+    # Unchanged schemas are not read again, by any instance.
+    third_model = MetadataSchemaListModel(config_path=config_path)
+    assert third_model.get_metadata_schema_directory() == metadata_schema_dir
+
+    def fail(*args, **kwargs):
+        raise(AssertionError("Schema read from disk"))
+    monkeypatch.setattr(json, "load", fail)
+    assert third_model.metadata_model_names == ["basic", "broken"]
+    assert third_model.get_metadata_model("basic") == basic_model
+    monkeypatch.undo()
+    monkeypatch.setattr(dtool_gui_tk.models, "_RACY_MTIME_NS", 0)
+
+    # Changed, added and removed files are picked up.
+    fpath = os.path.join(metadata_schema_dir, "basic.json")
+    with open(fpath, "w") as fh:
+        json.dump({
+            "type": "object",
+            "properties": {"description": {"type": "string"}}
+        }, fh)
+    st = os.stat(fpath)
+    os.utime(fpath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert third_model.get_metadata_model("basic").item_names == ["description"]  # NOQA
+
+    os.remove(os.path.join(metadata_schema_dir, "broken.json"))
+    another_model.put_metadata_schema_item(
+        "advanced",
+        {"type": "object", "properties": {"age": {"type": "integer"}}}
+    )
+    st = os.stat(metadata_schema_dir)
+    os.utime(metadata_schema_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # NOQA
+    assert third_model.metadata_model_names == ["advanced", "basic"]
+
+
+def test_warm_up_metadata_schemas(tmp_dir_fixture):  # NOQA
+    import threading
+
+    from dtool_gui_tk.models import (
+        MetadataSchemaListModel,
+        setup_metadata_schema_directory,
+        warm_up_metadata_schemas,
+    )
+
+    metadata_schema_dir = setup_metadata_schema_directory(
+        os.path.join(tmp_dir_fixture, "metadata_schemas")
+    )
+    with open(os.path.join(metadata_schema_dir, "broken.json"), "w") as fh:
+        fh.write("{")
+    metadata_schema_list_model = MetadataSchemaListModel(
+        config_path=os.path.join(tmp_dir_fixture, "config.json")
+    )
+    metadata_schema_list_model.put_metadata_schema_directory(metadata_schema_dir)  # NOQA
+
+    assert warm_up_metadata_schemas(metadata_schema_list_model) == ["basic"]
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert warm_up_metadata_schemas(metadata_schema_list_model, cancel_event) == []  # NOQA
+
+
+def test_MetadataModel_copy():
+    from dtool_gui_tk.models import MetadataModel
+
+    metadata_model = MetadataModel()
+    metadata_model.add_metadata_property("project", {"type": "string"}, True)
+    metadata_model.add_metadata_property("age", {"type": "integer"})
+    metadata_model.set_value("project", 1)
+    assert len(metadata_model.all_issues) == 1
+
+    copied_model = metadata_model.copy()
+    assert copied_model == metadata_model
+    assert copied_model.all_issues == metadata_model.all_issues
+
+    copied_model.set_value("project", "abc")
+    copied_model.select_optional_item("age")
+    assert copied_model.all_issues == []
+    assert copied_model.in_scope_item_names == ["project", "age"]
+    assert metadata_model.get_value("project") == 1
+    assert metadata_model.in_scope_item_names == ["project"]
+    assert len(metadata_model.all_issues) == 1
+
+
 def test_DataSetModel_basic(tmp_dir_fixture):  # NOQA
 
     # Create an empty dataset model.
@@ -663,6 +1541,40 @@ def test_DataSetModel_basic(tmp_dir_fixture):  # NOQA
     assert dataset_model.is_empty
 
 
+def test_DataSetModel_item_props_list_is_cached(tmp_dir_fixture):  # NOQA
+
+    from dtool_gui_tk.models import DataSetModel
+    from dtoolcore import DataSetCreator
+
+    with DataSetCreator("my-dataset", tmp_dir_fixture) as ds_creator:
+        fpath = ds_creator.prepare_staging_abspath_promise("cat.txt")
+        with open(fpath, "w") as fh:
+            fh.write("cat")
+        uri = ds_creator.uri
+
+    dataset_model = DataSetModel()
+    dataset_model.load_dataset(uri)
+
+    item_props_list = dataset_model.get_item_props_list()
+    assert [p["relpath"] for p in item_props_list] == ["cat.txt"]
+
+    # The listing is only built once per loaded dataset.
+    assert dataset_model.get_item_props_list() is item_props_list
+
+    # Reloading the dataset rebuilds the listing.
+    dataset_model.load_dataset(uri)
+    assert dataset_model.get_item_props_list() is not item_props_list
+    assert dataset_model.get_item_props_list() == item_props_list
+
+    # The size statistics are cached along with the listing.
+    size_statistics = dataset_model.get_size_statistics()
+    assert size_statistics["num_items"] == 1
+    assert size_statistics["total_size"] == 3
+    assert dataset_model.get_size_statistics() is size_statistics
+    dataset_model.clear()
+    assert dataset_model._size_statistics is None
+
+
 def test_DataSetModel_update_metadata_works_on_annotations_and_readme(tmp_dir_fixture):  # NOQA
 
     # Create a basic dataset.
@@ -699,6 +1611,152 @@ def test_DataSetModel_update_metadata_works_on_annotations_and_readme(tmp_dir_fi
     assert dataset.list_annotation_names() == expected_annotation_keys  # NOQA
 
 
+def test_DataSetModel_update_metadata_only_writes_changes(tmp_dir_fixture):  # NOQA
+
+    # Create a basic dataset.
+    from dtoolcore import DataSetCreator, DataSet
+    with DataSetCreator("my-dataset", tmp_dir_fixture) as ds_creator:
+        ds_creator.put_annotation("project", "test")
+        ds_creator.put_annotation("age", 3)
+
+    from dtool_gui_tk.models import DataSetModel
+    dataset_model = DataSetModel()
+    dataset_model.load_dataset(ds_creator.uri)
+
+    # Record the writes made to the underlying dataset.
+    written = []
+    dataset = dataset_model._dataset
+    put_annotation = dataset.put_annotation
+    put_readme = dataset.put_readme
+
+    def record_put_annotation(name, value):
+        written.append(name)
+        put_annotation(name, value)
+
+    def record_put_readme(content):
+        written.append("README")
+        put_readme(content)
+
+    dataset.put_annotation = record_put_annotation
+    dataset.put_readme = record_put_readme
+
+    # The readme and the schema differ from what is stored in the dataset.
+    dataset_model.update_metadata()
+    assert sorted(written) == ["README", "_metadata_schema"]
+
+    # Nothing has changed since the last update.
+    written.clear()
+    dataset_model.update_metadata()
+    assert written == []
+
+    # Only the changed annotation and the readme need to be updated.
+    dataset_model.metadata_model.set_value("age", 4)
+    dataset_model.update_metadata()
+    assert sorted(written) == ["README", "age"]
+
+    # A value of a different type is a change.
+    written.clear()
+    dataset_model.metadata_model.set_value("age", 4.0)
+    dataset_model.update_metadata()
+    assert sorted(written) == ["README", "age"]
+
+    dataset = DataSet.from_uri(ds_creator.uri)
+    assert dataset.get_annotation("age") == 4.0
+    assert dataset.get_readme_content() == "---\nage: 4.0\nproject: test"
+    expected_schema = dataset_model.metadata_model.get_master_schema()
+    assert dataset.get_annotation("_metadata_schema") == expected_schema
+
+
+def test_DataSetModel_iter_verify_items(tmp_dir_fixture):  # NOQA
+
+    import multiprocessing
+    import threading
+
+    from dtoolcore import DataSetCreator, DataSet
+    from dtool_gui_tk.models import (
+        DataSetModel,
+        VERIFY_OK,
+        VERIFY_MISSING,
+        VERIFY_SIZE_MISMATCH,
+        VERIFY_HASH_MISMATCH,
+    )
+
+    with DataSetCreator("my-dataset", tmp_dir_fixture) as ds_creator:
+        for animal in ["cat", "dog", "tiger", "lion"]:
+            fpath = ds_creator.prepare_staging_abspath_promise(animal + ".txt")
+            with open(fpath, "w") as fh:
+                fh.write(animal)
+
+    dataset_model = DataSetModel()
+    dataset_model.load_dataset(ds_creator.uri)
+
+    def statuses(full):
+        results = dataset_model.iter_verify_items(full=full, num_workers=2)
+        return {r["relpath"]: r["status"] for r in results}
+
+    expected = {
+        "cat.txt": VERIFY_OK,
+        "dog.txt": VERIFY_OK,
+        "tiger.txt": VERIFY_OK,
+        "lion.txt": VERIFY_OK,
+    }
+    assert statuses(full=False) == expected
+    assert statuses(full=True) == expected
+
+    # Tamper with the dataset items.
+    dataset = DataSet.from_uri(ds_creator.uri)
+    abspaths = {
+        dataset.item_properties(i)["relpath"]: dataset.item_content_abspath(i)
+        for i in dataset.identifiers
+    }
+    os.remove(abspaths["cat.txt"])
+    with open(abspaths["dog.txt"], "w") as fh:
+        fh.write("puppy")
+    with open(abspaths["lion.txt"], "w") as fh:
+        fh.write("LION")
+
+    # Fast mode does not detect changes that preserve the size.
+    expected = {
+        "cat.txt": VERIFY_MISSING,
+        "dog.txt": VERIFY_SIZE_MISMATCH,
+        "tiger.txt": VERIFY_OK,
+        "lion.txt": VERIFY_OK,
+    }
+    assert statuses(full=False) == expected
+
+    expected["lion.txt"] = VERIFY_HASH_MISMATCH
+    assert statuses(full=True) == expected
+
+    # Worker processes can be started without forking.
+    results = dataset_model.iter_verify_items(
+        full=True,
+        num_workers=2,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    assert {r["relpath"]: r["status"] for r in results} == expected
+
+    # No items are verified if the verification has been cancelled.
+    cancel_event = threading.Event()
+    cancel_event.set()
+    results = dataset_model.iter_verify_items(cancel_event=cancel_event)
+    assert list(results) == []
+
+
+def test_DataSetModel_iter_verify_items_not_on_disk(tmp_dir_fixture):  # NOQA
+    from dtoolcore import DataSetCreator
+    from dtool_gui_tk.models import DataSetModel, UnsupportedStorageError
+
+    with DataSetCreator("my-dataset", tmp_dir_fixture) as ds_creator:
+        pass
+
+    dataset_model = DataSetModel()
+    dataset_model.load_dataset(ds_creator.uri)
+    # Pretend that the dataset is in object storage.
+    dataset_model._dataset._uri = "s3://bucket/" + dataset_model._dataset.uuid
+    with pytest.raises(UnsupportedStorageError):
+        next(dataset_model.iter_verify_items())
+
+
 def test_DataSetModel_tags(tmp_dir_fixture):  # NOQA
 
     # Create a basic dataset.
@@ -916,3 +1974,109 @@ def test_json_schema_from_dataset_schema_annotation_with_conflicting_type_in_rea
     from dtool_gui_tk.models import metadata_model_from_dataset
     actual_metadata_model = metadata_model_from_dataset(dataset)
     assert actual_metadata_model == expected_metadata_model
+
+
+def test_ProtoDataSetModel_create_deduplicate(tmp_dir_fixture):  # NOQA
+    import dtoolcore
+
+    input_directory = _create_input_directory(tmp_dir_fixture)
+    for i in range(3):
+        with open(os.path.join(input_directory, "calibration_{}.txt".format(i)), "w") as fh:  # NOQA
+            fh.write("calibration" * 100)
+
+    proto_dataset_model = _proto_dataset_model_for_input(
+        tmp_dir_fixture,
+        input_directory,
+        "my-dataset"
+    )
+    assert not proto_dataset_model.deduplicate
+    assert proto_dataset_model.duplicates is None
+    proto_dataset_model.set_deduplicate(True)
+    proto_dataset_model.set_num_workers(4)
+
+    class RecordingProgressBar(object):
+        def __init__(self):
+            self.events = []
+
+        def phase(self, label, total_bytes=None):
+            self.events.append(("phase", label, total_bytes))
+
+        def update(self, steps, nbytes=0, current=None):
+            self.events.append(("update", steps, nbytes))
+
+    progressbar = RecordingProgressBar()
+    proto_dataset_model.create(progressbar=progressbar)
+
+    assert [d["handles"] for d in proto_dataset_model.duplicates] == [
+        ["calibration_0.txt", "calibration_1.txt", "calibration_2.txt"]
+    ]
+    ingest_stats = proto_dataset_model.ingest_stats
+    assert ingest_stats["num_items"] == 23
+    assert ingest_stats["num_duplicates"] == 2
+    assert ingest_stats["duplicate_bytes"] == 2 * 1100
+    assert ingest_stats["strategy_counts"]["duplicate"] == 2
+    # The hash of the first duplicate is not computed again.
+    assert ingest_stats["strategy_counts"]["copy_hash"] == 20
+
+    # Hashing the duplicates is reported as a phase of its own.
+    phases = [e for e in progressbar.events if e[0] == "phase"]
+    assert [e[1] for e in phases] == ["Finding duplicates", "Adding items"]
+    adding = progressbar.events.index(phases[1])
+    finding_updates = progressbar.events[1:adding]
+    assert len(finding_updates) >= 3
+    assert sum(e[2] for e in finding_updates) == phases[0][2]
+
+    # The duplicates share the content of the item stored first.
+    dataset = dtoolcore.DataSet.from_uri(proto_dataset_model.uri)
+    data_directory = os.path.join(dataset._storage_broker._abspath, "data")
+    stored = os.stat(os.path.join(data_directory, "calibration_0.txt"))
+    for i in (1, 2):
+        fpath = os.path.join(data_directory, "calibration_{}.txt".format(i))
+        assert os.stat(fpath).st_ino == stored.st_ino
+
+    assert len(dataset.identifiers) == 23
+    generated_manifest = dataset.generate_manifest()
+    for identifier in dataset.identifiers:
+        expected = generated_manifest["items"][identifier]
+        actual = dataset.item_properties(identifier)
+        assert actual["hash"] == expected["hash"]
+        assert actual["size_in_bytes"] == expected["size_in_bytes"]
+        assert actual["relpath"] == expected["relpath"]
+
+
+def test_DataSetListModel_get_uri(tmp_dir_fixture):  # NOQA
+
+    from dtoolcore import DataSetCreator
+    from dtool_gui_tk.models import DataSetListModel, LocalBaseURIModel
+
+    base_uri_directory = os.path.join(tmp_dir_fixture, "datasets")
+    os.mkdir(base_uri_directory)
+    config_path = os.path.join(tmp_dir_fixture, "dtool-gui.json")
+    base_uri_model = LocalBaseURIModel(config_path)
+    base_uri_model.put_base_uri(base_uri_directory)
+
+    dataset_uris = {}
+    for ds_name in ("ds1", "ds2"):
+        with DataSetCreator(
+            name=ds_name,
+            base_uri=base_uri_model.get_base_uri()
+        ) as ds_creator:
+            dataset_uris[ds_name] = ds_creator.uri
+
+    dataset_list_model = DataSetListModel()
+    dataset_list_model.set_base_uri_model(base_uri_model)
+    dataset_list_model.sort(key="name", reverse=True)
+
+    assert dataset_list_model.get_uri(0) == dataset_uris["ds2"]
+    assert dataset_list_model.get_uri(1) == dataset_uris["ds1"]
+    with pytest.raises(IndexError):
+        dataset_list_model.get_uri(2)
+    with pytest.raises(IndexError):
+        dataset_list_model.get_uri(-1)
+
+    # The datasets loaded by the listing are available as well.
+    assert dataset_list_model.get_dataset(0).uri == dataset_uris["ds2"]
+    assert [ds.uri for ds in dataset_list_model.yield_datasets()] == [
+        dataset_uris["ds2"],
+        dataset_uris["ds1"],
+    ]
@@ -0,0 +1,141 @@
+"""Test the dtool_gui_tk.progress module."""
+
+import threading
+
+
+def test_ProgressChannel_batches_updates():
+
+    from dtool_gui_tk.progress import ProgressChannel
+
+    # With a long interval nothing is posted until the worker finishes.
+    channel = ProgressChannel(interval=3600)
+    for i in range(1000):
+        channel.update(1, nbytes=2, current="{}.txt".format(i))
+    assert channel._queue.qsize() == 0
+
+    progress = channel.drain()
+    assert progress["items"] == 0
+    assert not progress["done"]
+
+    channel.finish()
+    assert channel._queue.qsize() == 2
+
+    progress = channel.drain()
+    assert progress["items"] == 1000
+    assert progress["bytes"] == 2000
+    assert progress["current"] == "999.txt"
+    assert progress["done"]
+    assert progress["exception"] is None
+
+    # Everything has been drained.
+    progress = channel.drain()
+    assert progress["items"] == 0
+    assert not progress["done"]
+
+
+def test_ProgressChannel_coalesces_updates_from_threads():
+
+    from dtool_gui_tk.progress import ProgressChannel
+
+    channel = ProgressChannel(interval=0)
+
+    def worker():
+        for _ in range(500):
+            channel.update(1, nbytes=3)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    channel.finish()
+
+    progress = channel.drain()
+    assert progress["items"] == 2000
+    assert progress["bytes"] == 6000
+    assert progress["done"]
+
+
+def test_ProgressChannel_errors_and_exception():
+
+    from dtool_gui_tk.progress import ProgressChannel
+
+    channel = ProgressChannel(interval=3600)
+    channel.update(1)
+    channel.error("Could not read a.txt")
+    exception = IOError("Disk full")
+    channel.finish(exception)
+
+    progress = channel.drain()
+    assert progress["items"] == 1
+    assert progress["errors"] == ["Could not read a.txt"]
+    assert progress["done"]
+    assert progress["exception"] is exception
+
+
+def test_ProgressChannel_phase():
+
+    from dtool_gui_tk.progress import ProgressChannel
+
+    channel = ProgressChannel(interval=3600)
+    progress = channel.drain()
+    assert progress["phase"] is None
+
+    # Progress made before a new phase starts is not counted towards it.
+    channel.update(3, nbytes=30, current="a.txt")
+    channel.phase("Adding items", 100)
+    channel.update(1, nbytes=10)
+    channel.finish()
+
+    progress = channel.drain()
+    assert progress["phase"] == ("Adding items", 100)
+    assert progress["items"] == 1
+    assert progress["bytes"] == 10
+    assert progress["current"] is None
+    assert progress["done"]
+
+
+def test_ThroughputEstimator():
+
+    from dtool_gui_tk.progress import ThroughputEstimator
+
+    estimator = ThroughputEstimator(
+        total_bytes=1000,
+        time_constant=1.0,
+        start=0
+    )
+    assert estimator.bytes_per_second is None
+    assert estimator.eta is None
+
+    estimator.update(100, now=1)
+    assert estimator.done_bytes == 100
+    assert estimator.bytes_per_second == 100.0
+    assert estimator.eta == 9.0
+
+    # Updates at the same time are folded into the next observation.
+    estimator.update(50, now=1)
+    assert estimator.done_bytes == 150
+    assert estimator.bytes_per_second == 100.0
+
+    # A long gap means the old rate has almost no weight.
+    estimator.update(250, now=21)
+    assert estimator.done_bytes == 400
+    assert abs(estimator.bytes_per_second - 15.0) < 1e-6
+
+    # The estimate moves towards, but not all the way to, a new rate.
+    estimator.update(100, now=22)
+    assert 15.0 < estimator.bytes_per_second < 100.0
+
+    # No time remains once everything has been transferred.
+    estimator.update(600, now=23)
+    assert estimator.eta == 0
+
+
+def test_format_duration():
+
+    from dtool_gui_tk.progress import format_duration
+
+    assert format_duration(None) == "-"
+    assert format_duration(0) == "0:00:00"
+    assert format_duration(59.6) == "0:01:00"
+    assert format_duration(3725) == "1:02:05"
@@ -0,0 +1,69 @@
+"""Test the stats module."""
+
+import pytest
+
+
+def test_size_statistics():
+    from dtool_gui_tk.stats import size_statistics
+
+    sizes = [0, 1, 10, 100, 1000, 0, 3]
+    relpaths = ["a.txt", "b.TXT", "c.csv", "d", "e.txt", "f.csv", "g.png"]
+    stats = size_statistics(sizes, relpaths, percentiles=(0, 50, 100))
+
+    assert stats["num_items"] == 7
+    assert stats["total_size"] == 1114
+    assert stats["min_size"] == 0
+    assert stats["max_size"] == 1000
+    assert stats["num_empty"] == 2
+    assert stats["percentiles"] == {0: 0.0, 50: 3.0, 100: 1000.0}
+    assert stats["extension_counts"] == [
+        (".txt", 3),
+        (".csv", 2),
+        ("", 1),
+        (".png", 1),
+    ]
+    assert stats["histogram"] == [
+        (1, 1),
+        (2, 1),
+        (4, 0),
+        (8, 1),
+        (16, 0),
+        (32, 0),
+        (64, 1),
+        (128, 0),
+        (256, 0),
+        (512, 1),
+    ]
+
+
+def test_size_statistics_no_items():
+    from dtool_gui_tk.stats import size_statistics
+
+    stats = size_statistics([], [])
+    assert stats["num_items"] == 0
+    assert stats["total_size"] == 0
+    assert stats["histogram"] == []
+    assert stats["extension_counts"] == []
+
+
+def test_size_statistics_numpy_and_python_agree():
+    pytest.importorskip("numpy")
+
+    import random
+    from dtool_gui_tk.stats import (
+        PERCENTILES,
+        _size_statistics_numpy,
+        _size_statistics_python,
+    )
+
+    random.seed(0)
+    sizes = [random.randint(0, 2 ** 40) for _ in range(1000)] + [0, 1]
+    numpy_stats = _size_statistics_numpy(sizes, PERCENTILES)
+    python_stats = _size_statistics_python(sizes, PERCENTILES)
+    assert numpy_stats["histogram"] == python_stats["histogram"]
+    assert numpy_stats["num_empty"] == python_stats["num_empty"]
+    assert numpy_stats["total_size"] == python_stats["total_size"]
+    for p in PERCENTILES:
+        assert numpy_stats["percentiles"][p] == pytest.approx(
+            python_stats["percentiles"][p]
+        )